@@ -0,0 +1,494 @@
+# bench_renderer.py - Micro-benchmarks del Renderer (se ejecuta en el dispositivo)
+#
+# Uso: mpremote run bench/bench_renderer.py (con el proyecto copiado al dispositivo)
+
+import gc
+import time
+import random
+import binascii
+import machine
+from array import array
+import config
+from hal.st7796s import St7796s
+from hal.ft6x36 import Ft6x36
+from core.renderer import Renderer
+from core.indexed_renderer import IndexedRenderer
+from core.particles import Particles
+from ui.settings_screen import SettingsScreen
+
+
+def make_display():
+    """Inicializa SPI y LCD igual que main.py"""
+    spi = machine.SPI(
+        config.SPI_ID,
+        baudrate=config.SPI_BAUDRATE,
+        sck=machine.Pin(config.SPI_SCK),
+        mosi=machine.Pin(config.SPI_MOSI),
+        miso=None
+    )
+    return St7796s(
+        spi=spi,
+        rst=machine.Pin(config.LCD_RST, machine.Pin.OUT),
+        cs=machine.Pin(config.LCD_CS, machine.Pin.OUT),
+        dc=machine.Pin(config.LCD_DC, machine.Pin.OUT),
+        bl=machine.Pin(config.LCD_BL, machine.Pin.OUT)
+    )
+
+
+def make_touch():
+    """Inicializa I2C y táctil igual que main.py"""
+    i2c = machine.I2C(
+        config.I2C_ID,
+        scl=machine.Pin(config.I2C_SCL),
+        sda=machine.Pin(config.I2C_SDA),
+        freq=config.I2C_FREQ
+    )
+    return Ft6x36(i2c=i2c, ax=config.TOUCH_AX, bx=config.TOUCH_BX, ay=config.TOUCH_AY,
+                  by=config.TOUCH_BY, swap_xy=config.TOUCH_SWAP_XY)
+
+
+def rate(fn, n):
+    """Ejecuta fn(i) n veces y devuelve llamadas por segundo"""
+    gc.collect()
+    start = time.ticks_us()
+    for i in range(n):
+        fn(i)
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    return n * 1_000_000 // max(elapsed, 1)
+
+
+def report(name, before, after):
+    gain = (after - before) * 100 // max(before, 1)
+    print(f"{name:<14} {before:>8} {after:>8} calls/s  ({gain:+d}%)")
+
+
+def legacy_draw(display, x, y, w, h, buf):
+    """draw original: CASET, RASET y RAMWR con write_reg (CS y DC por cada comando)"""
+    display.set_window(x, y, w, h)
+    display.write_reg(display.RAMWR, buf)
+
+
+def legacy_clear(display):
+    """clear original: 480 draws de una fila desde un buffer de 640 bytes"""
+    buf = bytearray([0x00, 0x00] * display.WIDTH)
+    for i in range(display.HEIGHT):
+        display.draw(0, i, display.WIDTH, 1, buf)
+
+
+def bench_clear(display, r, n=10):
+    """clear() del arranque y fill() de pantalla completa: buffer por filas/framebuffer vs fill_rect"""
+    print("--- Display: clear y fill de pantalla completa ---")
+    
+    def run(fn):
+        gc.collect()
+        start = time.ticks_us()
+        for i in range(n):
+            fn(i)
+        return time.ticks_diff(time.ticks_us(), start) / 1000 / n
+    
+    before = run(lambda i: legacy_clear(display))
+    after = run(lambda i: display.clear())
+    print(f"clear  480 draws: {before:.2f} ms  fill_rect: {after:.2f} ms  (arranque -{before - after:.2f} ms)")
+    
+    def fill(i):
+        r.fill(0x1082 if i & 1 else 0x0841)
+        r.flush()
+    
+    def fill_pushed(i):
+        # Sin _solid el flush envía el framebuffer completo
+        r.fill(0x1082 if i & 1 else 0x0841)
+        r._solid = None
+        r.flush()
+    
+    before = run(fill_pushed)
+    after = run(fill)
+    print(f"fill   framebuffer: {before:.2f} ms  fill_rect: {after:.2f} ms")
+
+
+def bench_display_updates(display, n=1000):
+    """1000 actualizaciones de 16x16: write_reg por comando vs transacción única"""
+    print("--- Display: 1000 draws de 16x16 ---")
+    buf = bytearray(16 * 16 * 2)
+    random.seed(5)
+    spots = [(random.randint(0, 304), random.randint(0, 464)) for i in range(64)]
+    
+    def run(draw, moving):
+        gc.collect()
+        start = time.ticks_us()
+        for i in range(n):
+            x, y = spots[i & 63] if moving else spots[0]
+            draw(x, y, 16, 16, buf)
+        return time.ticks_diff(time.ticks_us(), start) // n
+    
+    legacy = lambda x, y, w, h, b: legacy_draw(display, x, y, w, h, b)
+    for moving in (True, False):
+        before = run(legacy, moving)
+        display.invalidate_window()
+        after = run(display.draw, moving)
+        label = "distinta ventana" if moving else "misma ventana"
+        print(f"{label:<17} write_reg: {before} us/draw  fast path: {after} us/draw")
+
+
+def bench_colors(r, n=2000):
+    """Primitivas del bucle draw de GAME_TEMPLATE: color entero vs handle nativo"""
+    print("--- Colores: RGB565 entero vs handle nativo ---")
+    plain = 0xFE19
+    native = r.native(plain)
+    cases = (
+        ("pixel", lambda c: (lambda i: r.pixel(i % 320, i % 480, c))),
+        ("rect", lambda c: (lambda i: r.rect(i % 280, i % 440, 30, 30, c, fill=True))),
+        ("circle", lambda c: (lambda i: r.circle(i % 320, i % 480, 5, c, fill=True))),
+        ("ellipse", lambda c: (lambda i: r.ellipse(i % 320, i % 480, 4, 6, c, fill=True))),
+        ("rounded_rect", lambda c: (lambda i: r.rounded_rect(i % 280, i % 440, 40, 40, 8, c, fill=True))),
+        ("triangle", lambda c: (lambda i: r.triangle(i % 300, 10, 0, 40, 20, 40, c, fill=True))),
+        ("hline", lambda c: (lambda i: r.hline(0, i % 480, 320, c))),
+        ("text", lambda c: (lambda i: r.text(10, i % 470, "Score: 0", c))),
+    )
+    for name, make in cases:
+        r.fill(0)
+        before = rate(make(plain), n)
+        r.fill(0)
+        after = rate(make(native), n)
+        report(name, before, after)
+
+
+def legacy_fill_triangle(r, x0, y0, x1, y1, x2, y2, color):
+    """Scanline Python original, como referencia de velocidad y de píxeles"""
+    if y0 > y1:
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    if y1 > y2:
+        x1, y1, x2, y2 = x2, y2, x1, y1
+    if y0 > y1:
+        x0, y0, x1, y1 = x1, y1, x0, y0
+    if y2 == y0:
+        r.fb.hline(min(x0, x1, x2), y0, max(x0, x1, x2) - min(x0, x1, x2) + 1, color)
+        return
+    for y in range(y0, y2 + 1):
+        if y < y1:
+            xa = x0 + (x1 - x0) * (y - y0) // (y1 - y0)
+        elif y2 - y1 != 0:
+            xa = x1 + (x2 - x1) * (y - y1) // (y2 - y1)
+        else:
+            xa = x1
+        xb = x0 + (x2 - x0) * (y - y0) // (y2 - y0)
+        if xa > xb:
+            xa, xb = xb, xa
+        r.fb.hline(xa, y, xb - xa + 1, color)
+
+
+def bench_triangles(r, frames=20, count=100):
+    """100 triángulos rellenos aleatorios por frame: scanline Python vs viper"""
+    print("--- Triangulos rellenos: scanline Python vs viper ---")
+    random.seed(1234)
+    tris = []
+    for i in range(count):
+        cx = random.randint(-20, 340)
+        cy = random.randint(-20, 500)
+        tris.append((cx + random.randint(-30, 30), cy + random.randint(-30, 30),
+                     cx + random.randint(-30, 30), cy + random.randint(-30, 30),
+                     cx + random.randint(-30, 30), cy + random.randint(-30, 30),
+                     random.getrandbits(16)))
+    
+    def run(fill_fn):
+        gc.collect()
+        start = time.ticks_us()
+        for f in range(frames):
+            r.fill(0)
+            for x0, y0, x1, y1, x2, y2, color in tris:
+                fill_fn(x0, y0, x1, y1, x2, y2, color)
+        ms = time.ticks_diff(time.ticks_us(), start) / 1000 / frames
+        return ms, binascii.crc32(r.buffer)
+    
+    legacy_ms, legacy_crc = run(lambda *a: legacy_fill_triangle(r, *a))
+    viper_ms, viper_crc = run(r._fill_triangle)
+    print(f"python: {legacy_ms:.2f} ms/frame  viper: {viper_ms:.2f} ms/frame")
+    print(f"pixel-identical: {legacy_crc == viper_crc}")
+
+
+def draw_enemy(r, x, y):
+    """Enemigo básico de GAME_TEMPLATE dibujado con primitivas"""
+    r.rect(x - 15, y - 15, 30, 30, 0xF800, fill=True)
+    r.circle(x - 6, y - 4, 4, 0xFFFF, fill=True)
+    r.circle(x + 6, y - 4, 4, 0xFFFF, fill=True)
+    r.triangle(x, y + 15, x - 8, y + 6, x + 8, y + 6, 0xFD20, fill=True)
+
+
+def draw_projectile(r, x, y):
+    """Proyectil de GAME_TEMPLATE: cuerpo y estela"""
+    r.ellipse(x, y, 4, 6, 0x07FF, fill=True)
+    r.ellipse(x, y + 8, 2, 4, 0x07FF & 0x7BEF, fill=True)
+
+
+def bench_sprites(r, frames=30):
+    """15 enemigos + 20 proyectiles por frame: primitivas vs sprites horneados"""
+    print("--- Entidades: primitivas vs sprites ---")
+    enemies = [(20 + (i * 47) % 280, 60 + (i * 83) % 380) for i in range(15)]
+    shots = [(10 + (i * 29) % 300, 40 + (i * 61) % 420) for i in range(20)]
+    
+    def run(draw):
+        gc.collect()
+        start = time.ticks_us()
+        for f in range(frames):
+            r.fill(0x1082)
+            draw(f)
+        return time.ticks_diff(time.ticks_us(), start) / 1000 / frames
+    
+    def primitives(f):
+        for x, y in enemies:
+            draw_enemy(r, x, (y + f) % 480)
+        for x, y in shots:
+            draw_projectile(r, x, (y - f * 4) % 480)
+    
+    r.bake_sprite("enemy", 32, 32, lambda s: draw_enemy(s, 16, 16))
+    r.bake_sprite("shot", 10, 22, lambda s: draw_projectile(s, 5, 6))
+    
+    def sprites(f):
+        for x, y in enemies:
+            r.blit_sprite("enemy", x - 16, (y + f) % 480 - 16)
+        for x, y in shots:
+            r.blit_sprite("shot", x - 5, (y - f * 4) % 480 - 6)
+    
+    prim_ms = run(primitives)
+    sprite_ms = run(sprites)
+    print(f"primitives: {prim_ms:.2f} ms/frame  sprites: {sprite_ms:.2f} ms/frame")
+
+
+def bench_batches(r, frames=30, count=200):
+    """200 estrellas/balas por frame: una llamada por elemento vs una llamada por lote"""
+    print("--- Lotes: llamadas individuales vs array('h') ---")
+    random.seed(99)
+    stars = array("h")
+    bullets = array("h")
+    dots = array("h")
+    for i in range(count):
+        stars.extend((random.randint(0, 319), random.randint(0, 479)))
+        bullets.extend((random.randint(0, 316), random.randint(0, 470), 3, 8))
+        dots.extend((random.randint(0, 319), random.randint(0, 479), 3))
+    
+    def run(draw):
+        gc.collect()
+        start = time.ticks_us()
+        for f in range(frames):
+            r.fill(0)
+            draw()
+        return time.ticks_diff(time.ticks_us(), start) / 1000 / frames, binascii.crc32(r.buffer)
+    
+    def single():
+        for i in range(0, len(stars), 2):
+            r.pixel(stars[i], stars[i + 1], 0xFFFF)
+        for i in range(0, len(bullets), 4):
+            r.rect(bullets[i], bullets[i + 1], bullets[i + 2], bullets[i + 3], 0xFFE0, fill=True)
+        for i in range(0, len(dots), 3):
+            r.circle(dots[i], dots[i + 1], dots[i + 2], 0x07E0, fill=True)
+    
+    def batched():
+        r.pixels(stars, 0xFFFF)
+        r.rects(bullets, 0xFFE0)
+        r.circles(dots, 0x07E0)
+    
+    single_ms, single_crc = run(single)
+    batch_ms, batch_crc = run(batched)
+    print(f"single: {single_ms:.2f} ms/frame  batched: {batch_ms:.2f} ms/frame")
+    print(f"pixel-identical: {single_crc == batch_crc}")
+
+
+def legacy_rounded_rect(r, x, y, w, h, radius, color, fill=False):
+    """rounded_rect original (dos rectángulos + cuatro cuartos de ellipse), como referencia"""
+    if not color & 0x10000:
+        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+    r._mark(x, y, w, h)
+    fb = r.fb
+    corners = ((x + radius, y + radius, 2), (x + w - radius - 1, y + radius, 1),
+               (x + radius, y + h - radius - 1, 4), (x + w - radius - 1, y + h - radius - 1, 8))
+    if fill:
+        fb.fill_rect(x + radius, y, w - 2 * radius, h, color)
+        fb.fill_rect(x, y + radius, w, h - 2 * radius, color)
+    else:
+        fb.hline(x + radius, y, w - 2 * radius, color)
+        fb.hline(x + radius, y + h - 1, w - 2 * radius, color)
+        fb.vline(x, y + radius, h - 2 * radius, color)
+        fb.vline(x + w - 1, y + radius, h - 2 * radius, color)
+    for cx, cy, mask in corners:
+        fb.ellipse(cx, cy, radius, radius, color, fill, mask)
+
+
+class BenchApp:
+    """Lo mínimo que necesita una Screen: el renderer"""
+    def __init__(self, renderer):
+        self.renderer = renderer
+
+
+def bench_keyboard(r, frames=30):
+    """Teclado de ajustes (40 teclas + botones): rounded_rect con framebuf vs viper"""
+    print("--- Teclado de ajustes: rounded_rect framebuf vs viper ---")
+    screen = SettingsScreen(BenchApp(r))
+    screen.mode = "keyboard"
+    screen.keyboard_target = "wifi_password"
+    
+    def run():
+        gc.collect()
+        start = time.ticks_us()
+        for f in range(frames):
+            r.fill(config.COLOR_BACKGROUND)
+            screen._draw_keyboard(r)
+        return time.ticks_diff(time.ticks_us(), start) / 1000 / frames
+    
+    def keys():
+        r.fill(0)
+        for x, y, w, h, char in screen.keyboard_keys:
+            r.rounded_rect(x, y, w, h, 4, config.COLOR_BUTTON_BG, fill=True)
+            r.rounded_rect(x, y, w, h, 4, config.COLOR_SECONDARY, fill=False)
+        # Radio h // 2: barras de progreso y botones píldora
+        for h in (2, 3, 4, 7, 8, 12, 24):
+            r.progress_bar(10, 400, 300, h, 0.37, config.COLOR_BUTTON_BG, config.COLOR_PRIMARY)
+            r.rounded_rect(10, 440, 80, h, h // 2, config.COLOR_SECONDARY, fill=False)
+        return binascii.crc32(r.buffer)
+    
+    # La versión original se instala sobre la instancia y se retira después
+    r.rounded_rect = lambda *args, **kwargs: legacy_rounded_rect(r, *args, **kwargs)
+    legacy_ms = run()
+    legacy_crc = keys()
+    del r.rounded_rect
+    viper_ms = run()
+    viper_crc = keys()
+    print(f"framebuf: {legacy_ms:.2f} ms/frame  viper: {viper_ms:.2f} ms/frame")
+    print(f"pixel-identical: {legacy_crc == viper_crc}")
+
+
+def bench_particles(r, frames=60, count=500):
+    """500 partículas vivas: update + draw por frame (objetivo 30 fps con flush incluido)"""
+    print("--- Particulas: update y draw de 500 ---")
+    random.seed(7)
+    ps = Particles(count, gravity=0.05)
+    update_us = 0
+    draw_us = 0
+    flush_us = 0
+    for f in range(frames):
+        # Mantiene el sistema lleno con explosiones de vida larga
+        ps.emit(random.randint(40, 280), random.randint(80, 400), count - ps.count, 0xFFE0, speed=2, life=200)
+        t0 = time.ticks_us()
+        ps.update()
+        t1 = time.ticks_us()
+        r.fill(0)
+        ps.draw(r)
+        t2 = time.ticks_us()
+        r.flush()
+        t3 = time.ticks_us()
+        update_us += time.ticks_diff(t1, t0)
+        draw_us += time.ticks_diff(t2, t1)
+        flush_us += time.ticks_diff(t3, t2)
+    frame_us = (update_us + draw_us + flush_us) / frames
+    print(f"{ps.count} particles: update {update_us / frames / 1000:.2f} ms  draw {draw_us / frames / 1000:.2f} ms  "
+          f"flush {flush_us / frames / 1000:.2f} ms  ({1_000_000 / frame_us:.1f} fps)")
+
+
+def bench_modes(display, frames=20):
+    """fill, 100 rects y flush completo: framebuffer RGB565 frente a índices GS8"""
+    print("--- Modos: RGB565 vs indexado 8 bits ---")
+    colors = (0x1082, 0xF800, 0x07E0, 0x001F)
+    for cls in (Renderer, IndexedRenderer):
+        gc.collect()
+        r = cls(display)
+        fill_us = 0
+        rect_us = 0
+        flush_us = 0
+        for f in range(frames):
+            t0 = time.ticks_us()
+            r.fill(colors[f % 4])
+            t1 = time.ticks_us()
+            for i in range(100):
+                r.rect((i * 37) % 290, (i * 53) % 450, 30, 30, colors[(f + i + 1) % 4], fill=True)
+            t2 = time.ticks_us()
+            r.flush()
+            t3 = time.ticks_us()
+            fill_us += time.ticks_diff(t1, t0)
+            rect_us += time.ticks_diff(t2, t1)
+            flush_us += time.ticks_diff(t3, t2)
+        print(f"{cls.__name__:<16} fb {len(r.buffer) // 1024} KB  fill {fill_us / frames / 1000:.2f} ms  "
+              f"rects {rect_us / frames / 1000:.2f} ms  flush {flush_us / frames / 1000:.2f} ms")
+        del r
+
+
+def bench_row_hash(display, frames=30):
+    """Juego que repinta todo cada frame: flush de pantalla completa vs hash de filas"""
+    print("--- Flush: pantalla completa vs hash de filas ---")
+    gc.collect()
+    r = Renderer(display)
+    for enabled in (False, True):
+        r.enable_row_hash(enabled)
+        flush_us = 0
+        for f in range(frames):
+            r.fill(0x1082)
+            r.rect(0, 0, 320, 40, 0x0000, fill=True)
+            r.text(10, 15, "SCORE 1234", 0xFFFF)
+            r.rect(20 + f * 4, 300, 24, 24, 0xFFE0, fill=True)
+            start = time.ticks_us()
+            r.flush()
+            flush_us += time.ticks_diff(time.ticks_us(), start)
+        print(f"row hash {'on ' if enabled else 'off'}: flush {flush_us / frames / 1000:.2f} ms/frame")
+    r.enable_row_hash(False)
+    del r
+
+
+def bench_touch_poll_interval(display, touch, frames=30):
+    """Bucle de App.run con flush completo: intervalo entre lecturas del táctil.
+    
+    Mide cada cuánto se lee el táctil, no lo que tarda el handler: la latencia
+    lectura -> handler la anota App en touch_latency_stats().
+    """
+    print("--- Tactil: intervalo de lectura por frame vs entre trozos del flush ---")
+    gc.collect()
+    r = Renderer(display)
+    last = [0]
+    # Mayor intervalo, suma de intervalos y lecturas (us)
+    gaps = [0, 0, 0]
+    
+    def sample():
+        now = time.ticks_us()
+        gap = time.ticks_diff(now, last[0])
+        gaps[0] = max(gaps[0], gap)
+        gaps[1] += gap
+        gaps[2] += 1
+        last[0] = now
+    
+    def poll():
+        sample()
+        touch.poll()
+    
+    for chunk in (0, config.FLUSH_CHUNK_BYTES or 16 * 1024):
+        r.set_flush_callback(poll if chunk else None, chunk)
+        gaps[0] = gaps[1] = gaps[2] = 0
+        flush_us = 0
+        last[0] = time.ticks_us()
+        for f in range(frames):
+            # Como App.run: lectura al inicio del frame, dibujo y flush de toda la pantalla
+            sample()
+            touch.read()
+            r.fill(0x1082 if f & 1 else 0x0841)
+            start = time.ticks_us()
+            r.flush()
+            flush_us += time.ticks_diff(time.ticks_us(), start)
+        label = f"chunk {chunk // 1024} KB" if chunk else "por frame"
+        print(f"{label:<12} poll interval max {gaps[0] / 1000:.1f} ms  avg {gaps[1] / gaps[2] / 1000:.1f} ms  "
+              f"flush {flush_us / frames / 1000:.2f} ms")
+    r.set_flush_callback(None, 0)
+    del r
+
+
+def main():
+    display = make_display()
+    bench_touch_poll_interval(display, make_touch())
+    bench_display_updates(display)
+    bench_modes(display)
+    bench_row_hash(display)
+    r = Renderer(display)
+    bench_clear(display, r)
+    bench_colors(r)
+    bench_triangles(r)
+    bench_sprites(r)
+    bench_batches(r)
+    bench_keyboard(r)
+    bench_particles(r)
+
+
+main()
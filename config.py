@@ -25,6 +25,7 @@ LCD_CS = 15
 LCD_DC = 21
 LCD_RST = 22
 LCD_BL = 23
+LCD_TE = None  # Salida TE (tearing effect) del panel: sincroniza los flush con el refresco (None = sin conectar)
 
 # ===== Pines I2C (Touch FT6x36) =====
 I2C_ID = 1
@@ -44,6 +45,21 @@ DISPLAY_WIDTH = 320
 DISPLAY_HEIGHT = 480
 DISPLAY_ROTATION = 0  # 0 para modo vertical
 
+# ===== Renderer =====
+RENDER_MODE = "full"  # "full": framebuffer 320x480 (307 KB), "band": franjas de BAND_HEIGHT filas
+                      # "retained": como "full" pero omite los frames sin cambios
+                      # "indexed": 8 bits por píxel (150 KB) con paleta de 256 colores
+BAND_HEIGHT = 40      # Filas por franja en modo "band" (320x40 = 25 KB)
+ROW_HASH_FLUSH = False  # Solo envía las filas cuyo contenido cambió respecto a lo ya enviado
+                        # (modos "full", "retained" e "indexed"; útil si los juegos repintan todo)
+ASYNC_FLUSH = False     # Envía cada frame desde un hilo (segundo núcleo) mientras se dibuja el siguiente
+                        # (duplica el framebuffer; mismos modos que ROW_HASH_FLUSH)
+FLUSH_CHUNK_BYTES = 16 * 1024  # Lee el táctil cada tantos bytes enviados durante el flush (0 = solo entre frames)
+                               # (~6.5 ms por trozo a 20 MHz; sin efecto con ASYNC_FLUSH)
+GLYPH_CACHE_BYTES = 16 * 1024  # Presupuesto de la caché de glifos escalados
+FONT_CACHE_BYTES = 4 * 1024    # Caché de glifos por fuente binaria (ver core/font.py)
+FONTS = {}  # Fuentes binarias disponibles para text(..., font=...), p.ej. {"sans16": "/fonts/sans16.bin"}
+
 # ===== Colores RGB565 =====
 COLOR_BLACK = 0x0000
 COLOR_WHITE = 0xFFFF
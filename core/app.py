@@ -12,12 +12,15 @@ from ui.splash_screen import SplashScreen
         
 logger = logging.getLogger("app")
 
+# Pulsaciones leídas durante un flush que se guardan hasta despacharlas
+TOUCH_QUEUE = 4
+
 class App:
     def __init__(self, display, touch):
         logger.debug("Initializing App...")
         self.display = display
         self.touch = touch
-        self.renderer = Renderer(display)
+        self.renderer = self._create_renderer(display)
         self.api = ClaudeAPI()
         self.storage = Storage()
         self.settings = Settings()
@@ -27,9 +30,107 @@ class App:
         self.last_frame_time = time.ticks_ms()
         self.target_frame_time = 1000 // config.FRAME_RATE
         
+        # Pulsaciones (x, y, ticks_ms de la lectura) recogidas entre trozos del flush
+        self.touch_queue = []
+        self._touch_down = False
+        self._touch_handled = False
+        # Latencia lectura -> handle_touch y mayor hueco entre lecturas del táctil (ms)
+        self._last_touch_sample = time.ticks_ms()
+        self.touch_stats = {"events": 0, "latency_ms": 0, "max_latency_ms": 0, "max_gap_ms": 0}
+        if config.FLUSH_CHUNK_BYTES and not self.renderer.set_flush_callback(self._poll_touch, config.FLUSH_CHUNK_BYTES):
+            logger.warning("Touch polling during flush not available")
+        
+        # Ritmo de frames con la señal TE del panel (None = sleep_ms hasta target_frame_time)
+        self.pacer = None
+        if getattr(display, "te", None) is not None:
+            self._enable_frame_sync()
+        
         self.wlan = network.WLAN(network.STA_IF)
         logger.debug(f"App initialized with target frame time: {self.target_frame_time}ms")
     
+    def _create_renderer(self, display):
+        """Crea el renderer según config.RENDER_MODE"""
+        if config.RENDER_MODE == "band":
+            from core.band_renderer import BandRenderer
+            renderer = BandRenderer(display, config.BAND_HEIGHT)
+        elif config.RENDER_MODE == "retained":
+            from core.retained_renderer import RetainedRenderer
+            renderer = RetainedRenderer(display)
+        elif config.RENDER_MODE == "indexed":
+            from core.indexed_renderer import IndexedRenderer
+            renderer = IndexedRenderer(display)
+        else:
+            renderer = Renderer(display)
+        if config.ROW_HASH_FLUSH and not renderer.enable_row_hash():
+            logger.warning(f"Row hash flush not available in render mode '{config.RENDER_MODE}'")
+        if config.ASYNC_FLUSH and not renderer.enable_async_flush():
+            logger.warning("Async flush not available, using synchronous flush")
+        logger.info(f"Render mode '{config.RENDER_MODE}': {renderer.memory_stats()}")
+        return renderer
+    
+    def _enable_frame_sync(self):
+        """Sincroniza los flush con el pulso TE; el frame pasa a durar un múltiplo de su periodo"""
+        from core.frame_pacer import FramePacer
+        pacer = FramePacer(self.display, self.target_frame_time)
+        if not pacer.calibrate():
+            logger.warning("TE sync not available, using timed frame pacing")
+            return
+        self.pacer = pacer
+        self.target_frame_time = pacer.frame_time()
+        self.renderer.set_frame_sync(pacer.sync)
+    
+    def _sample_touch(self, now):
+        """Anota el hueco desde la lectura anterior del táctil"""
+        gap = time.ticks_diff(now, self._last_touch_sample)
+        if gap > self.touch_stats["max_gap_ms"]:
+            self.touch_stats["max_gap_ms"] = gap
+        self._last_touch_sample = now
+    
+    def _poll_touch(self):
+        """Lee el táctil entre trozos del flush y encola la pulsación sin despacharla"""
+        now = time.ticks_ms()
+        self._sample_touch(now)
+        touched, x, y = self.touch.poll()
+        if touched:
+            # Una por pulsación nueva o una por frame si se mantiene el dedo
+            repeat = not self.touch_queue and not self._touch_handled
+            if (not self._touch_down or repeat) and len(self.touch_queue) < TOUCH_QUEUE:
+                self.touch_queue.append((x, y, now))
+        self._touch_down = bool(touched)
+    
+    def _handle_touch(self, x, y, sampled):
+        if not self.current_screen:
+            return
+        logger.debug(f"Touch detected at ({x}, {y})")
+        self.current_screen.handle_touch(x, y)
+        latency = time.ticks_diff(time.ticks_ms(), sampled)
+        stats = self.touch_stats
+        stats["events"] += 1
+        stats["latency_ms"] += latency
+        if latency > stats["max_latency_ms"]:
+            stats["max_latency_ms"] = latency
+    
+    def _dispatch_touch_queue(self):
+        """Despacha las pulsaciones leídas durante el flush; devuelve si había alguna"""
+        queue = self.touch_queue
+        if not queue:
+            return False
+        self.touch_queue = []
+        for x, y, sampled in queue:
+            self._handle_touch(x, y, sampled)
+        return True
+    
+    def touch_latency_stats(self):
+        """Latencia media y máxima lectura -> handler y mayor hueco sin leer el táctil (ms)"""
+        stats = self.touch_stats
+        events = stats["events"]
+        return {
+            "events": events,
+            "avg_latency_ms": stats["latency_ms"] // events if events else 0,
+            "max_latency_ms": stats["max_latency_ms"],
+            "max_gap_ms": stats["max_gap_ms"],
+        }
+    
     def _connect_wifi(self):
         """Conecta a WiFi usando la configuración guardada"""
         # Verificar si WiFi está habilitado en settings
@@ -101,20 +202,32 @@ class App:
         while self.running:
             frame_start = time.ticks_ms()
             
-            # Lee touch
-            touched, x, y = self.touch.read()
-            if touched and self.current_screen:
-                logger.debug(f"Touch detected at ({x}, {y})")
-                self.current_screen.handle_touch(x, y)
+            # Lee touch (salvo si ya se atendió una pulsación tras el flush anterior)
+            if self._touch_handled:
+                self._touch_handled = False
+            elif self._dispatch_touch_queue():
+                self._touch_handled = True
+            else:
+                touched, x, y = self.touch.read()
+                self._sample_touch(frame_start)
+                self._touch_down = bool(touched)
+                if touched:
+                    self._handle_touch(x, y, frame_start)
+                    self._touch_handled = True
             
-            # Actualiza pantalla actual
+            # Actualiza pantalla actual (el flush encola las pulsaciones que lea entre trozos)
             if self.current_screen:
                 self.current_screen.update()
                 self.current_screen.draw()
             
-            # Control de frame rate
+            # Atiende lo leído durante el flush sin esperar al siguiente frame
+            self._touch_handled = self._dispatch_touch_queue()
+            
+            # Control de frame rate (con TE, el flush ya esperó al blanking del panel)
             frame_time = time.ticks_diff(time.ticks_ms(), frame_start)
-            if frame_time < self.target_frame_time:
+            if self.pacer is not None and not self.pacer.failed:
+                self.pacer.frame_done()
+            elif frame_time < self.target_frame_time:
                 time.sleep_ms(self.target_frame_time - frame_time)
             
             self.last_frame_time = frame_start
@@ -122,5 +235,11 @@ class App:
             frame_count += 1
             if frame_count % 300 == 0:  # Log every 300 frames (~10 seconds at 30fps)
                 logger.debug(f"Frame {frame_count}, last frame time: {frame_time}ms")
+                logger.debug(f"Touch latency: {self.touch_latency_stats()}")
+                if self.pacer is not None:
+                    logger.debug(f"Frame pacing: {self.pacer.stats()}")
+                logger.debug(f"Render memory ({config.RENDER_MODE}): {self.renderer.memory_stats()}")
+                if self.renderer.stats:
+                    logger.debug(f"Render stats: {self.renderer.render_stats()['window']}")
 
 
@@ -14,6 +14,8 @@ class AppRunner(Screen):
         self.app_filename = app_filename
         self.app_instance = None
         self.paused = False
+        # El overlay de pausa se dibuja una vez al pausar y se deja en pantalla
+        self.overlay_drawn = False
         self.error = None
         self.frame = 0
         
@@ -104,10 +106,12 @@ class AppRunner(Screen):
             r.flush()
             
         elif self.paused:
-            # Overlay de pausa
+            if self.overlay_drawn:
+                # Sin cambios hasta que llegue un toque
+                return
             logger.debug("Drawing pause overlay")
-            for i in range(0, 480, 4):
-                r.line(0, i, 320, i, 0x2945)
+            # Oscurece el último frame
+            r.blend_rect(0, 0, 320, 480, 0x2945, 160)
             
             r.text_centered(200, "MENU", config.COLOR_PRIMARY, scale=3)
             
@@ -117,6 +121,7 @@ class AppRunner(Screen):
             resume_btn.draw(r)
             exit_btn.draw(r)
             r.flush()
+            self.overlay_drawn = True
             
         else:
             try:
@@ -170,6 +175,7 @@ class AppRunner(Screen):
         if self.menu_btn.is_touched(x, y):
             logger.info("App menu opened")
             self.paused = True
+            self.overlay_drawn = False
             return
         
         # Pasa el toque a la app
@@ -0,0 +1,124 @@
+# async_flush.py - Flush con doble buffer: un hilo envía un frame mientras se dibuja el siguiente
+#
+# Solo se crea al activarlo (Renderer.enable_async_flush). El renderer dibuja en
+# un buffer mientras el hilo (en el segundo núcleo del ESP32-S3) envía el otro
+# al display. Ninguno toca el buffer del otro hasta el siguiente flush(), que
+# espera a que termine el envío anterior antes de intercambiarlos.
+
+import time
+import framebuf
+import lib.logging as logging
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+logger = logging.getLogger("async_flush")
+
+class AsyncFlush:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        # Segundo framebuffer (MemoryError si no cabe: el renderer sigue síncrono)
+        self.back = bytearray(len(renderer.buffer))
+        self.back_fb = framebuf.FrameBuffer(self.back, renderer.width, renderer.buffer_rows, renderer.FORMAT)
+        # El buffer de reserva no tiene el contenido actual hasta la primera copia completa
+        self.stale = True
+        self._rects = None
+        self._running = False
+        # _job: cerrado hasta que hay un frame que enviar; _idle: cerrado mientras se envía
+        self._job = _thread.allocate_lock()
+        self._job.acquire()
+        self._idle = _thread.allocate_lock()
+        self.frames = 0
+        self.wait_us = 0
+        self.error = None
+
+    def start(self):
+        self._running = True
+        _thread.start_new_thread(self._worker, ())
+        logger.info(f"Async flush enabled: second framebuffer {len(self.back)} bytes")
+
+    def stop(self):
+        """Espera al envío en curso y termina el hilo"""
+        self.wait()
+        self._running = False
+        self._job.release()
+        logger.info("Async flush disabled")
+
+    def wait(self):
+        """Bloquea hasta que el hilo haya terminado de enviar el frame anterior"""
+        start = time.ticks_us()
+        self._idle.acquire()
+        self._idle.release()
+        self.wait_us += time.ticks_diff(time.ticks_us(), start)
+
+    def submit(self, dirty, rects):
+        """Entrega el frame recién dibujado al hilo y pasa a dibujar en el otro buffer.
+
+        dirty son las regiones cambiadas en este frame (x0, y0, x1, y1): se copian
+        al otro buffer para que siga teniendo la imagen completa. rects son las que
+        se envían. Devuelve False si el frame debe enviarse de forma síncrona.
+        """
+        r = self.renderer
+        if r.scroll_height:
+            # scroll() mueve filas sin marcarlas: el otro buffer se rehace al volver
+            self.stale = True
+            return False
+        self._idle.acquire()
+        front = r.buffer
+        back = self.back
+        if self.stale:
+            back[:] = front
+            self.stale = False
+        else:
+            self._copy(memoryview(front), memoryview(back), dirty)
+        r._front = front
+        self.back = front
+        self.back_fb, r.fb = r.fb, self.back_fb
+        r.buffer = back
+        r._set_clip(r._clip, r.fb, r._clips)
+        self._rects = rects
+        self.frames += 1
+        self._job.release()
+        return True
+
+    def _copy(self, src, dst, dirty):
+        r = self.renderer
+        stride = r.width * r.PIXEL_BYTES
+        bpp = r.PIXEL_BYTES
+        for x0, y0, x1, y1 in dirty:
+            if x0 == 0 and x1 == r.width:
+                # Filas completas: un solo bloque contiguo
+                a = y0 * stride
+                b = y1 * stride
+                dst[a:b] = src[a:b]
+            else:
+                a = y0 * stride + x0 * bpp
+                n = (x1 - x0) * bpp
+                for y in range(y0, y1):
+                    dst[a:a + n] = src[a:a + n]
+                    a += stride
+
+    def _worker(self):
+        r = self.renderer
+        while True:
+            self._job.acquire()
+            if not self._running:
+                break
+            try:
+                for x0, y0, x1, y1 in self._rects:
+                    r._push(x0, y0, x1 - x0, y1 - y0)
+            except Exception as e:
+                # No se propaga al hilo principal: se registra y el hilo sigue con el siguiente frame
+                self.error = e
+                logger.error(f"Async flush error: {e}")
+            self._rects = None
+            self._idle.release()
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "wait_us": self.wait_us,
+            "error": str(self.error) if self.error else None,
+        }
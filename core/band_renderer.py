@@ -0,0 +1,168 @@
+# band_renderer.py - Renderizado por franjas horizontales con lista de dibujo
+
+import lib.logging as logging
+from core.retained_renderer import RetainedRenderer, EXTENTS, IMMEDIATE
+
+logger = logging.getLogger("band_renderer")
+
+# Aviso si la lista de dibujo crece sin un fill() que la reinicie
+MAX_COMMANDS = 2000
+
+# Posición de los argumentos de coordenada Y (se trasladan al reproducir cada franja)
+Y_ARGS = {
+    "fill": (),
+    "pixel": (1,),
+    "line": (1, 3),
+    "rect": (1,),
+    "circle": (1,),
+    "text": (1,),
+    "rounded_rect": (1,),
+    "triangle": (1, 3, 5),
+    "hline": (1,),
+    "vline": (1,),
+    "ellipse": (1,),
+    "blend_rect": (1,),
+    "blit_sprite": (2,),
+    # Los lotes llevan las Y dentro del buffer: se trasladan con _origin_y
+    "rects": (),
+    "pixels": (),
+    "circles": (),
+    # Las capas se guardan por franja (clave con _origin_y)
+    "save_layer": (),
+    "restore_layer": (),
+    # El viewport del tilemap se traslada con _origin_y
+    "draw_tilemap": (),
+    "push_clip": (1,),
+    "pop_clip": (),
+}
+
+# Se reproducen en todas las franjas aunque su caja no las toque (mantienen la pila)
+CLIP_COMMANDS = ("push_clip", "pop_clip")
+
+class BandRenderer(RetainedRenderer):
+    """Renderer que reproduce la lista de dibujo franja a franja en flush()"""
+    def __init__(self, display, band_height):
+        super().__init__(display, buffer_rows=band_height)
+        # Comandos acumulados desde el último fill() (el contenido de la pantalla)
+        self._commands = []
+        # Índice en el frame del último comando que tapa toda la pantalla
+        self._frame_reset = -1
+        self._dirty_y0 = 0
+        self._dirty_y1 = 0
+        # push_clip grabados sin su pop_clip (un fill recortado no tapa la pantalla)
+        self._clip_depth = 0
+        self._overflow_logged = False
+        logger.info(f"BandRenderer initialized: band={self.width}x{band_height}")
+
+    def _record(self, name, args, kwargs):
+        """Añade una primitiva al frame, anotando si tapa toda la pantalla"""
+        x0, y0, x1, y1 = EXTENTS[name](self, *args, **kwargs)
+        if name == "push_clip":
+            self._clip_depth += 1
+        elif name == "pop_clip":
+            self._clip_depth = max(self._clip_depth - 1, 0)
+        elif not self._clip_depth and self._covers_screen(name, args, kwargs, x0, y0, x1, y1):
+            # Lo dibujado antes ya no es visible
+            self._frame_reset = len(self._frame)
+        elif name == "save_layer":
+            # La capa se copia franja a franja: todas las de su área deben rasterizarse
+            self._mark_bbox(x0, y0, x1, y1)
+        self._frame.append((name, args, kwargs, x0, y0, x1, y1))
+
+    def _covers_screen(self, name, args, kwargs, x0, y0, x1, y1):
+        """Indica si la primitiva tapa toda la pantalla con un color sólido"""
+        if name == "fill":
+            return True
+        if name == "restore_layer" or name == "draw_tilemap":
+            return x0 <= 0 and y0 <= 0 and x1 >= self.width and y1 >= self.height
+        if name == "rect" and (kwargs.get("fill") if kwargs else len(args) > 5 and args[5]):
+            return x0 <= 0 and y0 <= 0 and x1 >= self.width and y1 >= self.height
+        return False
+
+    def _mark_bbox(self, x0, y0, x1, y1):
+        self._mark_rows(int(y0), int(y1))
+
+    def _mark_screen(self):
+        self._mark_rows(0, self.height)
+
+    def _mark_rows(self, y0, y1):
+        """Amplía el rango de filas pendientes de enviar"""
+        if y0 < 0:
+            y0 = 0
+        if y1 > self.height:
+            y1 = self.height
+        if y0 >= y1:
+            return
+        if self._dirty_y0 >= self._dirty_y1:
+            self._dirty_y0 = y0
+            self._dirty_y1 = y1
+            return
+        if y0 < self._dirty_y0:
+            self._dirty_y0 = y0
+        if y1 > self._dirty_y1:
+            self._dirty_y1 = y1
+
+    def flush(self):
+        """Actualiza la lista acumulada con el frame y reenvía las franjas afectadas"""
+        frame = self._frame
+        reset = self._frame_reset
+        self._frame = []
+        self._frame_reset = -1
+        self._clip_depth = 0
+        if frame == self._prev:
+            # Mismos comandos que el frame anterior: ya están en la lista acumulada
+            self.frames_skipped += 1
+            return
+
+        old = self._commands
+        if reset >= 0:
+            commands = frame[reset:]
+            start = 0
+        else:
+            commands = old + frame
+            start = len(old)
+        if self._prev is None:
+            self._mark_screen()
+        else:
+            self._mark_changes(old, commands, start)
+        self._commands = commands
+        self._prev = frame
+        self.frames_rendered += 1
+
+        if len(commands) > MAX_COMMANDS and not self._overflow_logged:
+            logger.warning(f"Display list has {len(commands)} commands; call fill() each frame")
+            self._overflow_logged = True
+
+        band_h = self.buffer_rows
+        band_y = (self._dirty_y0 // band_h) * band_h
+        mv = memoryview(self.buffer)
+        if self._frame_sync is not None and band_y < self._dirty_y1:
+            self._frame_sync()
+        while band_y < self._dirty_y1:
+            rows = min(band_h, self.height - band_y)
+            self._render_band(band_y, rows)
+            self.display.draw(0, band_y, self.width, rows, mv[:rows * self.width * 2])
+            band_y += band_h
+        self._dirty_y0 = 0
+        self._dirty_y1 = 0
+        self._sample_heap()
+
+    def _render_band(self, band_y, rows):
+        """Rasteriza en el buffer los comandos que tocan la franja [band_y, band_y + rows)"""
+        self.fb.fill(0)
+        self._origin_y = band_y
+        band_end = band_y + rows
+        for name, args, kwargs, x0, y0, x1, y1 in self._commands:
+            if (y1 <= band_y or y0 >= band_end) and name not in CLIP_COMMANDS:
+                continue
+            y_args = Y_ARGS[name]
+            if band_y and y_args:
+                args = list(args)
+                for i in y_args:
+                    args[i] -= band_y
+            if kwargs:
+                IMMEDIATE[name](self, *args, **kwargs)
+            else:
+                IMMEDIATE[name](self, *args)
+        self._reset_clip()
+        self._origin_y = 0
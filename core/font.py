@@ -0,0 +1,99 @@
+# font.py - Fuentes bitmap binarias (fijas o proporcionales) leídas desde flash
+#
+# Formato (little-endian):
+#   cabecera  <4sBBHHBB: magic b"EGF1", alto, flags, primer carácter, nº de glifos,
+#             avance por defecto, línea base
+#   tabla     nº de glifos x <IBB: offset en el fichero, ancho en píxeles, avance
+#   glifos    1 bit por píxel, filas de (ancho + 7) // 8 bytes, bit más alto a la izquierda
+
+import struct
+import lib.logging as logging
+from core.glyph_cache import GlyphCache
+
+logger = logging.getLogger("font")
+
+MAGIC = b"EGF1"
+HEADER = "<4sBBHHBB"
+HEADER_SIZE = struct.calcsize(HEADER)
+ENTRY = "<IBB"
+ENTRY_SIZE = struct.calcsize(ENTRY)
+
+# flags
+PROPORTIONAL = 1
+
+class Font:
+    """Fuente bitmap que lee cada glifo del fichero solo cuando se usa"""
+    def __init__(self, path, cache_bytes):
+        self.path = path
+        self._file = open(path, "rb")
+        header = self._file.read(HEADER_SIZE)
+        magic, height, flags, first, count, advance, baseline = struct.unpack(HEADER, header)
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"Not a font file: {path}")
+        self.height = height
+        self.proportional = bool(flags & PROPORTIONAL)
+        self.first = first
+        self.count = count
+        self.default_advance = advance
+        self.baseline = baseline
+        # La tabla es pequeña: se mantiene en RAM para medir texto sin tocar el fichero
+        self._table = self._file.read(count * ENTRY_SIZE)
+        self._advances = bytearray(count)
+        for i in range(count):
+            self._advances[i] = self._table[i * ENTRY_SIZE + 5]
+        # Buffer reutilizable para leer glifos (el mayor posible de la fuente)
+        max_w = 0
+        for i in range(count):
+            max_w = max(max_w, self._table[i * ENTRY_SIZE + 4])
+        self._read_buf = bytearray(((max_w + 7) // 8) * height)
+        self._read_mv = memoryview(self._read_buf)
+        self.cache = GlyphCache(cache_bytes)
+        logger.info(f"Font loaded: {path} ({count} glyphs, h={height}, "
+                    f"{'proportional' if self.proportional else 'fixed'})")
+
+    def _index(self, ch):
+        """Índice del glifo de un carácter, o -1 si la fuente no lo tiene"""
+        i = ord(ch) - self.first
+        if 0 <= i < self.count:
+            return i
+        return -1
+
+    def advance(self, ch):
+        """Avance horizontal de un carácter en píxeles"""
+        i = self._index(ch)
+        return self._advances[i] if i >= 0 else self.default_advance
+
+    def measure(self, txt):
+        """Ancho en píxeles de un texto sumando los avances reales"""
+        if not self.proportional:
+            return len(txt) * self.default_advance
+        advances = self._advances
+        first = self.first
+        count = self.count
+        width = 0
+        for ch in txt:
+            i = ord(ch) - first
+            width += advances[i] if 0 <= i < count else self.default_advance
+        return width
+
+    def glyph(self, ch):
+        """Devuelve (bits, ancho, bytes por fila) del glifo, o None si no existe o está vacío"""
+        i = self._index(ch)
+        if i < 0 or self._table[i * ENTRY_SIZE + 4] == 0:
+            return None
+        glyph = self.cache.get(i)
+        if glyph is not None:
+            return glyph
+        offset, width, advance = struct.unpack_from(ENTRY, self._table, i * ENTRY_SIZE)
+        row_bytes = (width + 7) // 8
+        size = row_bytes * self.height
+        view = self._read_mv[:size]
+        self._file.seek(offset)
+        self._file.readinto(view)
+        glyph = (bytes(view), width, row_bytes)
+        self.cache.put(i, glyph, size)
+        return glyph
+
+    def close(self):
+        self._file.close()
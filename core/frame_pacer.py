@@ -0,0 +1,90 @@
+# frame_pacer.py - Ritmo de frames sincronizado con la señal TE (tearing effect) del panel
+#
+# El panel da un pulso TE al empezar cada blanking vertical. Cada flush espera al
+# pulso que le toca y empieza justo después; entre flush pasan `divisor` pulsos,
+# el número de periodos TE medidos más cercano al frame de config.FRAME_RATE.
+
+import time
+import lib.logging as logging
+
+logger = logging.getLogger("frame_pacer")
+
+# Pulsos usados para medir el periodo TE al activar la sincronización
+CALIBRATION_PULSES = 8
+# Sin pulsos durante este tiempo se asume que TE no llega (ms)
+TE_TIMEOUT = 100
+
+class FramePacer:
+    """Espera al pulso TE antes de cada flush (Renderer.set_frame_sync) y marca el ritmo del bucle"""
+    def __init__(self, display, target_frame_time):
+        self.display = display
+        self.target_frame_time = target_frame_time
+        # Pulsos TE por frame y pulso en el que empieza el siguiente flush
+        self.divisor = 1
+        self.period_us = 0
+        self._next = 0
+        # Ya se esperó al pulso en este frame (varios flush por frame solo esperan una vez)
+        self._synced = False
+        self.failed = False
+        self.frames = 0
+        self.late = 0
+
+    def calibrate(self):
+        """Mide el periodo TE y elige el divisor; False si no llegan pulsos"""
+        d = self.display
+        if not self._wait_pulse(d.te_count + CALIBRATION_PULSES, CALIBRATION_PULSES * TE_TIMEOUT):
+            logger.warning("No TE pulses from the panel")
+            return False
+        period = d.te_period_us
+        self.period_us = period
+        self.divisor = max(1, (self.target_frame_time * 1000 + period // 2) // period)
+        self._next = d.te_count + self.divisor
+        logger.info(f"TE sync: period {period} us, flush every {self.divisor} pulses "
+                    f"({1_000_000 // (period * self.divisor)} fps)")
+        return True
+
+    def frame_time(self):
+        """Duración del frame en ms según el periodo TE medido"""
+        return self.divisor * self.display.te_period_us // 1000
+
+    def _wait_pulse(self, count, timeout_ms):
+        """Espera activa hasta que el contador de pulsos llegue a count"""
+        d = self.display
+        start = time.ticks_ms()
+        while d.te_count < count:
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                return False
+        return True
+
+    def sync(self):
+        """Espera al pulso TE del frame para que el flush empiece en el blanking"""
+        if self._synced or self.failed:
+            return
+        self._synced = True
+        d = self.display
+        target = self._next
+        if d.te_count >= target:
+            # Frame tarde: el blanking ya pasó, se espera al siguiente en vez de cortar el barrido
+            self.late += 1
+            target = d.te_count + 1
+        if not self._wait_pulse(target, TE_TIMEOUT):
+            self.failed = True
+            logger.warning("TE pulses stopped, falling back to timed frame pacing")
+            return
+        self._next = target + self.divisor
+        self.frames += 1
+
+    def frame_done(self):
+        """Fin de frame: si no hubo flush (frame omitido), espera igualmente para mantener el ritmo"""
+        if not self._synced:
+            self.sync()
+        self._synced = False
+
+    def stats(self):
+        return {
+            "period_us": self.display.te_period_us,
+            "divisor": self.divisor,
+            "frames": self.frames,
+            "late": self.late,
+            "failed": self.failed,
+        }
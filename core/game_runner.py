@@ -3,6 +3,7 @@
 import config
 import lib.logging as logging
 from ui.screen import Screen, Button
+from core.particles import Particles
 import time
 import sys
 
@@ -14,10 +15,15 @@ class GameRunner(Screen):
         self.game_filename = game_filename
         self.game_instance = None
         self.paused = False
+        # El overlay de pausa se dibuja una vez al pausar y se deja en pantalla
+        self.overlay_drawn = False
         self.error = None
         
         # Botón pausa ajustado para pantalla vertical (320x480)
         self.pause_btn = Button(260, 5, 50, 30, "||", config.COLOR_WHITE, config.COLOR_ACCENT)
+        # Overlay de estadísticas de render (se activa desde el menú de pausa)
+        self.stats_btn = Button(90, 330, 140, 35, "Stats: OFF", config.COLOR_WHITE, config.COLOR_BUTTON_BG)
+        self.stats_btn_dirty = False
         logger.debug(f"GameRunner initialized for: {game_filename}")
     
     def enter(self):
@@ -41,7 +47,8 @@ class GameRunner(Screen):
             # Crea namespace para exec
             namespace = {
                 'renderer': self.renderer,
-                'touch': self.app.touch
+                'touch': self.app.touch,
+                'Particles': Particles
             }
             
             # Ejecuta el código
@@ -66,6 +73,11 @@ class GameRunner(Screen):
             if config.DEBUG:
                 sys.print_exception(e)
     
+    def exit(self):
+        super().exit()
+        # La instrumentación solo se usa dentro del juego
+        self.renderer.enable_stats(False)
+    
     def update(self):
         if self.error or self.paused or not self.game_instance:
             return
@@ -94,11 +106,15 @@ class GameRunner(Screen):
             r.flush()
             
         elif self.paused:
-            # Overlay de pausa (ajustado para pantalla vertical)
+            if self.overlay_drawn:
+                # Sin cambios hasta que llegue un toque
+                if self.stats_btn_dirty:
+                    self._draw_stats_btn(r)
+                    r.flush()
+                return
             logger.debug("Drawing pause overlay")
-            # Oscurece pantalla (dibuja rectángulos semi-transparentes simulados)
-            for i in range(0, 480, 4):
-                r.line(0, i, 320, i, 0x2945)
+            # Oscurece el último frame
+            r.blend_rect(0, 0, 320, 480, 0x2945, 160)
             
             r.text_centered(200, "PAUSA", config.COLOR_PRIMARY, scale=3)
             
@@ -107,7 +123,9 @@ class GameRunner(Screen):
             
             resume_btn.draw(r)
             exit_btn.draw(r)
+            self._draw_stats_btn(r)
             r.flush()
+            self.overlay_drawn = True
             
         elif self.game_instance:
             try:
@@ -116,6 +134,8 @@ class GameRunner(Screen):
                 
                 # Dibuja botón pausa encima
                 self.pause_btn.draw(r)
+                if r.stats:
+                    r.stats.draw_overlay(r)
                 r.flush()
                 
             except Exception as e:
@@ -124,6 +144,11 @@ class GameRunner(Screen):
                 if config.DEBUG:
                     sys.print_exception(e)
     
+    def _draw_stats_btn(self, r):
+        self.stats_btn.text = "Stats: ON" if r.stats else "Stats: OFF"
+        self.stats_btn.draw(r)
+        self.stats_btn_dirty = False
+    
     def handle_touch(self, x, y):
         if not self.check_touch_debounce():
             return
@@ -148,12 +173,18 @@ class GameRunner(Screen):
                 logger.info("Exiting game, returning to GamesScreen")
                 from ui.games_screen import GamesScreen # Made local to prevent recursive imports
                 self.app.change_screen(GamesScreen(self.app))
+            elif self.stats_btn.is_touched(x, y):
+                # Estadísticas de render
+                self.renderer.enable_stats(not self.renderer.stats)
+                logger.info(f"Render stats overlay: {'on' if self.renderer.stats else 'off'}")
+                self.stats_btn_dirty = True
             return
         
         # Botón pausa
         if self.pause_btn.is_touched(x, y):
             logger.info("Game paused")
             self.paused = True
+            self.overlay_drawn = False
             return
         
         # Pasa el toque al juego
@@ -0,0 +1,58 @@
+# glyph_cache.py - Caché LRU de glifos pre-renderizados limitada por bytes
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ucollections import OrderedDict
+import lib.logging as logging
+
+logger = logging.getLogger("glyph_cache")
+
+class GlyphCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # clave -> (glifo, tamaño en bytes); el orden de inserción es el orden LRU
+        self._entries = OrderedDict()
+        logger.debug(f"GlyphCache initialized: budget={max_bytes} bytes")
+
+    def get(self, key):
+        """Devuelve el glifo cacheado o None, actualizando su posición LRU"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, glyph, size):
+        """Añade un glifo, expulsando los menos usados si se supera el presupuesto"""
+        if size > self.max_bytes:
+            return
+        entries = self._entries
+        while entries and self.bytes + size > self.max_bytes:
+            oldest = next(iter(entries))
+            self.bytes -= entries.pop(oldest)[1]
+            self.evictions += 1
+        entries[key] = (glyph, size)
+        self.bytes += size
+
+    def clear(self):
+        """Vacía la caché (los contadores se conservan)"""
+        self._entries = OrderedDict()
+        self.bytes = 0
+
+    def stats(self):
+        """Contadores para ajustar el presupuesto"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
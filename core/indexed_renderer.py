@@ -0,0 +1,281 @@
+# indexed_renderer.py - Framebuffer de 8 bits (índices de paleta) expandido a RGB565 al enviar
+#
+# El buffer GS8 ocupa la mitad (320x480 = 150 KB) y las primitivas escriben un
+# byte por píxel. Los colores RGB565 se asignan a una entrada de la paleta la
+# primera vez que se usan; con la paleta llena se usa el color más parecido.
+
+import framebuf
+import micropython
+from array import array
+import lib.logging as logging
+from core.renderer import Renderer, Palette, NATIVE
+
+logger = logging.getLogger("indexed_renderer")
+
+# Filas expandidas a RGB565 por cada envío al display
+LINE_ROWS = 8
+
+class IndexedRenderer(Renderer):
+    """Renderer con framebuffer GS8 y paleta de 256 colores RGB565"""
+    FORMAT = framebuf.GS8
+    PIXEL_BYTES = 1
+    
+    def __init__(self, display):
+        # Paleta: color RGB565 de cada índice y su valor en el orden de bytes del panel
+        self._colors = array("H", [0] * 256)
+        self._lut = array("H", [0] * 256)
+        self._indices = {0x0000: 0}
+        self._count = 1
+        self._full_logged = False
+        # Tablas de blend_rect: (color, alpha) -> [entradas traducidas, tabla índice -> índice]
+        self._blend_tables = {}
+        super().__init__(display)
+        self._line = bytearray(self.width * LINE_ROWS * 2)
+        self._expand_params = array("i", [0] * 4)
+        logger.info(f"IndexedRenderer initialized: line buffer {len(self._line)} bytes")
+    
+    def _index(self, color):
+        """Handle (índice | NATIVE) de un color RGB565; los handles se devuelven tal cual"""
+        if color & NATIVE:
+            return color
+        index = self._indices.get(color)
+        if index is None:
+            index = self._add_color(color)
+        return index | NATIVE
+    
+    def _add_color(self, color):
+        """Asigna una entrada libre de la paleta, o la más parecida si está llena"""
+        if self._count < 256:
+            index = self._count
+            self._count += 1
+            self._colors[index] = color
+            self._lut[index] = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        else:
+            if not self._full_logged:
+                logger.warning("Palette full (256 colors), using nearest colors")
+                self._full_logged = True
+            index = self._nearest(color)
+        self._indices[color] = index
+        return index
+    
+    def _nearest(self, color):
+        """Índice del color de la paleta más cercano (distancia RGB con canales a 6 bits)"""
+        r = (color >> 11) << 1
+        g = (color >> 5) & 0x3F
+        b = (color & 0x1F) << 1
+        colors = self._colors
+        best = 0
+        best_d = 1 << 30
+        for i in range(self._count):
+            c = colors[i]
+            dr = ((c >> 11) << 1) - r
+            dg = ((c >> 5) & 0x3F) - g
+            db = ((c & 0x1F) << 1) - b
+            d = dr * dr + dg * dg + db * db
+            if d < best_d:
+                best = i
+                best_d = d
+        return best
+    
+    def set_color(self, index, color):
+        """Cambia el color de una entrada (animación de paleta): afecta a todos sus píxeles"""
+        old = self._colors[index]
+        if self._indices.get(old) == index:
+            del self._indices[old]
+        self._colors[index] = color
+        self._lut[index] = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        self._indices[color] = index
+        self._blend_tables = {}
+        self._mark_all()
+    
+    def palette_size(self):
+        """Entradas de la paleta en uso"""
+        return self._count
+    
+    def native(self, color):
+        return self._index(color)
+    
+    def native_to_rgb(self, color):
+        # El handle es índice | NATIVE: su color está en la paleta
+        if color & NATIVE:
+            return self._colors[color & 0xFF]
+        return color & 0xFFFF
+    
+    def palette(self, **colors):
+        p = Palette()
+        for name, color in colors.items():
+            setattr(p, name, self._index(color))
+        return p
+    
+    # Primitivas: traducen el color a índice y usan la implementación de Renderer
+    def fill(self, color):
+        Renderer.fill(self, self._index(color))
+    
+    def pixel(self, x, y, color):
+        Renderer.pixel(self, x, y, self._index(color))
+    
+    def line(self, x0, y0, x1, y1, color):
+        Renderer.line(self, x0, y0, x1, y1, self._index(color))
+    
+    def rect(self, x, y, w, h, color, fill=False):
+        Renderer.rect(self, x, y, w, h, self._index(color), fill)
+    
+    def circle(self, cx, cy, r, color, fill=False):
+        Renderer.circle(self, cx, cy, r, self._index(color), fill)
+    
+    def text(self, x, y, txt, color, scale=1, font=None):
+        Renderer.text(self, x, y, txt, self._index(color), scale, font)
+    
+    def rounded_rect(self, x, y, w, h, r, color, fill=False):
+        Renderer.rounded_rect(self, x, y, w, h, r, self._index(color), fill)
+    
+    def triangle(self, x0, y0, x1, y1, x2, y2, color, fill=False):
+        Renderer.triangle(self, x0, y0, x1, y1, x2, y2, self._index(color), fill)
+    
+    def hline(self, x, y, w, color):
+        Renderer.hline(self, x, y, w, self._index(color))
+    
+    def vline(self, x, y, h, color):
+        Renderer.vline(self, x, y, h, self._index(color))
+    
+    def ellipse(self, cx, cy, rx, ry, color, fill=False):
+        Renderer.ellipse(self, cx, cy, rx, ry, self._index(color), fill)
+    
+    def rects(self, coords, color, fill=True):
+        Renderer.rects(self, coords, self._index(color), fill)
+    
+    def pixels(self, coords, colors, size=1):
+        # Con colores por píxel, _draw_pixels los traduce con _index
+        if isinstance(colors, int):
+            colors = self._index(colors)
+        Renderer.pixels(self, coords, colors, size)
+    
+    def circles(self, coords, color, fill=True):
+        Renderer.circles(self, coords, self._index(color), fill)
+    
+    def blend_rect(self, x, y, w, h, color, alpha):
+        """Mezcla traduciendo cada índice con una tabla precalculada por (color, alpha)"""
+        x, y = int(x), int(y)
+        w, h = int(w), int(h)
+        cx0, cy0, cx1, cy1 = self._clip
+        x0 = max(x, cx0)
+        y0 = max(y, cy0)
+        x1 = min(x + w, cx1)
+        y1 = min(y + h, cy1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if color & NATIVE:
+            color = self._colors[color & 0xFF]
+        table = self._blend_table(color, max(0, min(int(alpha), 255)))
+        p = self._batch
+        p[0] = self.width
+        p[1] = x0
+        p[2] = y0
+        p[3] = x1
+        p[4] = y1
+        self._remap_rect(self.buffer, table, p)
+        self._mark(x, y, w, h)
+    
+    def _blend_table(self, color, alpha):
+        """Tabla índice -> índice del color mezclado; se amplía si la paleta creció"""
+        key = (color << 8) | alpha
+        entry = self._blend_tables.get(key)
+        if entry is None:
+            entry = [0, bytearray(range(256))]
+            self._blend_tables[key] = entry
+        count = self._count
+        if entry[0] < count:
+            table = entry[1]
+            inv = 256 - alpha
+            cr = (color >> 11) * alpha
+            cg = ((color >> 5) & 0x3F) * alpha
+            cb = (color & 0x1F) * alpha
+            for i in range(entry[0], count):
+                c = self._colors[i]
+                r = ((c >> 11) * inv + cr) >> 8
+                g = (((c >> 5) & 0x3F) * inv + cg) >> 8
+                b = ((c & 0x1F) * inv + cb) >> 8
+                table[i] = self._index((r << 11) | (g << 5) | b) & 0xFF
+            entry[0] = count
+        return entry[1]
+    
+    @micropython.viper
+    def _remap_rect(self, buf, table, params):
+        """Sustituye cada índice del rectángulo por table[índice]"""
+        dst = ptr8(buf)
+        t = ptr8(table)
+        p = ptr32(params)
+        stride = p[0]
+        x0 = p[1]
+        x1 = p[3]
+        y = p[2]
+        y1 = p[4]
+        while y < y1:
+            i = y * stride + x0
+            end = y * stride + x1
+            while i < end:
+                dst[i] = t[dst[i]]
+                i += 1
+            y += 1
+    
+    def _sprite_key(self, key):
+        return self._index(key) & 0xFF
+    
+    def _sheet_pixels(self, source, palette):
+        """Índices de una hoja: con paleta se traduce cada índice, sin ella se asigna cada RGB565"""
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                source = f.read()
+        if palette is not None:
+            table = bytes(self._index(color) & 0xFF for color in palette)
+            data = bytearray(len(source))
+            for i, index in enumerate(source):
+                data[i] = table[index]
+            return data
+        data = bytearray(len(source) // 2)
+        index = self._index
+        for i in range(len(data)):
+            data[i] = index((source[2 * i] << 8) | source[2 * i + 1]) & 0xFF
+        return data
+    
+    def _solid_color(self, value):
+        return self._colors[value & 0xFF]
+    
+    def _push_rows(self, x, dest_y, w, h, y):
+        """Expande las filas a RGB565 por bloques de LINE_ROWS en el buffer de línea y las envía"""
+        rows = len(self._line) // (w * 2)
+        mv = memoryview(self._line)
+        p = self._expand_params
+        p[1] = self.width
+        p[2] = w
+        while h > 0:
+            n = rows if rows < h else h
+            p[0] = y * self.width + x
+            p[3] = n
+            self._expand_rows(self._front, self._line, self._lut, p)
+            self.display.draw(x, dest_y, w, n, mv[:w * n * 2])
+            y += n
+            dest_y += n
+            h -= n
+    
+    @micropython.viper
+    def _expand_rows(self, src, dst, lut, params):
+        """Traduce filas de índices a RGB565 (orden del panel) en un buffer contiguo"""
+        s = ptr8(src)
+        d = ptr16(dst)
+        l = ptr16(lut)
+        p = ptr32(params)
+        offset = p[0]
+        stride = p[1]
+        w = p[2]
+        rows = p[3]
+        i = 0
+        r = 0
+        while r < rows:
+            j = offset + r * stride
+            end = j + w
+            while j < end:
+                d[i] = l[s[j]]
+                i += 1
+                j += 1
+            r += 1
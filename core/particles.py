@@ -0,0 +1,220 @@
+# particles.py - Sistema de partículas en arrays de capacidad fija con bucles viper
+#
+# Cada partícula ocupa FIELDS enteros de un único array('i'): x, y, vx, vy en punto
+# fijo (FIXED = 1 píxel), vida restante en frames y color RGB565. Las partículas
+# vivas están siempre al principio: al morir, la última ocupa su hueco.
+
+import math
+import random
+import micropython
+from array import array
+import config
+import lib.logging as logging
+from core.renderer import NATIVE
+
+logger = logging.getLogger("particles")
+
+FIELDS = 6
+FIXED = 256
+
+# Direcciones unitarias precalculadas (cos, sin en punto fijo): emit() no usa trigonometría
+DIRECTIONS = 64
+_DIRS = array("h", [0] * (2 * DIRECTIONS))
+for _i in range(DIRECTIONS):
+    _a = 2 * math.pi * _i / DIRECTIONS
+    _DIRS[2 * _i] = int(math.cos(_a) * FIXED)
+    _DIRS[2 * _i + 1] = int(math.sin(_a) * FIXED)
+
+# Margen fuera de pantalla en el que una partícula sigue viva (puede volver con la gravedad)
+MARGIN = 64
+
+class Particles:
+    """Hasta capacity partículas: emit() las crea, update() las mueve, draw(r) las pinta"""
+    def __init__(self, capacity=500, gravity=0.0, drag=1.0, size=2, renderer=None):
+        self.capacity = capacity
+        self.size = size
+        self.count = 0
+        # Renderer que traduce los handles de color (si no se pasa, el del primer draw)
+        self.renderer = renderer
+        self._pending_handles = False
+        self._data = array("i", [0] * (capacity * FIELDS))
+        # Lote para Renderer.pixels: [x, y, ...] y un color RGB565 por partícula
+        self._coords = array("h", [0] * (capacity * 2))
+        self._colors = array("H", [0] * capacity)
+        self._coords_mv = memoryview(self._coords)
+        self._colors_mv = memoryview(self._colors)
+        # count, gravedad, rozamiento (FIXED = sin rozamiento), límites de la zona viva
+        self._params = array("i", [0] * 7)
+        self.set_physics(gravity, drag)
+        p = self._params
+        p[3] = -MARGIN * FIXED
+        p[4] = -MARGIN * FIXED
+        p[5] = (config.DISPLAY_WIDTH + MARGIN) * FIXED
+        p[6] = (config.DISPLAY_HEIGHT + MARGIN) * FIXED
+        logger.debug(f"Particles initialized: capacity={capacity}, {len(self._data) * 4} bytes")
+
+    def set_physics(self, gravity=0.0, drag=1.0):
+        """gravity en píxeles/frame² (positiva hacia abajo); drag multiplica la velocidad cada frame"""
+        self._params[1] = int(gravity * FIXED)
+        self._params[2] = int(drag * FIXED)
+
+    def emit(self, x, y, count, color, speed=2.0, life=20, angle=0, spread=360):
+        """Lanza count partículas desde (x, y) en el abanico angle ± spread / 2 (grados).
+
+        La velocidad y la vida de cada una varían entre el 50% y el 100% de speed
+        y life. Si no caben, se descartan las que sobran. Devuelve las lanzadas.
+        """
+        if color & NATIVE:
+            # Los lotes de píxeles esperan RGB565: el renderer sabe qué color es el handle
+            if self.renderer is not None:
+                color = self.renderer.native_to_rgb(color)
+            else:
+                # Se guarda el handle y draw(r) lo traduce
+                self._pending_handles = True
+        else:
+            color &= 0xFFFF
+        n = min(int(count), self.capacity - self.count)
+        if n <= 0:
+            return 0
+        data = self._data
+        dirs = _DIRS
+        fx = int(x * FIXED)
+        fy = int(y * FIXED)
+        fspeed = int(speed * FIXED)
+        life = max(int(life), 1)
+        width = max(spread * DIRECTIONS // 360, 1)
+        start = int(angle - spread / 2) * DIRECTIONS // 360
+        getrandbits = random.getrandbits
+        i = self.count * FIELDS
+        for _ in range(n):
+            d = ((start + getrandbits(16) % width) % DIRECTIONS) * 2
+            s = fspeed * (128 + getrandbits(7)) >> 8
+            data[i] = fx
+            data[i + 1] = fy
+            data[i + 2] = dirs[d] * s // FIXED
+            data[i + 3] = dirs[d + 1] * s // FIXED
+            data[i + 4] = (life * (128 + getrandbits(7)) >> 8) or 1
+            data[i + 5] = color
+            i += FIELDS
+        self.count += n
+        return n
+
+    def emitter(self, x, y, rate, color, **kwargs):
+        """Crea un emisor continuo de rate partículas por frame (admite fracciones)"""
+        return Emitter(self, x, y, rate, color, kwargs)
+
+    def clear(self):
+        self.count = 0
+
+    def update(self):
+        """Avanza un frame: mueve, aplica gravedad y rozamiento y elimina las muertas"""
+        if self.count:
+            self._params[0] = self.count
+            self._step(self._data, self._params)
+            self.count = self._params[0]
+        return self.count
+
+    @micropython.viper
+    def _step(self, data, params):
+        """Integra las partículas vivas y compacta el array quitando las muertas"""
+        d = ptr32(data)
+        p = ptr32(params)
+        n = p[0]
+        gravity = p[1]
+        drag = p[2]
+        x0 = p[3]
+        y0 = p[4]
+        x1 = p[5]
+        y1 = p[6]
+        i = 0
+        while i < n:
+            base = i * 6
+            life = d[base + 4] - 1
+            x = d[base] + d[base + 2]
+            y = d[base + 1] + d[base + 3]
+            if life <= 0 or x < x0 or x >= x1 or y < y0 or y >= y1:
+                # La última partícula viva ocupa el hueco (se procesa en esta vuelta)
+                n -= 1
+                last = n * 6
+                d[base] = d[last]
+                d[base + 1] = d[last + 1]
+                d[base + 2] = d[last + 2]
+                d[base + 3] = d[last + 3]
+                d[base + 4] = d[last + 4]
+                d[base + 5] = d[last + 5]
+                continue
+            d[base] = x
+            d[base + 1] = y
+            vx = d[base + 2]
+            vy = d[base + 3] + gravity
+            if drag != 256:
+                vx = (vx * drag) >> 8
+                vy = (vy * drag) >> 8
+            d[base + 2] = vx
+            d[base + 3] = vy
+            d[base + 4] = life
+            i += 1
+        p[0] = n
+
+    def draw(self, r):
+        """Pinta las partículas vivas con una sola llamada por lotes al renderer"""
+        n = self.count
+        if not n:
+            return
+        if self.renderer is None:
+            self.renderer = r
+        if self._pending_handles:
+            self._decode_handles()
+        self._params[0] = n
+        self._pack(self._data, self._coords, self._colors, self._params)
+        r.pixels(self._coords_mv[:2 * n], self._colors_mv[:n], self.size)
+
+    def _decode_handles(self):
+        """Traduce a RGB565 los handles guardados antes de conocer el renderer"""
+        data = self._data
+        native_to_rgb = self.renderer.native_to_rgb
+        for i in range(FIELDS - 1, self.count * FIELDS, FIELDS):
+            if data[i] & NATIVE:
+                data[i] = native_to_rgb(data[i])
+        self._pending_handles = False
+
+    @micropython.viper
+    def _pack(self, data, coords, colors, params):
+        """Copia posición entera y color de cada partícula al lote de píxeles"""
+        d = ptr32(data)
+        c = ptr16(coords)
+        k = ptr16(colors)
+        n = int(ptr32(params)[0])
+        i = 0
+        while i < n:
+            base = i * 6
+            c[2 * i] = d[base] >> 8
+            c[2 * i + 1] = d[base + 1] >> 8
+            k[i] = d[base + 5]
+            i += 1
+
+
+class Emitter:
+    """Fuente continua de partículas; update() lanza las del frame"""
+    def __init__(self, particles, x, y, rate, color, options):
+        self.particles = particles
+        self.x = x
+        self.y = y
+        self.rate = rate
+        self.color = color
+        self.options = options
+        self.active = True
+        self._pending = 0.0
+
+    def move(self, x, y):
+        self.x = x
+        self.y = y
+
+    def update(self):
+        if not self.active:
+            return
+        self._pending += self.rate
+        n = int(self._pending)
+        if n:
+            self._pending -= n
+            self.particles.emit(self.x, self.y, n, self.color, **self.options)
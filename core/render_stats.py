@@ -0,0 +1,182 @@
+# render_stats.py - Instrumentación del renderizado (llamadas, píxeles, tiempos, bytes SPI)
+#
+# Solo se instala al activarla (Renderer.enable_stats): envuelve las primitivas,
+# flush() y las escrituras del display de esa instancia. Desactivada no cuesta nada.
+
+import time
+from array import array
+import lib.logging as logging
+from core.retained_renderer import EXTENTS, LAYER_COMMANDS
+
+logger = logging.getLogger("render_stats")
+
+# Frames de la ventana deslizante
+WINDOW = 30
+
+# Totales por frame guardados en la ventana
+FRAME_KEYS = ("frame_us", "raster_us", "flush_us", "spi_bytes", "pixels", "calls")
+
+class RenderStats:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        # nombre -> [llamadas, píxeles estimados, us] del frame en curso
+        self.primitives = {name: [0, 0, 0] for name in EXTENTS}
+        self.last_primitives = {}
+        self.totals = {name: 0 for name in EXTENTS}
+        self.raster_us = 0
+        self.spi_bytes = 0
+        self.frames = 0
+        self._history = {key: array("i", [0] * WINDOW) for key in FRAME_KEYS}
+        self._index = 0
+        self._last = {key: 0 for key in FRAME_KEYS}
+        self._frame_start = time.ticks_us()
+        # >0 mientras se ejecuta una primitiva (las llamadas anidadas no se cuentan)
+        self._depth = 0
+        self._installed = []
+
+    def install(self):
+        """Envuelve primitivas, flush y display de la instancia"""
+        r = self.renderer
+        for name in EXTENTS:
+            self._wrap(r, name, self._primitive_wrapper(name, getattr(r, name)))
+        self._wrap(r, "flush", self._flush_wrapper(r.flush))
+        display = r.display
+        self._wrap(display, "draw", self._draw_wrapper(display.draw))
+        if hasattr(display, "draw_region"):
+            self._wrap(display, "draw_region", self._region_wrapper(display.draw_region))
+        if hasattr(display, "fill_rect"):
+            self._wrap(display, "fill_rect", self._fill_wrapper(display.fill_rect))
+        logger.info("Render stats enabled")
+
+    def uninstall(self):
+        """Quita los envoltorios: vuelven los métodos de la clase"""
+        for obj, name in self._installed:
+            delattr(obj, name)
+        self._installed = []
+        logger.info("Render stats disabled")
+
+    def _wrap(self, obj, name, wrapper):
+        setattr(obj, name, wrapper)
+        self._installed.append((obj, name))
+
+    def _primitive_wrapper(self, name, fn):
+        counters = self.primitives[name]
+        extent = None if name in LAYER_COMMANDS else EXTENTS[name]
+        r = self.renderer
+        def wrapper(*args, **kwargs):
+            if self._depth:
+                return fn(*args, **kwargs)
+            self._depth = 1
+            start = time.ticks_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.ticks_diff(time.ticks_us(), start)
+                self._depth = 0
+                counters[0] += 1
+                counters[2] += elapsed
+                self.raster_us += elapsed
+                if extent is not None:
+                    counters[1] += self._area(extent(r, *args, **kwargs))
+        return wrapper
+
+    def _area(self, box):
+        """Píxeles estimados: caja envolvente recortada a la pantalla"""
+        x0, y0, x1, y1 = box
+        r = self.renderer
+        w = min(x1, r.width) - max(x0, 0)
+        h = min(y1, r.height) - max(y0, 0)
+        return w * h if w > 0 and h > 0 else 0
+
+    def _flush_wrapper(self, fn):
+        def wrapper():
+            start = time.ticks_us()
+            fn()
+            end = time.ticks_us()
+            self._end_frame(time.ticks_diff(end, start), end)
+        return wrapper
+
+    def _draw_wrapper(self, fn):
+        def wrapper(x, y, w, h, buf):
+            self.spi_bytes += len(buf)
+            fn(x, y, w, h, buf)
+        return wrapper
+
+    def _region_wrapper(self, fn):
+        def wrapper(x, y, w, h, buf, stride):
+            self.spi_bytes += w * h * 2
+            fn(x, y, w, h, buf, stride)
+        return wrapper
+
+    def _fill_wrapper(self, fn):
+        def wrapper(x, y, w, h, color):
+            # Color repetido sin framebuffer (ver Renderer.flush): se envían igual w * h píxeles
+            self.spi_bytes += w * h * 2
+            fn(x, y, w, h, color)
+        return wrapper
+
+    def _end_frame(self, flush_us, end):
+        """Cierra el frame: guarda sus totales en la ventana y reinicia contadores"""
+        calls = 0
+        pixels = 0
+        last = {}
+        for name, counters in self.primitives.items():
+            if counters[0]:
+                calls += counters[0]
+                pixels += counters[1]
+                self.totals[name] += counters[0]
+                last[name] = tuple(counters)
+                counters[0] = 0
+                counters[1] = 0
+                counters[2] = 0
+        values = self._last
+        values["frame_us"] = time.ticks_diff(end, self._frame_start)
+        # En modos retained/band la rasterización ocurre dentro de flush()
+        values["raster_us"] = self.raster_us
+        values["flush_us"] = flush_us
+        values["spi_bytes"] = self.spi_bytes
+        values["pixels"] = pixels
+        values["calls"] = calls
+        i = self._index
+        for key in FRAME_KEYS:
+            self._history[key][i] = values[key]
+        self._index = (i + 1) % WINDOW
+        self.frames += 1
+        self.last_primitives = last
+        self.raster_us = 0
+        self.spi_bytes = 0
+        self._frame_start = end
+
+    def report(self):
+        """Último frame, medias de la ventana y primitivas del último frame"""
+        n = min(self.frames, WINDOW)
+        window = {}
+        for key in FRAME_KEYS:
+            window[key] = sum(self._history[key]) // n if n else 0
+        frame_us = window["frame_us"]
+        window["fps"] = 1_000_000 / frame_us if frame_us else 0
+        return {
+            "frame": dict(self._last),
+            "window": window,
+            "primitives": self.last_primitives,
+            "totals": {name: count for name, count in self.totals.items() if count},
+        }
+
+    def draw_overlay(self, r, x=0, y=432):
+        """Dibuja un resumen de la ventana en pantalla (sin contarlo en las estadísticas)"""
+        window = self.report()["window"]
+        top = ""
+        top_calls = 0
+        for name, counters in self.last_primitives.items():
+            if counters[0] > top_calls:
+                top = name
+                top_calls = counters[0]
+        self._depth = 1
+        try:
+            r.rect(x, y, 216, 48, 0x0000, fill=True)
+            r.text(x + 4, y + 4, f"FPS {window['fps']:.1f} frame {window['frame_us'] // 1000}ms", 0x07E0)
+            r.text(x + 4, y + 15, f"raster {window['raster_us'] // 1000}ms flush {window['flush_us'] // 1000}ms", 0xFFFF)
+            r.text(x + 4, y + 26, f"SPI {window['spi_bytes'] // 1024}KB px {window['pixels'] // 1000}k", 0xFFFF)
+            r.text(x + 4, y + 37, f"{window['calls']} calls, top {top} x{top_calls}", 0xFFE0)
+        finally:
+            self._depth = 0
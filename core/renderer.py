@@ -1,93 +1,503 @@
 # renderer.py - Sistema de renderizado con framebuffer
 
+import gc
 import framebuf
 import micropython
+from array import array
+from micropython import const
+import config
 import lib.logging as logging
+from core.glyph_cache import GlyphCache
+from core.font import Font
+from core.sprites import Sprite, FLIP_X, FLIP_Y, split_sheet, read_sheet
+from core.tilemap import TileMap, build_atlas
 
 logger = logging.getLogger("renderer")
 
+# Máximo de rectángulos sucios independientes antes de fusionarlos en uno
+MAX_DIRTY_RECTS = 8
+
+# Maquetaciones de text_box guardadas antes de vaciar la caché
+MAX_TEXT_LAYOUTS = 32
+
+# Bit que marca un color ya convertido al orden de bytes del panel.
+# framebuf y ptr16 truncan a 16 bits, así que el handle se usa tal cual.
+NATIVE = const(0x10000)
+
+def native_color(color):
+    """Convierte un color RGB565 a un handle en el orden de bytes del panel"""
+    if color & NATIVE:
+        return color
+    return ((color & 0xFF) << 8) | ((color >> 8) & 0xFF) | NATIVE
+
+def corner_table(r):
+    """Márgenes (inicio, fin) del borde de una esquina de radio r en sus filas 0..r-1.
+
+    Sigue el mismo algoritmo de punto medio que framebuf.ellipse, así las esquinas
+    quedan igual que las de ellipse(..., r, r, ...)
+    """
+    if r <= 0:
+        return bytearray(0)
+    lo = bytearray(b"\xff" * (r + 1))
+    hi = bytearray(r + 1)
+    two_square = 2 * r * r
+    # Primer tramo: una x por cada y
+    px = r
+    py = 0
+    xchange = r * r * (1 - 2 * r)
+    ychange = r * r
+    error = 0
+    stop_x = two_square * r
+    stop_y = 0
+    while stop_x >= stop_y:
+        lo[py] = min(lo[py], px)
+        hi[py] = max(hi[py], px)
+        py += 1
+        stop_y += two_square
+        error += ychange
+        ychange += two_square
+        if 2 * error + xchange > 0:
+            px -= 1
+            stop_x -= two_square
+            error += xchange
+            xchange += two_square
+    # Segundo tramo: una y por cada x
+    px = 0
+    py = r
+    xchange = r * r
+    ychange = r * r * (1 - 2 * r)
+    error = 0
+    stop_x = 0
+    stop_y = two_square * r
+    while stop_x <= stop_y:
+        lo[py] = min(lo[py], px)
+        hi[py] = max(hi[py], px)
+        px += 1
+        stop_x += two_square
+        error += xchange
+        xchange += two_square
+        if 2 * error + ychange > 0:
+            py -= 1
+            stop_y -= two_square
+            error += ychange
+            ychange += two_square
+    # Fila k desde el borde exterior = py = r - k
+    table = bytearray(2 * r)
+    for k in range(r):
+        table[2 * k] = r - hi[r - k]
+        table[2 * k + 1] = r - lo[r - k]
+    return table
+
+class Palette:
+    """Registro de colores con nombre, convertidos una sola vez al definirlos"""
+    def __init__(self, **colors):
+        for name, color in colors.items():
+            setattr(self, name, native_color(color))
+    
+    def add(self, name, color):
+        """Registra un color y devuelve su handle nativo"""
+        handle = native_color(color)
+        setattr(self, name, handle)
+        return handle
+
 class Renderer:
-    def __init__(self, display):
+    FLIP_X = FLIP_X
+    FLIP_Y = FLIP_Y
+    # Formato del framebuffer (IndexedRenderer usa GS8 con 1 byte por píxel).
+    # Las rutinas viper escriben con ptr16 o ptr8 según PIXEL_BYTES
+    FORMAT = framebuf.RGB565
+    PIXEL_BYTES = 2
+    
+    def __init__(self, display, buffer_rows=None):
         logger.debug("Initializing Renderer...")
         self.display = display
         self.width = display.WIDTH
         self.height = display.HEIGHT
         
-        # Framebuffer RGB565
-        buffer_size = self.width * self.height * 2
-        logger.debug(f"Allocating framebuffer: {buffer_size} bytes ({self.width}x{self.height})")
+        # Framebuffer (pantalla completa, o una franja en modo bandas)
+        self.buffer_rows = buffer_rows or self.height
+        buffer_size = self.width * self.buffer_rows * self.PIXEL_BYTES
+        logger.debug(f"Allocating framebuffer: {buffer_size} bytes ({self.width}x{self.buffer_rows})")
         self.buffer = bytearray(buffer_size)
-        self.fb = framebuf.FrameBuffer(self.buffer, self.width, self.height, framebuf.RGB565)
+        self.fb = framebuf.FrameBuffer(self.buffer, self.width, self.buffer_rows, self.FORMAT)
         
         # Fuente básica (8x8 por defecto en framebuf)
         self.font_width = 8
         self.font_height = 8
+        
+        # Caché de glifos escalados (texto con scale > 1)
+        self.glyph_cache = GlyphCache(config.GLYPH_CACHE_BYTES)
+        self._glyph_src = bytearray(self.font_width * self.font_height * 2)
+        self._glyph_src_fb = framebuf.FrameBuffer(self._glyph_src, self.font_width, self.font_height, framebuf.RGB565)
+        
+        # Fuentes binarias: nombre -> Font (None si no se pudo cargar), ver font()
+        self.fonts = {}
+        self._font_params = array("i", [0] * 12)
+        # Líneas de text_box ya partidas: (texto, ancho, alto, escala, fuente, interlineado) -> tupla
+        self._text_layouts = {}
+        
+        # Parámetros del rasterizador de triángulos (ver _triangle_spans)
+        self._tri_params = array("i", [0] * 18)
+        
+        # Tablas de esquinas de rounded_rect por radio (ver corner_table)
+        self._corner_tables = {}
+        self._rrect_params = array("i", [0] * 10)
+        
+        # Tramos horizontales (y, x0, x1) que calculan triangle y rounded_rect y rellena _fill_spans
+        self._spans = array("h")
+        self._span_params = array("i", [0] * 3)
+        
+        # Regiones modificadas desde el último flush (x0, y0, x1, y1 exclusivos)
+        self._dirty = []
+        self._dirty_all = False
+        # Color (en el formato del buffer) si la pantalla es solo un fill() sin nada encima
+        self._solid = None
+        # Regiones dibujadas en el frame anterior sin contar los tilemaps (tiles tapados),
+        # y las que pintaron los tilemaps en este (se envían, pero no tapan tiles)
+        self._prev_dirty = []
+        self._prev_dirty_all = True
+        self._tile_marks = []
+        
+        # Pico de heap observado en los flush (ver memory_stats)
+        self.heap_peak = 0
+        
+        # Instrumentación (None = desactivada, sin coste), ver enable_stats
+        self.stats = None
+        
+        # Hash por fila de lo enviado al panel (None = desactivado), ver enable_row_hash
+        self._row_hashes = None
+        self._row_changed = None
+        self._row_stamp = 0
+        self._row_force_all = False
+        self._hash_params = array("i", [0] * 6)
+        
+        # Buffer que se envía al display y flush asíncrono (None = síncrono), ver enable_async_flush
+        self._front = self.buffer
+        self._async = None
+        # Llamada antes de enviar cada frame (espera al blanking del panel), ver set_frame_sync
+        self._frame_sync = None
+        
+        # Sprites cargados o horneados: nombre -> lista de frames
+        self.sprites = {}
+        self._blit_params = array("i", [0] * 12)
+        self._tile_params = array("i", [0] * 24)
+        
+        # Zona de scroll por hardware (ver set_scroll_region); offset = desplazamiento del panel
+        self.scroll_top = 0
+        self.scroll_height = 0
+        self._scroll_offset = 0
+        self._scroll_pending = False
+        
+        # Capas guardadas: (nombre, origen y) -> (x, y, w, filas, datos) en coordenadas del buffer
+        self.layers = {}
+        
+        # Primitivas por lotes (rects/pixels/circles), ver _batch_params
+        self._batch = array("i", [0] * 9)
+        self._bounds = array("i", [0] * 4)
+        # Desplazamiento vertical del buffer respecto a la pantalla (modo bandas)
+        self._origin_y = 0
+        # Destinos de dibujo apilados (sprites horneados), ver _begin_target
+        self._targets = []
+        # Recorte activo (x0, y0, x1, y1 en coordenadas del buffer) y pila de push_clip.
+        # Con recorte, self.fb es una vista del buffer que empieza en (x0, y0)
+        self._clip = (0, 0, self.width, self.buffer_rows)
+        self._clips = []
+        self._ox = 0
+        self._oy = 0
+        self._clip_sink = framebuf.FrameBuffer(bytearray(2), 1, 1, self.FORMAT)
         logger.info(f"Renderer initialized: {self.width}x{self.height}, buffer={buffer_size} bytes")
     
+    def _mark(self, x, y, w, h):
+        """Registra un rectángulo modificado para el próximo flush"""
+        self._solid = None
+        if self._dirty_all:
+            return
+        if self._clips:
+            cx0, cy0, cx1, cy1 = self._clip
+            if x < cx0:
+                w -= cx0 - x
+                x = cx0
+            if y < cy0:
+                h -= cy0 - y
+                y = cy0
+            if x + w > cx1:
+                w = cx1 - x
+            if y + h > cy1:
+                h = cy1 - y
+        x0 = x if x > 0 else 0
+        y0 = y if y > 0 else 0
+        x1 = x + w
+        y1 = y + h
+        if x1 > self.width:
+            x1 = self.width
+        if y1 > self.height:
+            y1 = self.height
+        if x0 >= x1 or y0 >= y1:
+            return
+        
+        dirty = self._dirty
+        for d in dirty:
+            # Fusiona con un rectángulo que se solape o toque
+            if x0 <= d[2] and d[0] <= x1 and y0 <= d[3] and d[1] <= y1:
+                if x0 < d[0]:
+                    d[0] = x0
+                if y0 < d[1]:
+                    d[1] = y0
+                if x1 > d[2]:
+                    d[2] = x1
+                if y1 > d[3]:
+                    d[3] = y1
+                return
+        
+        if len(dirty) < MAX_DIRTY_RECTS:
+            dirty.append([x0, y0, x1, y1])
+            return
+        
+        # Demasiados rectángulos: se colapsan en su unión
+        for d in dirty:
+            if d[0] < x0:
+                x0 = d[0]
+            if d[1] < y0:
+                y0 = d[1]
+            if d[2] > x1:
+                x1 = d[2]
+            if d[3] > y1:
+                y1 = d[3]
+        self._dirty = [[x0, y0, x1, y1]]
+    
+    def native(self, color):
+        """Devuelve el handle nativo de un color (evita el swap en cada llamada)"""
+        return native_color(color)
+    
+    def native_to_rgb(self, color):
+        """Color RGB565 de un handle nativo (un color RGB565 se devuelve tal cual)"""
+        if color & NATIVE:
+            return ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        return color & 0xFFFF
+    
+    def palette(self, **colors):
+        """Crea una paleta de colores nativos: r.palette(BG=0x1082, PLAYER=0xFE19)"""
+        return Palette(**colors)
+    
+    def _mark_all(self):
+        """Registra que toda la pantalla ha cambiado"""
+        self._dirty_all = True
+    
+    def invalidate(self):
+        """Marca toda la pantalla para enviarla en el próximo flush"""
+        self._mark_all()
+    
     def fill(self, color):
         """Rellena toda la pantalla con un color"""
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
         self.fb.fill(color)
+        if self._clips:
+            x0, y0, x1, y1 = self._clip
+            self._mark(x0, y0, x1 - x0, y1 - y0)
+        else:
+            self._mark_all()
+            if not self._targets and self.buffer_rows == self.height:
+                self._solid = color & 0xFFFF
     
     def pixel(self, x, y, color):
         """Dibuja un pixel"""
         x, y = int(x), int(y)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        if 0 <= x < self.width and 0 <= y < self.height:
-            self.fb.pixel(x, y, color)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        x0, y0, x1, y1 = self._clip
+        if x0 <= x < x1 and y0 <= y < y1:
+            self.fb.pixel(x - x0, y - y0, color)
+            self._mark(x, y, 1, 1)
     
     def line(self, x0, y0, x1, y1, color):
         """Dibuja una línea"""
         x0, y0 = int(x0), int(y0)
         x1, y1 = int(x1), int(y1)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        self.fb.line(x0, y0, x1, y1, color)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        ox = self._ox
+        oy = self._oy
+        self.fb.line(x0 - ox, y0 - oy, x1 - ox, y1 - oy, color)
+        self._mark(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
     
     def rect(self, x, y, w, h, color, fill=False):
         """Dibuja un rectángulo"""
         x, y = int(x), int(y)
         w, h = int(w), int(h)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
         if fill:
-            self.fb.fill_rect(x, y, w, h, color)
+            self.fb.fill_rect(x - self._ox, y - self._oy, w, h, color)
         else:
-            self.fb.rect(x, y, w, h, color)
+            self.fb.rect(x - self._ox, y - self._oy, w, h, color)
+        self._mark(x, y, w, h)
     
     def circle(self, cx, cy, r, color, fill=False):
         """Dibuja un círculo usando framebuf.ellipse"""
         cx, cy = int(cx), int(cy)
         r = int(r)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        self.fb.ellipse(cx, cy, r, r, color, fill)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        self.fb.ellipse(cx - self._ox, cy - self._oy, r, r, color, fill)
+        self._mark(cx - r, cy - r, 2 * r + 1, 2 * r + 1)
     
-    def text(self, x, y, txt, color, scale=1):
-        """Dibuja texto con escala opcional"""
+    def text(self, x, y, txt, color, scale=1, font=None):
+        """Dibuja texto con escala opcional y fuente binaria opcional (ver load_font)"""
         x, y = int(x), int(y)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        if font is not None:
+            f = self.font(font)
+            if f is not None:
+                self._font_text(x, y, txt, color, scale, f)
+                return
+        self._mark(x, y, len(txt) * self.font_width * scale, self.font_height * scale)
+        x -= self._ox
+        y -= self._oy
         if scale == 1:
             self.fb.text(txt, x, y, color)
         else:
-            # Calcula dimensiones del texto
-            text_w = len(txt) * self.font_width
-            text_h = self.font_height
-            scaled_w = text_w * scale
-            scaled_h = text_h * scale
-            
-            # Buffer temporal para texto original
-            temp_buf = bytearray(text_w * text_h * 2)
-            temp_fb = framebuf.FrameBuffer(temp_buf, text_w, text_h, framebuf.RGB565)
-            temp_fb.fill(0)
-            temp_fb.text(txt, 0, 0, color)
-            
-            # Buffer temporal para texto escalado
-            scaled_buf = bytearray(scaled_w * scaled_h * 2)
-            scaled_fb = framebuf.FrameBuffer(scaled_buf, scaled_w, scaled_h, framebuf.RGB565)
-            
-            # Escalar usando función optimizada
-            self._scale_buffer(temp_buf, scaled_buf, text_w, text_h, scale)
-            
-            # Blit del texto escalado al framebuffer principal
-            self.fb.blit(scaled_fb, x, y, 0)
+            # Blit de glifos pre-escalados desde la caché
+            advance = self.font_width * scale
+            for ch in txt:
+                if ch != " ":
+                    self.fb.blit(self._glyph(ch, color, scale), x, y, 0)
+                x += advance
+    
+    def _glyph(self, ch, color, scale):
+        """Devuelve el glifo escalado de un carácter, renderizándolo si no está en caché"""
+        # Clave entera para no reservar memoria en cada búsqueda
+        key = (ord(ch) << 20) | (scale << 16) | (color & 0xFFFF)
+        glyph = self.glyph_cache.get(key)
+        if glyph is None:
+            self._glyph_src_fb.fill(0)
+            self._glyph_src_fb.text(ch, 0, 0, color)
+            w = self.font_width * scale
+            h = self.font_height * scale
+            size = w * h * 2
+            buf = bytearray(size)
+            self._scale_buffer(self._glyph_src, buf, self.font_width, self.font_height, scale)
+            glyph = framebuf.FrameBuffer(buf, w, h, framebuf.RGB565)
+            self.glyph_cache.put(key, glyph, size)
+        return glyph
+    
+    def load_font(self, name, path):
+        """Abre una fuente binaria y la registra con un nombre para text(..., font=name)"""
+        try:
+            self.fonts[name] = Font(path, config.FONT_CACHE_BYTES)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot load font {name} from {path}: {e}")
+            self.fonts[name] = None
+        return self.fonts[name]
+    
+    def font(self, name):
+        """Devuelve la fuente registrada, cargándola de config.FONTS la primera vez"""
+        if name in self.fonts:
+            return self.fonts[name]
+        path = config.FONTS.get(name)
+        if path is None:
+            logger.warning(f"Unknown font: {name}")
+            self.fonts[name] = None
+            return None
+        return self.load_font(name, path)
+    
+    def text_width(self, txt, scale=1, font=None):
+        """Ancho en píxeles del texto con los avances reales de la fuente"""
+        if font is not None:
+            f = self.font(font)
+            if f is not None:
+                return f.measure(txt) * scale
+        return len(txt) * self.font_width * scale
+    
+    def text_height(self, scale=1, font=None):
+        """Alto de una línea de texto en píxeles"""
+        if font is not None:
+            f = self.font(font)
+            if f is not None:
+                return f.height * scale
+        return self.font_height * scale
+    
+    def _font_text(self, x, y, txt, color, scale, f):
+        """Dibuja texto con una fuente binaria, glifo a glifo con el blitter 1-bit"""
+        scale = int(scale)
+        self._mark(x, y, f.measure(txt) * scale, f.height * scale)
+        p = self._font_params
+        p[1] = y
+        p[3] = f.height
+        p[5] = color
+        p[6] = self.width
+        p[9] = scale
+        x0, y0, x1, y1 = self._clip
+        p[7] = x1
+        p[8] = y1
+        p[10] = x0
+        p[11] = y0
+        for ch in txt:
+            glyph = f.glyph(ch)
+            if glyph is not None:
+                bits, w, row_bytes = glyph
+                p[0] = x
+                p[2] = w
+                p[4] = row_bytes
+                self._blit_glyph(self.buffer, bits, p)
+            x += f.advance(ch) * scale
+    
+    @micropython.viper
+    def _blit_glyph(self, buf, bits, params):
+        """Pinta los bits activos de un glifo 1-bit (MSB a la izquierda) con escala entera"""
+        dst = ptr16(buf)
+        dst8 = ptr8(buf)
+        wide = int(self.PIXEL_BYTES) == 2
+        src = ptr8(bits)
+        p = ptr32(params)
+        x = p[0]
+        y = p[1]
+        w = p[2]
+        h = p[3]
+        row_bytes = p[4]
+        color = p[5]
+        stride = p[6]
+        clip_x1 = p[7]
+        clip_y1 = p[8]
+        clip_x0 = p[10]
+        clip_y0 = p[11]
+        scale = p[9]
+        gy = 0
+        while gy < h:
+            row = gy * row_bytes
+            py = y + gy * scale
+            gx = 0
+            while gx < w:
+                if src[row + (gx >> 3)] & (0x80 >> (gx & 7)):
+                    # Bloque scale x scale del bit, recortado
+                    xs = x + gx * scale
+                    xe = xs + scale
+                    if xs < clip_x0:
+                        xs = clip_x0
+                    if xe > clip_x1:
+                        xe = clip_x1
+                    sy = 0
+                    while sy < scale and xs < xe:
+                        yy = py + sy
+                        if yy >= clip_y0 and yy < clip_y1:
+                            i = yy * stride + xs
+                            end = yy * stride + xe
+                            if wide:
+                                while i < end:
+                                    dst[i] = color
+                                    i += 1
+                            else:
+                                while i < end:
+                                    dst8[i] = color
+                                    i += 1
+                        sy += 1
+                gx += 1
+            gy += 1
+    
+    def glyph_cache_stats(self):
+        """Aciertos/fallos de la caché de glifos para ajustar GLYPH_CACHE_BYTES"""
+        return self.glyph_cache.stats()
     
     @micropython.viper
     def _scale_buffer(self, src, dst, w: int, h: int, scale: int):
@@ -107,59 +517,181 @@ class Renderer:
                             dst_x = sx * scale + dx
                             dst_buf[dst_y * scaled_w + dst_x] = pixel
     
-    def text_centered(self, y, txt, color, scale=1):
+    def text_centered(self, y, txt, color, scale=1, font=None):
         """Dibuja texto centrado horizontalmente"""
         y = int(y)
         scale = int(scale)
-        text_width = len(txt) * self.font_width * scale
+        text_width = self.text_width(txt, scale, font)
         x = (self.width - text_width) // 2
-        self.text(x, y, txt, color, scale)
+        self.text(x, y, txt, color, scale, font)
     
-    def text_right(self, x, y, txt, color, scale=1):
+    def text_right(self, x, y, txt, color, scale=1, font=None):
         """Dibuja texto alineado a la derecha"""
         x, y = int(x), int(y)
         scale = int(scale)
-        text_width = len(txt) * self.font_width * scale
-        self.text(x - text_width, y, txt, color, scale)
+        text_width = self.text_width(txt, scale, font)
+        self.text(x - text_width, y, txt, color, scale, font)
+    
+    def text_box(self, x, y, w, h, txt, color, scale=1, font=None, line_height=0):
+        """Dibuja texto partido en líneas dentro de la caja; lo que no cabe termina en '...'"""
+        x, y = int(x), int(y)
+        scale = int(scale)
+        if not line_height:
+            line_height = self.text_height(scale, font) + 2 * scale
+        key = (txt, int(w), int(h), scale, font, line_height)
+        lines = self._text_layouts.get(key)
+        if lines is None:
+            lines = self._layout_text(txt, int(w), int(h), scale, font, line_height)
+            if len(self._text_layouts) >= MAX_TEXT_LAYOUTS:
+                self._text_layouts.clear()
+            self._text_layouts[key] = lines
+        for line in lines:
+            self.text(x, y, line, color, scale, font)
+            y += line_height
+        return len(lines)
+    
+    def _layout_text(self, txt, w, h, scale, font, line_height):
+        """Parte el texto por palabras (o por letras si una no cabe) en las líneas que caben"""
+        max_lines = (h - self.text_height(scale, font)) // line_height + 1
+        if max_lines <= 0 or w <= 0:
+            return ()
+        lines = []
+        line = ""
+        words = txt.split()
+        i = 0
+        while i < len(words):
+            word = words[i]
+            candidate = line + " " + word if line else word
+            if self.text_width(candidate, scale, font) <= w:
+                line = candidate
+                i += 1
+                continue
+            if line:
+                lines.append(line)
+                line = ""
+            else:
+                # Palabra más ancha que la caja: se corta en la última letra que cabe
+                cut = 1
+                while cut < len(word) and self.text_width(word[:cut + 1], scale, font) <= w:
+                    cut += 1
+                lines.append(word[:cut])
+                words[i] = word[cut:]
+            if len(lines) == max_lines:
+                break
+        if line and len(lines) < max_lines:
+            lines.append(line)
+        elif i < len(words) or line:
+            # Sobra texto: la última línea acaba en puntos suspensivos
+            last = lines[-1]
+            while last and self.text_width(last + "...", scale, font) > w:
+                last = last[:-1]
+            lines[-1] = last.rstrip() + "..."
+        return tuple(lines)
     
     def rounded_rect(self, x, y, w, h, r, color, fill=False):
-        """Dibuja un rectángulo con esquinas redondeadas"""
+        """Dibuja un rectángulo con esquinas redondeadas (una pasada viper)"""
         x, y = int(x), int(y)
         w, h = int(w), int(h)
-        r = int(r)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        if fill:
-            self.fb.fill_rect(x + r, y, w - 2 * r, h, color)
-            self.fb.fill_rect(x, y + r, w, h - 2 * r, color)
-            self._fill_corner(x + r, y + r, r, color, 1)  # Top-left (Q2)
-            self._fill_corner(x + w - r - 1, y + r, r, color, 0)  # Top-right (Q1)
-            self._fill_corner(x + r, y + h - r - 1, r, color, 2)  # Bottom-left (Q3)
-            self._fill_corner(x + w - r - 1, y + h - r - 1, r, color, 3)  # Bottom-right (Q4)
-        else:
-            self.fb.hline(x + r, y, w - 2 * r, color)
-            self.fb.hline(x + r, y + h - 1, w - 2 * r, color)
-            self.fb.vline(x, y + r, h - 2 * r, color)
-            self.fb.vline(x + w - 1, y + r, h - 2 * r, color)
-            self._draw_corner(x + r, y + r, r, color, 1)  # Top-left (Q2)
-            self._draw_corner(x + w - r - 1, y + r, r, color, 0)  # Top-right (Q1)
-            self._draw_corner(x + r, y + h - r - 1, r, color, 2)  # Bottom-left (Q3)
-            self._draw_corner(x + w - r - 1, y + h - r - 1, r, color, 3)  # Bottom-right (Q4)
-    
-    def _draw_corner(self, cx, cy, r, color, quadrant):
-        """Dibuja un cuarto de círculo usando ellipse"""
-        cx, cy = int(cx), int(cy)
-        r = int(r)
-        # Usar ellipse con máscara de cuadrante
-        mask = 1 << quadrant
-        self.fb.ellipse(cx, cy, r, r, color, False, mask)
+        if w <= 0 or h <= 0:
+            return
+        # Mismo límite que la versión con framebuf: r = h // 2 (progress_bar, botones píldora)
+        r = max(0, min(int(r), w // 2, h // 2))
+        if w <= 2 or h <= 2:
+            # Con 2 píxeles las esquinas de framebuf se solapan: queda un rectángulo
+            r = 0
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        self._mark(x, y, w, h)
+        table = self._corner_tables.get(r)
+        if table is None:
+            table = corner_table(r)
+            self._corner_tables[r] = table
+        p = self._rrect_params
+        p[0] = x
+        p[1] = y
+        p[2] = w
+        p[3] = h
+        p[4] = r
+        p[5] = 1 if fill else 0
+        p[6], p[7], p[8], p[9] = self._clip
+        # Hasta dos tramos (bordes izquierdo y derecho) por fila
+        spans = self._span_buffer(2 * min(h, self.buffer_rows))
+        self._draw_spans(self._rrect_spans(spans, table, p), color)
     
-    def _fill_corner(self, cx, cy, r, color, quadrant):
-        """Rellena un cuarto de círculo usando ellipse"""
-        cx, cy = int(cx), int(cy)
-        r = int(r)
-        # Usar ellipse con máscara de cuadrante
-        mask = 1 << quadrant
-        self.fb.ellipse(cx, cy, r, r, color, True, mask)
+    @micropython.viper
+    def _rrect_spans(self, spans, table, params) -> int:
+        """Tramos del rectángulo fila a fila con los márgenes de la tabla; devuelve cuántos"""
+        s = ptr16(spans)
+        t = ptr8(table)
+        p = ptr32(params)
+        x = p[0]
+        y = p[1]
+        w = p[2]
+        h = p[3]
+        r = p[4]
+        fill = p[5]
+        cx0 = p[6]
+        cy0 = p[7]
+        cx1 = p[8]
+        cy1 = p[9]
+        right = x + w - 1
+        n = 0
+        row = 0
+        if y < cy0:
+            row = cy0 - y
+        end = h
+        if y + h > cy1:
+            end = cy1 - y
+        while row < end:
+            # Distancia al borde más cercano: las filas de esquina usan la tabla
+            k = row
+            if h - 1 - row < k:
+                k = h - 1 - row
+            if k < r:
+                a = t[2 * k]
+                b = t[2 * k + 1]
+            else:
+                a = 0
+                b = 0
+            yy = y + row
+            if fill or k == 0:
+                xs = x + a
+                xe = right - a
+                if xs < cx0:
+                    xs = cx0
+                if xe >= cx1:
+                    xe = cx1 - 1
+                if xs <= xe:
+                    s[3 * n] = yy
+                    s[3 * n + 1] = xs
+                    s[3 * n + 2] = xe
+                    n += 1
+            else:
+                # Borde izquierdo [x + a, x + b] y su simétrico a la derecha
+                xs = x + a
+                xe = x + b
+                if xs < cx0:
+                    xs = cx0
+                if xe >= cx1:
+                    xe = cx1 - 1
+                if xs <= xe:
+                    s[3 * n] = yy
+                    s[3 * n + 1] = xs
+                    s[3 * n + 2] = xe
+                    n += 1
+                xs = right - b
+                xe = right - a
+                if xs < cx0:
+                    xs = cx0
+                if xe >= cx1:
+                    xe = cx1 - 1
+                if xs <= xe:
+                    s[3 * n] = yy
+                    s[3 * n + 1] = xs
+                    s[3 * n + 2] = xe
+                    n += 1
+            row += 1
+        return n
     
     def progress_bar(self, x, y, w, h, progress, bg_color, fg_color):
         """Dibuja una barra de progreso (0.0 - 1.0)"""
@@ -178,16 +710,22 @@ class Renderer:
         x0, y0 = int(x0), int(y0)
         x1, y1 = int(x1), int(y1)
         x2, y2 = int(x2), int(y2)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        min_x = min(x0, x1, x2)
+        min_y = min(y0, y1, y2)
+        self._mark(min_x, min_y, max(x0, x1, x2) - min_x + 1, max(y0, y1, y2) - min_y + 1)
         if fill:
             self._fill_triangle(x0, y0, x1, y1, x2, y2, color)
         else:
-            self.fb.line(x0, y0, x1, y1, color)
-            self.fb.line(x1, y1, x2, y2, color)
-            self.fb.line(x2, y2, x0, y0, color)
+            ox = self._ox
+            oy = self._oy
+            self.fb.line(x0 - ox, y0 - oy, x1 - ox, y1 - oy, color)
+            self.fb.line(x1 - ox, y1 - oy, x2 - ox, y2 - oy, color)
+            self.fb.line(x2 - ox, y2 - oy, x0 - ox, y0 - oy, color)
     
     def _fill_triangle(self, x0, y0, x1, y1, x2, y2, color):
-        """Rellena un triángulo usando scanline"""
+        """Rellena un triángulo usando el rasterizador viper"""
         # Ordenar vértices por Y
         if y0 > y1:
             x0, y0, x1, y1 = x1, y1, x0, y0
@@ -198,54 +736,1371 @@ class Renderer:
         
         # Caso trivial
         if y2 == y0:
-            self.fb.hline(min(x0, x1, x2), y0, max(x0, x1, x2) - min(x0, x1, x2) + 1, color)
+            self.fb.hline(min(x0, x1, x2) - self._ox, y0 - self._oy, max(x0, x1, x2) - min(x0, x1, x2) + 1, color)
             return
         
-        # Dibujar triángulo
-        for y in range(y0, y2 + 1):
+        p = self._tri_params
+        p[0] = y0
+        p[1] = y1
+        p[2] = y2
+        p[3] = x0
+        p[4] = x1
+        # Cada arista avanza por cociente y resto de la división entera (floor),
+        # así el bucle por fila solo suma y es idéntico a x0 + dx * t // dy
+        self._edge_step(p, 5, x2 - x0, y2 - y0)
+        self._edge_step(p, 8, x1 - x0, y1 - y0)
+        self._edge_step(p, 11, x2 - x1, y2 - y1)
+        p[14], p[15], p[16], p[17] = self._clip
+        spans = self._span_buffer(min(y2 - y0 + 1, self.buffer_rows))
+        self._draw_spans(self._triangle_spans(spans, p), color)
+    
+    def _edge_step(self, p, i, dx, dy):
+        """Guarda cociente, resto y divisor del paso de una arista"""
+        if dy == 0:
+            p[i] = 0
+            p[i + 1] = 0
+            p[i + 2] = 1
+        else:
+            p[i] = dx // dy
+            p[i + 1] = dx % dy
+            p[i + 2] = dy
+    
+    @micropython.viper
+    def _triangle_spans(self, spans, params) -> int:
+        """Tramos entre la arista larga (v0-v2) y las cortas (v0-v1, v1-v2); devuelve cuántos"""
+        s = ptr16(spans)
+        p = ptr32(params)
+        y0 = p[0]
+        y1 = p[1]
+        y2 = p[2]
+        qa = p[5]
+        ra = p[6]
+        da = p[7]
+        qb = p[8]
+        rb = p[9]
+        db = p[10]
+        qc = p[11]
+        rc = p[12]
+        dc = p[13]
+        cx0 = p[14]
+        cy0 = p[15]
+        cx1 = p[16]
+        cy1 = p[17]
+        
+        xa = p[3]
+        ea = 0
+        xb = p[3]
+        eb = 0
+        xc = p[4]
+        ec = 0
+        n = 0
+        y = y0
+        while y <= y2:
+            if y >= cy1:
+                break
             if y < y1:
-                if y1 - y0 != 0:
-                    xa = x0 + (x1 - x0) * (y - y0) // (y1 - y0)
-                else:
-                    xa = x0
+                xs = xb
             else:
-                if y2 - y1 != 0:
-                    xa = x1 + (x2 - x1) * (y - y1) // (y2 - y1)
-                else:
-                    xa = x1
-            if y2 - y0 != 0:
-                xb = x0 + (x2 - x0) * (y - y0) // (y2 - y0)
+                xs = xc
+            xe = xa
+            if xs > xe:
+                t = xs
+                xs = xe
+                xe = t
+            if y >= cy0:
+                if xs < cx0:
+                    xs = cx0
+                if xe >= cx1:
+                    xe = cx1 - 1
+                if xs <= xe:
+                    s[3 * n] = y
+                    s[3 * n + 1] = xs
+                    s[3 * n + 2] = xe
+                    n += 1
+            
+            # Avanza las aristas a la siguiente fila
+            xa += qa
+            ea += ra
+            if ea >= da:
+                ea -= da
+                xa += 1
+            if y < y1:
+                xb += qb
+                eb += rb
+                if eb >= db:
+                    eb -= db
+                    xb += 1
+            else:
+                xc += qc
+                ec += rc
+                if ec >= dc:
+                    ec -= dc
+                    xc += 1
+            y += 1
+        return n
+    
+    def _span_buffer(self, spans):
+        """Buffer de tramos (y, x0, x1) con sitio para al menos `spans` tramos"""
+        buf = self._spans
+        if len(buf) < 3 * spans:
+            buf = array("h", [0] * (3 * spans))
+            self._spans = buf
+        return buf
+    
+    def _draw_spans(self, n, color):
+        """Rellena los n primeros tramos de _spans con un color"""
+        p = self._span_params
+        p[0] = n
+        p[1] = color
+        p[2] = self.width
+        self._fill_spans(self.buffer, self._spans, p)
+    
+    @micropython.viper
+    def _fill_spans(self, buf, spans, params):
+        """Rellena tramos (y, x0, x1 inclusivos, ya recortados)"""
+        dst = ptr16(buf)
+        dst8 = ptr8(buf)
+        wide = int(self.PIXEL_BYTES) == 2
+        s = ptr16(spans)
+        p = ptr32(params)
+        n = p[0]
+        color = p[1]
+        stride = p[2]
+        k = 0
+        while k < n:
+            base = s[3 * k] * stride
+            i = base + s[3 * k + 1]
+            end = base + s[3 * k + 2]
+            if wide:
+                while i <= end:
+                    dst[i] = color
+                    i += 1
             else:
-                xb = x0
-            if xa > xb:
-                xa, xb = xb, xa
-            self.fb.hline(xa, y, xb - xa + 1, color)
+                while i <= end:
+                    dst8[i] = color
+                    i += 1
+            k += 1
     
     def hline(self, x, y, w, color):
         """Línea horizontal optimizada"""
         x = int(x)
         y = int(y)
         w = int(w)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        self.fb.hline(x, y, w, color)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        self.fb.hline(x - self._ox, y - self._oy, w, color)
+        self._mark(x, y, w, 1)
     
     def vline(self, x, y, h, color):
         """Línea vertical optimizada"""
         x = int(x)
         y = int(y)
         h = int(h)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        self.fb.vline(x, y, h, color)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        self.fb.vline(x - self._ox, y - self._oy, h, color)
+        self._mark(x, y, 1, h)
+    
+    def blend_rect(self, x, y, w, h, color, alpha):
+        """Mezcla un color sobre el rectángulo con opacidad alpha (0-255)"""
+        x, y = int(x), int(y)
+        w, h = int(w), int(h)
+        if color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        cx0, cy0, cx1, cy1 = self._clip
+        x0 = max(x, cx0)
+        y0 = max(y, cy0)
+        x1 = min(x + w, cx1)
+        y1 = min(y + h, cy1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        p = self._batch
+        p[0] = color & 0xFFFF
+        p[1] = self.width
+        p[2] = x0
+        p[3] = y0
+        p[4] = x1
+        p[5] = y1
+        p[6] = max(0, min(int(alpha), 255))
+        self._blend_rect(self.buffer, p)
+        self._mark(x, y, w, h)
+    
+    @micropython.viper
+    def _blend_rect(self, buf, params):
+        """Mezcla por componentes RGB565 sobre píxeles en orden de bytes del panel"""
+        dst = ptr16(buf)
+        p = ptr32(params)
+        color = p[0]
+        stride = p[1]
+        x0 = p[2]
+        y0 = p[3]
+        x1 = p[4]
+        y1 = p[5]
+        a = p[6]
+        inv = 256 - a
+        # Componentes del color ya multiplicadas por alpha
+        cr = ((color >> 11) & 0x1F) * a
+        cg = ((color >> 5) & 0x3F) * a
+        cb = (color & 0x1F) * a
+        y = y0
+        while y < y1:
+            i = y * stride + x0
+            end = y * stride + x1
+            while i < end:
+                v = int(dst[i])
+                v = ((v & 0xFF) << 8) | ((v >> 8) & 0xFF)
+                r = (((v >> 11) & 0x1F) * inv + cr) >> 8
+                g = (((v >> 5) & 0x3F) * inv + cg) >> 8
+                b = ((v & 0x1F) * inv + cb) >> 8
+                v = (r << 11) | (g << 5) | b
+                dst[i] = ((v & 0xFF) << 8) | ((v >> 8) & 0xFF)
+                i += 1
+            y += 1
     
     def ellipse(self, cx, cy, rx, ry, color, fill=False):
         """Dibuja una elipse"""
         cx, cy = int(cx), int(cy)
         rx, ry = int(rx), int(ry)
-        color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
-        self.fb.ellipse(cx, cy, rx, ry, color, fill)
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        self.fb.ellipse(cx - self._ox, cy - self._oy, rx, ry, color, fill)
+        self._mark(cx - rx, cy - ry, 2 * rx + 1, 2 * ry + 1)
+    
+    def rects(self, coords, color, fill=True):
+        """Dibuja varios rectángulos desde un array('h') [x, y, w, h, x, y, w, h, ...]"""
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        n = self._batch_len(coords)
+        self._mark_batch(coords, n, 0)
+        self._draw_rects(self.buffer, coords, n, self._batch_params(color, fill))
+    
+    def pixels(self, coords, colors, size=1):
+        """Dibuja varios píxeles desde un array('h') [x, y, ...]; colors es un color o un array('H') RGB565.
+        
+        Con size > 1 cada píxel es un cuadrado de size x size (partículas)
+        """
+        n = self._batch_len(coords)
+        self._mark_batch(coords, n, 1, size - 1)
+        if isinstance(colors, int):
+            if not colors & NATIVE:
+                colors = ((colors & 0xFF) << 8) | ((colors >> 8) & 0xFF)
+            p = self._batch_params(colors, False)
+            p[8] = size
+            self._draw_pixels(self.buffer, coords, n, coords, p)
+        else:
+            p = self._batch_params(0, True)
+            p[8] = size
+            self._draw_pixels(self.buffer, coords, n, colors, p)
+    
+    def circles(self, coords, color, fill=True):
+        """Dibuja varios círculos desde un array('h') [cx, cy, r, cx, cy, r, ...]"""
+        if not color & NATIVE:
+            color = ((color & 0xFF) << 8) | ((color >> 8) & 0xFF)
+        n = self._batch_len(coords)
+        self._mark_batch(coords, n, 2)
+        self._draw_circles(self.buffer, coords, n, self._batch_params(color, fill))
+    
+    def _batch_len(self, coords):
+        """Número de enteros de 16 bits del lote (array('h'), una vista suya o su copia en bytes)"""
+        if isinstance(coords, (bytes, bytearray)):
+            return len(coords) // 2
+        return len(coords)
+    
+    def _batch_params(self, color, flag):
+        """Rellena los parámetros comunes de las rutinas viper por lotes"""
+        p = self._batch
+        p[0] = color
+        p[1] = self.width
+        p[2], p[3], p[4], p[5] = self._clip
+        p[6] = self._origin_y
+        p[7] = 1 if flag else 0
+        p[8] = 1
+        return p
+    
+    def _batch_extent(self, coords, kind, grow=0):
+        """Caja envolvente (x0, y0, x1, y1) de un lote; kind 0=rects, 1=pixels, 2=circles"""
+        b = self._bounds
+        self._batch_bounds(coords, self._batch_len(coords), kind, b)
+        if b[2] > b[0]:
+            return b[0], b[1], b[2] + grow, b[3] + grow
+        return b[0], b[1], b[2], b[3]
+    
+    def _mark_batch(self, coords, n, kind, grow=0):
+        b = self._bounds
+        self._batch_bounds(coords, n, kind, b)
+        if b[2] > b[0]:
+            self._mark(b[0], b[1], b[2] - b[0] + grow, b[3] - b[1] + grow)
+    
+    @micropython.viper
+    def _batch_bounds(self, coords, n: int, kind: int, out):
+        """Calcula la caja envolvente de un lote de coordenadas con signo"""
+        a = ptr16(coords)
+        o = ptr32(out)
+        step = 4
+        if kind == 1:
+            step = 2
+        elif kind == 2:
+            step = 3
+        x0 = 32767
+        y0 = 32767
+        x1 = -32768
+        y1 = -32768
+        i = 0
+        while i + step <= n:
+            x = int(a[i])
+            if x > 32767:
+                x -= 65536
+            y = int(a[i + 1])
+            if y > 32767:
+                y -= 65536
+            if kind == 0:
+                w = int(a[i + 2])
+                if w > 32767:
+                    w -= 65536
+                h = int(a[i + 3])
+                if h > 32767:
+                    h -= 65536
+                bx0 = x
+                by0 = y
+                bx1 = x + w
+                by1 = y + h
+            elif kind == 1:
+                bx0 = x
+                by0 = y
+                bx1 = x + 1
+                by1 = y + 1
+            else:
+                r = int(a[i + 2])
+                bx0 = x - r
+                by0 = y - r
+                bx1 = x + r + 1
+                by1 = y + r + 1
+            if bx0 < x0:
+                x0 = bx0
+            if by0 < y0:
+                y0 = by0
+            if bx1 > x1:
+                x1 = bx1
+            if by1 > y1:
+                y1 = by1
+            i += step
+        if x1 < x0:
+            x0 = 0
+            y0 = 0
+            x1 = 0
+            y1 = 0
+        o[0] = x0
+        o[1] = y0
+        o[2] = x1
+        o[3] = y1
+    
+    @micropython.viper
+    def _draw_rects(self, buf, coords, n: int, params):
+        """Rasteriza un lote de rectángulos (rellenos o contorno) con recorte"""
+        dst = ptr16(buf)
+        dst8 = ptr8(buf)
+        wide = int(self.PIXEL_BYTES) == 2
+        a = ptr16(coords)
+        p = ptr32(params)
+        color = p[0]
+        stride = p[1]
+        cx0 = p[2]
+        cy0 = p[3]
+        cx1 = p[4]
+        cy1 = p[5]
+        oy = p[6]
+        fill = p[7]
+        i = 0
+        while i + 4 <= n:
+            x = int(a[i])
+            if x > 32767:
+                x -= 65536
+            y = int(a[i + 1])
+            if y > 32767:
+                y -= 65536
+            y -= oy
+            w = int(a[i + 2])
+            if w > 32767:
+                w -= 65536
+            h = int(a[i + 3])
+            if h > 32767:
+                h -= 65536
+            i += 4
+            if w <= 0 or h <= 0:
+                continue
+            xr = x + w - 1
+            yb = y + h - 1
+            x0 = x
+            if x0 < cx0:
+                x0 = cx0
+            x1 = x + w
+            if x1 > cx1:
+                x1 = cx1
+            y0 = y
+            if y0 < cy0:
+                y0 = cy0
+            y1 = y + h
+            if y1 > cy1:
+                y1 = cy1
+            yy = y0
+            while yy < y1:
+                row = yy * stride
+                if fill or yy == y or yy == yb:
+                    xx = row + x0
+                    end = row + x1
+                    if wide:
+                        while xx < end:
+                            dst[xx] = color
+                            xx += 1
+                    else:
+                        while xx < end:
+                            dst8[xx] = color
+                            xx += 1
+                else:
+                    if x >= cx0 and x < cx1:
+                        if wide:
+                            dst[row + x] = color
+                        else:
+                            dst8[row + x] = color
+                    if xr >= cx0 and xr < cx1:
+                        if wide:
+                            dst[row + xr] = color
+                        else:
+                            dst8[row + xr] = color
+                yy += 1
+    
+    @micropython.viper
+    def _draw_pixels(self, buf, coords, n: int, colors, params):
+        """Escribe un lote de píxeles; con colores por píxel (RGB565) los convierte al vuelo.
+        
+        En un buffer de 8 bits cada color se traduce con self._index (IndexedRenderer),
+        solo cuando cambia respecto al del píxel anterior.
+        """
+        dst = ptr16(buf)
+        dst8 = ptr8(buf)
+        wide = int(self.PIXEL_BYTES) == 2
+        last = -1
+        a = ptr16(coords)
+        c = ptr16(colors)
+        p = ptr32(params)
+        color = p[0]
+        stride = p[1]
+        cx0 = p[2]
+        cy0 = p[3]
+        cx1 = p[4]
+        cy1 = p[5]
+        oy = p[6]
+        per_pixel = p[7]
+        size = p[8]
+        i = 0
+        k = 0
+        while i + 2 <= n:
+            x = int(a[i])
+            if x > 32767:
+                x -= 65536
+            y = int(a[i + 1])
+            if y > 32767:
+                y -= 65536
+            y -= oy
+            if per_pixel:
+                v = int(c[k])
+                if wide:
+                    color = ((v & 0xFF) << 8) | ((v >> 8) & 0xFF)
+                elif v != last:
+                    last = v
+                    color = int(self._index(v))
+            if size == 1:
+                if x >= cx0 and x < cx1 and y >= cy0 and y < cy1:
+                    if wide:
+                        dst[y * stride + x] = color
+                    else:
+                        dst8[y * stride + x] = color
+            else:
+                # Cuadrado size x size recortado
+                xs = x
+                if xs < cx0:
+                    xs = cx0
+                xe = x + size
+                if xe > cx1:
+                    xe = cx1
+                yy = y
+                if yy < cy0:
+                    yy = cy0
+                ye = y + size
+                if ye > cy1:
+                    ye = cy1
+                while yy < ye:
+                    xx = yy * stride + xs
+                    end = yy * stride + xe
+                    if wide:
+                        while xx < end:
+                            dst[xx] = color
+                            xx += 1
+                    else:
+                        while xx < end:
+                            dst8[xx] = color
+                            xx += 1
+                    yy += 1
+            i += 2
+            k += 1
+    
+    @micropython.viper
+    def _draw_circles(self, buf, coords, n: int, params):
+        """Rasteriza un lote de círculos con el algoritmo del punto medio"""
+        dst = ptr16(buf)
+        dst8 = ptr8(buf)
+        wide = int(self.PIXEL_BYTES) == 2
+        a = ptr16(coords)
+        p = ptr32(params)
+        color = p[0]
+        stride = p[1]
+        cx0 = p[2]
+        cy0 = p[3]
+        cx1 = p[4]
+        cy1 = p[5]
+        oy = p[6]
+        fill = p[7]
+        i = 0
+        while i + 3 <= n:
+            cx = int(a[i])
+            if cx > 32767:
+                cx -= 65536
+            cy = int(a[i + 1])
+            if cy > 32767:
+                cy -= 65536
+            cy -= oy
+            r = int(a[i + 2])
+            i += 3
+            x = r
+            y = 0
+            err = 1 - r
+            while x >= y:
+                # Cuatro filas simétricas por paso: (cy +- y, ancho x) y (cy +- x, ancho y)
+                k = 0
+                while k < 4:
+                    if k == 0:
+                        yy = cy + y
+                        hw = x
+                    elif k == 1:
+                        yy = cy - y
+                        hw = x
+                    elif k == 2:
+                        yy = cy + x
+                        hw = y
+                    else:
+                        yy = cy - x
+                        hw = y
+                    k += 1
+                    if yy < cy0 or yy >= cy1:
+                        continue
+                    row = yy * stride
+                    xs = cx - hw
+                    xe = cx + hw
+                    if fill:
+                        if xs < cx0:
+                            xs = cx0
+                        if xe >= cx1:
+                            xe = cx1 - 1
+                        xs += row
+                        xe += row
+                        if wide:
+                            while xs <= xe:
+                                dst[xs] = color
+                                xs += 1
+                        else:
+                            while xs <= xe:
+                                dst8[xs] = color
+                                xs += 1
+                    else:
+                        if xs >= cx0 and xs < cx1:
+                            if wide:
+                                dst[row + xs] = color
+                            else:
+                                dst8[row + xs] = color
+                        if xe >= cx0 and xe < cx1:
+                            if wide:
+                                dst[row + xe] = color
+                            else:
+                                dst8[row + xe] = color
+                y += 1
+                if err < 0:
+                    err += 2 * y + 1
+                else:
+                    x -= 1
+                    err += 2 * (y - x) + 1
+    
+    def load_sprites(self, name, source, frame_w, frame_h, sheet_w=None, key=None, palette=None):
+        """Carga una hoja de sprites (fichero o buffer) dividida en frames de frame_w x frame_h"""
+        data = self._sheet_pixels(source, palette)
+        key = -1 if key is None else self._sprite_key(key)
+        frames = split_sheet(data, sheet_w or frame_w, frame_w, frame_h, key, self.FORMAT)
+        self.sprites[name] = frames
+        logger.debug(f"Sprite sheet '{name}' loaded: {len(frames)} frames of {frame_w}x{frame_h}")
+        return len(frames)
+    
+    def _sheet_pixels(self, source, palette):
+        """Píxeles de una hoja en el formato del framebuffer"""
+        return read_sheet(source, palette)
+    
+    def _sprite_key(self, key):
+        """Valor del color transparente tal como queda en el buffer del sprite"""
+        return native_color(key) & 0xFFFF
+    
+    def bake_sprite(self, name, w, h, draw, key=0xF81F):
+        """Renderiza una sola vez draw(r) en un sprite de w x h (fondo transparente = key)"""
+        frames = self.sprites.get(name)
+        if frames:
+            return frames[0]
+        key = self._sprite_key(key)
+        buf = bytearray(w * h * self.PIXEL_BYTES)
+        sprite = Sprite(buf, w, h, key=key, fmt=self.FORMAT)
+        sprite.fb.fill(key)
+        self._begin_target(buf, sprite.fb, w, h)
+        try:
+            draw(self)
+        finally:
+            self._end_target()
+        self.sprites[name] = [sprite]
+        logger.debug(f"Sprite '{name}' baked: {w}x{h}")
+        return sprite
+    
+    def blit_sprite(self, name, x, y, flip=0, key=None, frame=0):
+        """Dibuja un frame de sprite; flip combina FLIP_X/FLIP_Y, key sustituye al transparente"""
+        sprite = self.sprites[name][frame]
+        x, y = int(x), int(y)
+        key = sprite.key if key is None else self._sprite_key(key)
+        self._mark(x, y, sprite.width, sprite.height)
+        if not flip:
+            self.fb.blit(sprite.fb, x - self._ox, y - self._oy, key)
+            return
+        p = self._blit_params
+        p[0] = x
+        p[1] = y
+        p[2] = sprite.width
+        p[3] = sprite.height
+        p[4] = sprite.stride
+        p[5] = flip
+        p[6] = key
+        p[7] = self.width
+        p[8], p[9], p[10], p[11] = self._clip
+        self._blit_flipped(self.buffer, sprite.buffer, p)
+    
+    @micropython.viper
+    def _blit_flipped(self, buf, src, params):
+        """Copia un sprite volteado con color transparente y recorte al buffer"""
+        dst = ptr16(buf)
+        s = ptr16(src)
+        dst8 = ptr8(buf)
+        s8 = ptr8(src)
+        wide = int(self.PIXEL_BYTES) == 2
+        p = ptr32(params)
+        x = p[0]
+        y = p[1]
+        w = p[2]
+        h = p[3]
+        src_stride = p[4]
+        flip = p[5]
+        key = p[6]
+        stride = p[7]
+        x0 = x
+        y0 = y
+        x1 = x + w
+        y1 = y + h
+        if x0 < p[8]:
+            x0 = p[8]
+        if y0 < p[9]:
+            y0 = p[9]
+        if x1 > p[10]:
+            x1 = p[10]
+        if y1 > p[11]:
+            y1 = p[11]
+        
+        # Paso en el origen por cada píxel de destino (-1 con FLIP_X)
+        step = 1
+        if flip & 1:
+            step = -1
+        dy = y0
+        while dy < y1:
+            sy = dy - y
+            if flip & 2:
+                sy = h - 1 - sy
+            sx = x0 - x
+            if flip & 1:
+                sx = w - 1 - sx
+            j = sy * src_stride + sx
+            i = dy * stride + x0
+            end = dy * stride + x1
+            if wide:
+                while i < end:
+                    pixel = s[j]
+                    if pixel != key:
+                        dst[i] = pixel
+                    i += 1
+                    j += step
+            else:
+                while i < end:
+                    pixel = s8[j]
+                    if pixel != key:
+                        dst8[i] = pixel
+                    i += 1
+                    j += step
+            dy += 1
+    
+    def tilemap(self, cols, rows, tile_w, tile_h, tiles, viewport=None):
+        """Crea un TileMap de cols x rows celdas dibujado en viewport (x, y, w, h), por defecto la pantalla.
+        
+        tiles es el nombre de una hoja (load_sprites) o una lista de nombres de sprites
+        horneados; el índice de cada celda es la posición del tile en esa lista.
+        """
+        if isinstance(tiles, str):
+            frames = self.sprites[tiles]
+        else:
+            frames = [self.sprites[name][0] for name in tiles]
+        if len(frames) > 256:
+            raise ValueError(f"Tilemap atlas has {len(frames)} tiles, max 256")
+        atlas = build_atlas(frames, tile_w, tile_h, self.PIXEL_BYTES)
+        return TileMap(cols, rows, tile_w, tile_h, atlas, len(frames),
+                       viewport or (0, 0, self.width, self.height))
+    
+    def draw_tilemap(self, tm):
+        """Dibuja los tiles visibles; solo repinta los cambiados o tapados desde el último frame"""
+        self._draw_tilemap(tm, False)
+    
+    def _draw_tilemap(self, tm, full):
+        """full=True repinta todos los tiles visibles (reproducción grabada o destino fuera de pantalla)"""
+        tw = tm.tile_w
+        th = tm.tile_h
+        cam_x = tm.cam_x
+        cam_y = tm.cam_y
+        c0 = cam_x // tw
+        r0 = cam_y // th
+        c1 = min((cam_x + tm.w + tw - 1) // tw, tm.cols)
+        r1 = min((cam_y + tm.h + th - 1) // th, tm.rows)
+        # Dibujado directo en pantalla: sus marcas no cuentan como tiles tapados
+        direct = not full and not self._targets
+        if self._clips:
+            # Recortado quedan tiles a medias: el siguiente draw repinta todo
+            direct = False
+            tm.drawn_cam_x = None
+        if self._targets or self._clips:
+            full = True
+        elif not full:
+            if (self._dirty_all or self._prev_dirty_all
+                    or tm.drawn_cam_x != cam_x or tm.drawn_cam_y != cam_y):
+                full = True
+            else:
+                # Lo dibujado encima en el frame anterior, o debajo en este, tapa tiles
+                for rects in (self._prev_dirty, self._dirty):
+                    for rect in rects:
+                        self._dirty_tiles(tm, rect, c0, r0, c1, r1)
+            tm.drawn_cam_x = cam_x
+            tm.drawn_cam_y = cam_y
+        
+        p = self._tile_params
+        p[0] = tm.x
+        p[1] = tm.y - self._origin_y
+        p[2] = tm.w
+        p[3] = tm.h
+        p[4] = cam_x
+        p[5] = cam_y
+        p[6] = tm.cols
+        p[7] = c0
+        p[8] = r0
+        p[9] = c1
+        p[10] = r1
+        p[11] = tw
+        p[12] = th
+        p[13] = self.width
+        p[14] = self.buffer_rows
+        p[15] = 0 if full else 1
+        p[20], p[21], p[22], p[23] = self._clip
+        self._blit_tiles(self.buffer, tm, p)
+        if full:
+            rect = (tm.x, tm.y, tm.w, tm.h)
+        elif p[16] < p[18]:
+            rect = (p[16], p[17] + self._origin_y, p[18] - p[16], p[19] - p[17])
+        else:
+            return
+        if direct:
+            self._solid = None
+            self._tile_marks.append(rect)
+        else:
+            self._mark(*rect)
+    
+    def _dirty_tiles(self, tm, rect, c0, r0, c1, r1):
+        """Marca como modificados los tiles visibles bajo un rectángulo de pantalla"""
+        x0, y0, x1, y1 = rect
+        dx = tm.cam_x - tm.x
+        dy = tm.cam_y - tm.y
+        ca = max((x0 + dx) // tm.tile_w, c0)
+        cb = min((x1 - 1 + dx) // tm.tile_w + 1, c1)
+        ra = max((y0 + dy) // tm.tile_h, r0)
+        rb = min((y1 - 1 + dy) // tm.tile_h + 1, r1)
+        if ca >= cb or ra >= rb:
+            return
+        ones = b"\x01" * (cb - ca)
+        dirty = tm.dirty
+        cols = tm.cols
+        for row in range(ra, rb):
+            i = row * cols
+            dirty[i + ca:i + cb] = ones
+    
+    @micropython.viper
+    def _blit_tiles(self, buf, tm, params):
+        """Copia los tiles visibles (o solo los marcados) recortando al viewport y al buffer"""
+        dst = ptr16(buf)
+        atlas = ptr16(tm.atlas)
+        dst8 = ptr8(buf)
+        atlas8 = ptr8(tm.atlas)
+        wide = int(self.PIXEL_BYTES) == 2
+        cells = ptr8(tm.map)
+        dirty = ptr8(tm.dirty)
+        p = ptr32(params)
+        vx = p[0]
+        vy = p[1]
+        cx0 = vx
+        cy0 = vy
+        cx1 = vx + p[2]
+        cy1 = vy + p[3]
+        if cx0 < p[20]:
+            cx0 = p[20]
+        if cy0 < p[21]:
+            cy0 = p[21]
+        if cx1 > p[22]:
+            cx1 = p[22]
+        if cy1 > p[23]:
+            cy1 = p[23]
+        cam_x = p[4]
+        cam_y = p[5]
+        cols = p[6]
+        tw = p[11]
+        th = p[12]
+        stride = p[13]
+        only_dirty = p[15]
+        tile_size = tw * th
+        bx0 = stride
+        by0 = p[14]
+        bx1 = 0
+        by1 = 0
+        
+        tr = p[8]
+        while tr < p[10]:
+            ty = vy + tr * th - cam_y
+            y0 = ty
+            y1 = ty + th
+            if y0 < cy0:
+                y0 = cy0
+            if y1 > cy1:
+                y1 = cy1
+            tc = p[7]
+            idx = tr * cols + tc
+            while tc < p[9]:
+                if only_dirty and dirty[idx] == 0:
+                    tc += 1
+                    idx += 1
+                    continue
+                dirty[idx] = 0
+                tx = vx + tc * tw - cam_x
+                x0 = tx
+                x1 = tx + tw
+                if x0 < cx0:
+                    x0 = cx0
+                if x1 > cx1:
+                    x1 = cx1
+                if x0 < x1 and y0 < y1:
+                    base = cells[idx] * tile_size + x0 - tx
+                    y = y0
+                    while y < y1:
+                        src = base + (y - ty) * tw
+                        i = y * stride + x0
+                        end = i + x1 - x0
+                        if wide:
+                            while i < end:
+                                dst[i] = atlas[src]
+                                i += 1
+                                src += 1
+                        else:
+                            while i < end:
+                                dst8[i] = atlas8[src]
+                                i += 1
+                                src += 1
+                        y += 1
+                    if x0 < bx0:
+                        bx0 = x0
+                    if y0 < by0:
+                        by0 = y0
+                    if x1 > bx1:
+                        bx1 = x1
+                    if y1 > by1:
+                        by1 = y1
+                tc += 1
+                idx += 1
+            tr += 1
+        # Caja de lo dibujado en coordenadas del buffer (vacía si bx0 >= bx1)
+        p[16] = bx0
+        p[17] = by0
+        p[18] = bx1
+        p[19] = by1
+    
+    def save_layer(self, name, rect=None):
+        """Guarda una copia de lo ya dibujado en rect (x, y, w, h); por defecto toda la pantalla.
+        
+        Pensado para fondos estáticos: se dibujan una vez, se guardan y cada
+        frame se restauran con restore_layer en lugar de repintarlos.
+        """
+        x, y, w, h = self._layer_rect(rect)
+        # En modo bandas solo se guarda la parte que cae en la franja actual
+        y0 = max(y - self._origin_y, 0)
+        y1 = min(y + h - self._origin_y, self.buffer_rows)
+        if w <= 0 or y1 <= y0:
+            return
+        key = (name, self._origin_y)
+        bpp = self.PIXEL_BYTES
+        size = w * bpp * (y1 - y0)
+        layer = self.layers.get(key)
+        if layer is not None and len(layer[4]) == size:
+            data = layer[4]
+        else:
+            data = bytearray(size)
+        stride = self.width * bpp
+        self._copy_rows(memoryview(data), 0, w * bpp, memoryview(self.buffer), y0 * stride + x * bpp, stride,
+                        w * bpp, y1 - y0)
+        self.layers[key] = (x, y0, w, y1 - y0, data)
+    
+    def restore_layer(self, name, rect=None):
+        """Copia de vuelta una capa guardada (o solo la parte dentro de rect)"""
+        layer = self.layers.get((name, self._origin_y))
+        if layer is None:
+            return
+        lx, ly, lw, rows, data = layer
+        x0 = lx
+        y0 = ly
+        x1 = lx + lw
+        y1 = ly + rows
+        if rect is not None:
+            rx, ry, rw, rh = self._layer_rect(rect)
+            ry -= self._origin_y
+            x0 = max(x0, rx)
+            y0 = max(y0, ry)
+            x1 = min(x1, rx + rw)
+            y1 = min(y1, ry + rh)
+        if self._clips:
+            cx0, cy0, cx1, cy1 = self._clip
+            x0 = max(x0, cx0)
+            y0 = max(y0, cy0)
+            x1 = min(x1, cx1)
+            y1 = min(y1, cy1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        bpp = self.PIXEL_BYTES
+        stride = self.width * bpp
+        self._copy_rows(memoryview(self.buffer), y0 * stride + x0 * bpp, stride,
+                        memoryview(data), ((y0 - ly) * lw + x0 - lx) * bpp, lw * bpp,
+                        (x1 - x0) * bpp, y1 - y0)
+        self._mark(x0, y0, x1 - x0, y1 - y0)
+    
+    def drop_layer(self, name):
+        """Libera la memoria de una capa"""
+        for key in [k for k in self.layers if k[0] == name]:
+            del self.layers[key]
+    
+    def _layer_rect(self, rect):
+        """Recorta rect (x, y, w, h) a la pantalla; None es la pantalla completa"""
+        if rect is None:
+            return 0, 0, self.width, self.height
+        x, y, w, h = rect
+        x0 = max(int(x), 0)
+        y0 = max(int(y), 0)
+        x1 = min(int(x) + int(w), self.width)
+        y1 = min(int(y) + int(h), self.height)
+        return x0, y0, x1 - x0, y1 - y0
+    
+    def _copy_rows(self, dst, dst_off, dst_stride, src, src_off, src_stride, row_bytes, rows):
+        """Copia un bloque de filas con asignación de slices (memcpy)"""
+        if row_bytes == dst_stride and row_bytes == src_stride:
+            size = row_bytes * rows
+            dst[dst_off:dst_off + size] = src[src_off:src_off + size]
+            return
+        for _ in range(rows):
+            dst[dst_off:dst_off + row_bytes] = src[src_off:src_off + row_bytes]
+            dst_off += dst_stride
+            src_off += src_stride
+    
+    def set_scroll_region(self, top, height):
+        """Define las filas [top, top + height) como zona de scroll por hardware.
+        
+        El framebuffer sigue guardando la imagen tal como se ve; flush() traduce
+        las filas de la zona a la memoria del panel. Devuelve False si este
+        renderer no puede usar el scroll por hardware.
+        """
+        if self.buffer_rows != self.height or not hasattr(self.display, "scroll_to"):
+            return False
+        self._wait_flush()
+        if self._scroll_offset:
+            # El panel deja de estar desplazado: hay que reenviar la imagen
+            self._mark_all()
+        self.display.set_scroll_area(top, height, self.height - top - height)
+        self.display.scroll_to(top)
+        self.scroll_top = top
+        self.scroll_height = height
+        self._scroll_offset = 0
+        self._scroll_pending = False
+        return True
+    
+    def clear_scroll_region(self):
+        """Vuelve al modo sin scroll (toda la pantalla fija)"""
+        if not self.scroll_height:
+            return
+        self._wait_flush()
+        self.display.set_scroll_area(0, self.height, 0)
+        self.display.scroll_to(0)
+        if self._scroll_offset:
+            self._mark_all()
+        self.scroll_top = 0
+        self.scroll_height = 0
+        self._scroll_offset = 0
+        self._scroll_pending = False
+    
+    def scroll(self, dy, draw_content):
+        """Desplaza la zona de scroll dy filas (dy > 0: el contenido sube) y dibuja solo las nuevas.
+        
+        draw_content(r, oy) dibuja el contenido de la zona sumando oy a sus
+        coordenadas y; se llama con el destino recortado a las filas expuestas.
+        Devuelve False si no hay zona de scroll (el llamador redibuja todo).
+        """
+        height = self.scroll_height
+        dy = int(dy)
+        if not height or dy == 0 or abs(dy) >= height or self._targets:
+            return False
+        top = self.scroll_top
+        stride = self.width * self.PIXEL_BYTES
+        mv = memoryview(self.buffer)
+        # Mueve las filas del framebuffer igual que el panel (fila a fila: los slices no solapan)
+        if dy > 0:
+            src = (top + dy) * stride
+            end = (top + height) * stride
+            dst = top * stride
+            while src < end:
+                mv[dst:dst + stride] = mv[src:src + stride]
+                src += stride
+                dst += stride
+            y0 = top + height - dy
+            rows = dy
+        else:
+            src = (top + height + dy - 1) * stride
+            end = top * stride
+            dst = (top + height - 1) * stride
+            while src >= end:
+                mv[dst:dst + stride] = mv[src:src + stride]
+                src -= stride
+                dst -= stride
+            y0 = top
+            rows = -dy
+        self._scroll_offset = (self._scroll_offset + dy) % height
+        self._scroll_pending = True
+        
+        # Solo se rasterizan las filas expuestas
+        strip = mv[y0 * stride:(y0 + rows) * stride]
+        fb = framebuf.FrameBuffer(strip, self.width, rows, self.FORMAT)
+        self._begin_target(strip, fb, self.width, rows)
+        try:
+            draw_content(self, -y0)
+        finally:
+            self._end_target()
+        self._mark(0, y0, self.width, rows)
+        return True
+    
+    def push_clip(self, x, y, w, h):
+        """Limita el dibujo al rectángulo (x, y, w, h) hasta pop_clip(); anidados se intersecan"""
+        x, y = int(x), int(y)
+        cx0, cy0, cx1, cy1 = self._clip
+        x0 = max(x, cx0)
+        y0 = max(y, cy0)
+        x1 = max(min(x + int(w), cx1), x0)
+        y1 = max(min(y + int(h), cy1), y0)
+        self._clips.append((self._clip, self.fb))
+        if x1 > x0 and y1 > y0:
+            offset = (y0 * self.width + x0) * self.PIXEL_BYTES
+            fb = framebuf.FrameBuffer(memoryview(self.buffer)[offset:], x1 - x0, y1 - y0,
+                                      self.FORMAT, self.width)
+        else:
+            # Recorte vacío: framebuf dibuja en un píxel que no se usa
+            fb = self._clip_sink
+        self._set_clip((x0, y0, x1, y1), fb, self._clips)
+    
+    def pop_clip(self):
+        """Vuelve al recorte anterior a push_clip()"""
+        if self._clips:
+            clip, fb = self._clips.pop()
+            self._set_clip(clip, fb, self._clips)
+    
+    def _set_clip(self, clip, fb, clips):
+        self._clip = clip
+        self._clips = clips
+        self.fb = fb
+        self._ox = clip[0]
+        self._oy = clip[1]
+    
+    def _reset_clip(self):
+        """Quita los recortes que queden abiertos al terminar el frame"""
+        while self._clips:
+            self.pop_clip()
+    
+    def _begin_target(self, buf, fb, w, h):
+        """Redirige las primitivas a un buffer fuera de pantalla"""
+        self._targets.append((self.buffer, self.fb, self.width, self.height, self.buffer_rows,
+                              self._dirty, self._dirty_all, self._clip, self._clips))
+        self.buffer = buf
+        self.fb = fb
+        self.width = w
+        self.height = h
+        self.buffer_rows = h
+        self._dirty = []
+        self._dirty_all = False
+        self._set_clip((0, 0, w, h), fb, [])
+    
+    def _end_target(self):
+        """Vuelve al destino de dibujo anterior"""
+        (self.buffer, fb, self.width, self.height, self.buffer_rows,
+         self._dirty, self._dirty_all, clip, clips) = self._targets.pop()
+        self._set_clip(clip, fb, clips)
     
     def flush(self):
-        """Envía el framebuffer al display"""
-        self.display.draw(0, 0, self.width, self.height, self.buffer)
+        """Envía al display solo las regiones modificadas desde el último flush"""
+        self._reset_clip()
+        # El envío anterior (flush asíncrono) debe terminar antes de usar el panel
+        self._wait_flush()
+        if self._frame_sync is not None:
+            self._frame_sync()
+        if self._scroll_pending:
+            self.display.scroll_to(self.scroll_top + self._scroll_offset)
+            self._scroll_pending = False
+        prev = self._dirty
+        prev_all = self._dirty_all
+        if self._tile_marks:
+            self._dirty = [d[:] for d in prev]
+            for x, y, w, h in self._tile_marks:
+                self._mark(x, y, w, h)
+            self._tile_marks = []
+        if self._dirty_all:
+            dirty = ((0, 0, self.width, self.height),)
+        else:
+            dirty = self._dirty
+        if self._solid is not None and self._dirty_all and self._row_hashes is None:
+            # Solo un fill(): el panel se rellena con un color repetido sin leer el framebuffer
+            self.display.fill_rect(0, 0, self.width, self.height, self._solid_color(self._solid))
+            if self._async is not None:
+                self._async.stale = True
+        else:
+            rects = dirty if self._row_hashes is None else self._changed_rows(dirty)
+            if self._async is None or not self._async.submit(dirty, rects):
+                self._front = self.buffer
+                for x0, y0, x1, y1 in rects:
+                    self._push(x0, y0, x1 - x0, y1 - y0)
+        self._prev_dirty = prev
+        self._prev_dirty_all = prev_all
+        self._dirty = []
+        self._dirty_all = False
+        self._solid = None
+        self._sample_heap()
+    
+    def enable_row_hash(self, enabled=True):
+        """Activa o desactiva el flush por hash de filas (solo se envían las filas que cambian).
+        
+        Pensado para juegos que repintan toda la pantalla en cada frame: las filas
+        de las regiones sucias se comparan con el hash de lo último enviado al
+        panel. Devuelve False si el renderer no guarda la pantalla completa.
+        """
+        if not enabled:
+            self._row_hashes = None
+            self._row_changed = None
+            return True
+        if self.buffer_rows != self.height:
+            return False
+        if self._row_hashes is None:
+            self._row_hashes = array("I", [0] * self.height)
+            # Sello del frame en que cambió cada fila (evita limpiar la tabla en cada flush)
+            self._row_changed = bytearray(self.height)
+            # Los hashes aún no corresponden al panel: el próximo flush envía todo
+            self._row_force_all = True
+            self._mark_all()
+            logger.info("Row hash flush enabled")
+        return True
+    
+    def _changed_rows(self, rects):
+        """Regiones a enviar: filas de rects cuyo hash cambió, agrupando filas consecutivas"""
+        stamp = self._row_stamp % 255 + 1
+        self._row_stamp = stamp
+        p = self._hash_params
+        p[2] = self.width * self.PIXEL_BYTES // 4
+        p[3] = stamp
+        if self._row_force_all:
+            p[4] = 0
+            p[5] = self.height
+            self._row_force_all = False
+        else:
+            # Con scroll por hardware las filas de la zona cambian de sitio en el panel:
+            # sus hashes no sirven y se envían siempre
+            p[4] = self.scroll_top
+            p[5] = self.scroll_top + self.scroll_height
+        changed = self._row_changed
+        for x0, y0, x1, y1 in rects:
+            p[0] = y0
+            p[1] = y1
+            self._hash_rows(self.buffer, self._row_hashes, changed, p)
+        runs = []
+        for x0, y0, x1, y1 in rects:
+            y = y0
+            while y < y1:
+                if changed[y] != stamp:
+                    y += 1
+                    continue
+                start = y
+                while y < y1 and changed[y] == stamp:
+                    y += 1
+                runs.append((x0, start, x1, y))
+        return runs
+    
+    @micropython.viper
+    def _hash_rows(self, buf, hashes, changed, params):
+        """Hash FNV por palabras de las filas [y0, y1); marca con el sello las que difieren"""
+        src = ptr32(buf)
+        h = ptr32(hashes)
+        c = ptr8(changed)
+        p = ptr32(params)
+        y = p[0]
+        y1 = p[1]
+        words = p[2]
+        stamp = p[3]
+        force0 = p[4]
+        force1 = p[5]
+        while y < y1:
+            i = y * words
+            end = i + words
+            v = 5381
+            while i < end:
+                v = (v ^ src[i]) * 16777619
+                i += 1
+            if v != h[y] or (y >= force0 and y < force1):
+                h[y] = v
+                c[y] = stamp
+            y += 1
+    
+    def enable_async_flush(self, enabled=True):
+        """Activa o desactiva el flush asíncrono con doble buffer (ver core/async_flush.py).
+        
+        flush() entrega el frame a un hilo que lo envía mientras se dibuja el
+        siguiente. Devuelve False (y sigue síncrono) sin _thread, sin memoria
+        para el segundo buffer o si el renderer no guarda la pantalla completa.
+        """
+        if not enabled:
+            if self._async is not None:
+                self._async.stop()
+                self._async = None
+                self._front = self.buffer
+            return True
+        if self._async is not None:
+            return True
+        if getattr(self.display, "chunk_callback", None) is not None:
+            # La llamada entre trozos acabaría en el hilo de envío
+            logger.warning("Async flush disabled: flush callback is set")
+            return False
+        from core.async_flush import AsyncFlush, _thread
+        if _thread is None or self.buffer_rows != self.height:
+            return False
+        try:
+            flusher = AsyncFlush(self)
+        except MemoryError:
+            logger.warning(f"No memory for a second framebuffer ({len(self.buffer)} bytes)")
+            return False
+        flusher.start()
+        self._async = flusher
+        return True
+    
+    def set_flush_callback(self, callback, chunk_bytes):
+        """Llama a callback() cada chunk_bytes enviados durante flush() (p.ej. para leer el táctil).
+        
+        Devuelve False si el display no envía por trozos o si el flush es
+        asíncrono (la llamada ocurriría en el hilo de envío).
+        """
+        if not hasattr(self.display, "set_chunk_callback"):
+            return False
+        if callback is not None and self._async is not None:
+            return False
+        self.display.set_chunk_callback(chunk_bytes if callback else 0, callback)
+        return True
+    
+    def set_frame_sync(self, sync):
+        """sync() se llama al empezar cada flush, antes de enviar nada (None = sin esperas)"""
+        self._frame_sync = sync
+    
+    def _solid_color(self, value):
+        """Color RGB565 de un valor del buffer (ver _solid)"""
+        return ((value & 0xFF) << 8) | (value >> 8)
+    
+    def _wait_flush(self):
+        """Espera a que el hilo de flush asíncrono termine de enviar (sin él no hace nada)"""
+        if self._async is not None:
+            self._async.wait()
+    
+    def _sample_heap(self):
+        """Actualiza el pico de heap usado (se llama en cada flush)"""
+        used = gc.mem_alloc()
+        if used > self.heap_peak:
+            self.heap_peak = used
+    
+    def enable_stats(self, enabled=True):
+        """Activa o desactiva la instrumentación por frame (ver core/render_stats.py)"""
+        if enabled and self.stats is None:
+            from core.render_stats import RenderStats
+            self.stats = RenderStats(self)
+            self.stats.install()
+        elif not enabled and self.stats is not None:
+            self.stats.uninstall()
+            self.stats = None
+    
+    def render_stats(self):
+        """Contadores del último frame y de la ventana deslizante, o None si está desactivada"""
+        return self.stats.report() if self.stats else None
+    
+    def memory_stats(self):
+        """Memoria del framebuffer y pico de heap observado"""
+        return {
+            "framebuffer": len(self.buffer) * (2 if self._async else 1),
+            "heap_peak": self.heap_peak,
+            "heap_free": gc.mem_free(),
+        }
+    
+    def _push(self, x, y, w, h):
+        """Envía un rectángulo del framebuffer al display"""
+        offset = self._scroll_offset
+        top = self.scroll_top
+        bottom = top + self.scroll_height
+        if not offset or y >= bottom or y + h <= top:
+            self._push_rows(x, y, w, h, y)
+            return
+        # Con el panel desplazado, las filas de la zona de scroll van a otra fila de memoria
+        end = y + h
+        if y < top:
+            self._push_rows(x, y, w, top - y, y)
+            y = top
+        if end > bottom:
+            self._push_rows(x, bottom, w, end - bottom, bottom)
+            end = bottom
+        mem = top + (y - top + offset) % self.scroll_height
+        first = min(end - y, bottom - mem)
+        self._push_rows(x, mem, w, first, y)
+        if first < end - y:
+            self._push_rows(x, top, w, end - y - first, y + first)
+    
+    def _push_rows(self, x, dest_y, w, h, y):
+        """Envía las filas [y, y + h) del framebuffer a la fila dest_y del panel"""
+        stride = self.width * 2
+        mv = memoryview(self._front)
+        if w == self.width:
+            # Filas completas: la región es contigua en memoria
+            self.display.draw(0, dest_y, w, h, mv[y * stride:(y + h) * stride])
+        else:
+            self.display.draw_region(x, dest_y, w, h, mv[y * stride + x * 2:], stride)
 
 
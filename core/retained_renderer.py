@@ -0,0 +1,217 @@
+# retained_renderer.py - Lista de dibujo retenida con comparación entre frames
+
+import lib.logging as logging
+from core.renderer import Renderer
+
+logger = logging.getLogger("retained_renderer")
+
+def _sprite_extent(r, name, x, y, frame):
+    sprite = r.sprites[name][frame]
+    return x, y, x + sprite.width, y + sprite.height
+
+def _layer_extent(r, rect):
+    x, y, w, h = r._layer_rect(rect)
+    return x, y, x + w, y + h
+
+# Caja envolvente (x0, y0, x1, y1 exclusivos) de cada primitiva: (renderer, *args de la primitiva)
+EXTENTS = {
+    "fill": lambda r, color: (0, 0, r.width, r.height),
+    "pixel": lambda r, x, y, color: (x, y, x + 1, y + 1),
+    "line": lambda r, x0, y0, x1, y1, color: (min(x0, x1), min(y0, y1), max(x0, x1) + 1, max(y0, y1) + 1),
+    "rect": lambda r, x, y, w, h, color, fill=False: (x, y, x + w, y + h),
+    "circle": lambda r, cx, cy, rad, color, fill=False: (cx - rad, cy - rad, cx + rad + 1, cy + rad + 1),
+    "text": lambda r, x, y, txt, color, scale=1, font=None: (
+        x, y, x + r.text_width(txt, scale, font), y + r.text_height(scale, font)),
+    "rounded_rect": lambda r, x, y, w, h, rad, color, fill=False: (x, y, x + w, y + h),
+    "triangle": lambda r, x0, y0, x1, y1, x2, y2, color, fill=False: (
+        min(x0, x1, x2), min(y0, y1, y2), max(x0, x1, x2) + 1, max(y0, y1, y2) + 1),
+    "hline": lambda r, x, y, w, color: (x, y, x + w, y + 1),
+    "vline": lambda r, x, y, h, color: (x, y, x + 1, y + h),
+    "ellipse": lambda r, cx, cy, rx, ry, color, fill=False: (cx - rx, cy - ry, cx + rx + 1, cy + ry + 1),
+    "blend_rect": lambda r, x, y, w, h, color, alpha: (x, y, x + w, y + h),
+    "blit_sprite": lambda r, name, x, y, flip=0, key=None, frame=0: _sprite_extent(r, name, x, y, frame),
+    "rects": lambda r, coords, color, fill=True: r._batch_extent(coords, 0),
+    "pixels": lambda r, coords, colors, size=1: r._batch_extent(coords, 1, size - 1),
+    "circles": lambda r, coords, color, fill=True: r._batch_extent(coords, 2),
+    "save_layer": lambda r, name, rect=None: _layer_extent(r, rect),
+    "restore_layer": lambda r, name, gen, rect=None: _layer_extent(r, rect or r._layer_rects.get(name)),
+    "draw_tilemap": lambda r, tm, version=0: (tm.x, tm.y, tm.x + tm.w, tm.y + tm.h),
+    # El recorte cambia lo que dibujan los comandos siguientes: su caja es la zona afectada
+    "push_clip": lambda r, x, y, w, h: (x, y, x + w, y + h),
+    "pop_clip": lambda r: (0, 0, 0, 0),
+}
+
+# Argumentos que son buffers mutables: se graba una copia para poder comparar frames
+SNAPSHOT_ARGS = {
+    "rects": (0,),
+    "pixels": (0, 1),
+    "circles": (0,),
+}
+
+# Implementación inmediata de cada primitiva grabada
+IMMEDIATE = {name: getattr(Renderer, name) for name in EXTENTS}
+# restore_layer se graba con la generación de la capa (ver RetainedRenderer.restore_layer)
+IMMEDIATE["restore_layer"] = lambda r, name, gen, rect=None: Renderer.restore_layer(r, name, rect)
+# El tilemap se graba con su versión y al reproducir se repintan todos los tiles visibles
+IMMEDIATE["draw_tilemap"] = lambda r, tm, version=0: r._draw_tilemap(tm, True)
+
+# Comandos con método propio en RetainedRenderer (no usan recorder)
+LAYER_COMMANDS = ("save_layer", "restore_layer")
+OWN_RECORDERS = LAYER_COMMANDS + ("draw_tilemap",)
+
+class RetainedRenderer(Renderer):
+    """Renderer que graba cada frame y solo rasteriza/envía si cambió respecto al anterior"""
+    def __init__(self, display, buffer_rows=None):
+        super().__init__(display, buffer_rows)
+        # Comandos del frame en curso: (nombre, args, kwargs, x0, y0, x1, y1)
+        self._frame = []
+        # Frame anterior (None fuerza un render completo)
+        self._prev = None
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        # Rectángulo y generación de cada capa en el momento de grabar
+        self._layer_rects = {}
+        self._layer_gens = {}
+        logger.info("RetainedRenderer initialized")
+
+    def _record(self, name, args, kwargs):
+        """Añade una primitiva a la lista del frame en curso"""
+        x0, y0, x1, y1 = EXTENTS[name](self, *args, **kwargs)
+        self._frame.append((name, args, kwargs, x0, y0, x1, y1))
+
+    def _mark(self, x, y, w, h):
+        # Las regiones modificadas salen de comparar listas, no de rasterizar
+        pass
+
+    def _mark_all(self):
+        pass
+
+    def _mark_bbox(self, x0, y0, x1, y1):
+        """Marca como modificada la caja de un comando (x1, y1 exclusivos, ver EXTENTS)"""
+        x0 = int(x0)
+        y0 = int(y0)
+        Renderer._mark(self, x0, y0, int(x1) - x0, int(y1) - y0)
+
+    def _mark_screen(self):
+        """Marca toda la pantalla como modificada"""
+        Renderer._mark_all(self)
+
+    def invalidate(self):
+        """Fuerza el render y envío completo en el próximo flush"""
+        self._prev = None
+    
+    def set_scroll_region(self, top, height):
+        # La imagen sale de reproducir la lista: las pantallas redibujan en lugar de desplazar
+        return False
+    
+    def save_layer(self, name, rect=None):
+        """Graba el guardado; la copia se hace al reproducir el frame en flush()"""
+        if self._targets:
+            return Renderer.save_layer(self, name, rect)
+        self._layer_rects[name] = rect
+        # Cada guardado cambia la generación: un restore igual en texto puede traer otros píxeles
+        self._layer_gens[name] = self._layer_gens.get(name, 0) + 1
+        self._record("save_layer", (name, rect), {})
+    
+    def restore_layer(self, name, rect=None):
+        if self._targets:
+            return Renderer.restore_layer(self, name, rect)
+        self._record("restore_layer", (name, self._layer_gens.get(name, 0), rect), {})
+    
+    def drop_layer(self, name):
+        self._layer_rects.pop(name, None)
+        Renderer.drop_layer(self, name)
+    
+    def draw_tilemap(self, tm):
+        """Graba el mapa con su versión: cambia con cada tile o movimiento de cámara"""
+        if self._targets:
+            return self._draw_tilemap(tm, True)
+        self._record("draw_tilemap", (tm, tm.version), {})
+
+    def _mark_changes(self, old, new, start=0):
+        """Marca las cajas de los comandos que difieren entre dos listas.
+
+        Un píxel fuera de todas esas cajas está cubierto por los mismos
+        comandos en ambas listas, así que su color final no cambia.
+        """
+        if old is None:
+            self._mark_screen()
+            return
+        if old == new:
+            return
+        n = min(len(old), len(new))
+        for i in range(start, n):
+            a = old[i]
+            b = new[i]
+            if a != b:
+                self._mark_bbox(a[3], a[4], a[5], a[6])
+                self._mark_bbox(b[3], b[4], b[5], b[6])
+        for cmd in old[n:]:
+            self._mark_bbox(cmd[3], cmd[4], cmd[5], cmd[6])
+        for cmd in new[n:]:
+            self._mark_bbox(cmd[3], cmd[4], cmd[5], cmd[6])
+
+    def _replay(self, commands):
+        """Rasteriza una lista de comandos en el framebuffer"""
+        for name, args, kwargs, x0, y0, x1, y1 in commands:
+            if kwargs:
+                IMMEDIATE[name](self, *args, **kwargs)
+            else:
+                IMMEDIATE[name](self, *args)
+            if name != "fill":
+                # _mark no anota nada aquí: sin esto flush() enviaría solo el color del fill
+                self._solid = None
+
+    def flush(self):
+        """Omite el frame si es idéntico al anterior; si no, rasteriza y envía lo cambiado"""
+        frame = self._frame
+        self._frame = []
+        if frame == self._prev:
+            self.frames_skipped += 1
+            return
+        self._mark_changes(self._prev, frame)
+        self._replay(frame)
+        Renderer.flush(self)
+        self._prev = frame
+        self.frames_rendered += 1
+
+    def display_list_stats(self):
+        """Frames rasterizados frente a frames omitidos por no tener cambios"""
+        return {
+            "rendered": self.frames_rendered,
+            "skipped": self.frames_skipped,
+            "commands": len(self._prev) if self._prev else 0,
+        }
+
+
+def recorder(name):
+    """Crea el método que graba la primitiva `name` en lugar de dibujarla"""
+    immediate = IMMEDIATE[name]
+    def record(self, *args, **kwargs):
+        if self._targets:
+            # Dibujando en un sprite fuera de pantalla: sin grabar
+            return immediate(self, *args, **kwargs)
+        self._record(name, args, kwargs)
+    return record
+
+def snapshot_recorder(name):
+    """Como recorder(), pero copia los buffers del lote (el juego los reutiliza cada frame)"""
+    immediate = IMMEDIATE[name]
+    buffer_args = SNAPSHOT_ARGS[name]
+    def record(self, *args, **kwargs):
+        if self._targets:
+            return immediate(self, *args, **kwargs)
+        args = list(args)
+        for i in buffer_args:
+            if i < len(args) and not isinstance(args[i], int):
+                args[i] = bytes(args[i])
+        self._record(name, tuple(args), kwargs)
+    return record
+
+for _name in EXTENTS:
+    if _name in OWN_RECORDERS:
+        continue
+    if _name in SNAPSHOT_ARGS:
+        setattr(RetainedRenderer, _name, snapshot_recorder(_name))
+    else:
+        setattr(RetainedRenderer, _name, recorder(_name))
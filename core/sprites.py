@@ -0,0 +1,54 @@
+# sprites.py - Sprites RGB565 y hojas de sprites (atlas)
+
+import framebuf
+import lib.logging as logging
+
+logger = logging.getLogger("sprites")
+
+# Flags de volteo para blit_sprite
+FLIP_X = 1
+FLIP_Y = 2
+
+class Sprite:
+    """Imagen RGB565 en el orden de bytes del panel (o índices GS8), lista para blit"""
+    def __init__(self, buf, width, height, stride=None, key=-1, fmt=framebuf.RGB565):
+        self.buffer = buf
+        self.width = width
+        self.height = height
+        self.stride = stride or width
+        # Color transparente ya en orden de bytes del panel, o índice en GS8 (-1 = opaco)
+        self.key = key
+        self.fb = framebuf.FrameBuffer(buf, width, height, fmt, self.stride)
+
+
+def split_sheet(data, sheet_w, frame_w, frame_h, key=-1, fmt=framebuf.RGB565):
+    """Divide una hoja en frames (por filas) que comparten su memoria"""
+    bpp = 1 if fmt == framebuf.GS8 else 2
+    sheet_h = len(data) // (sheet_w * bpp)
+    mv = memoryview(data)
+    frames = []
+    for fy in range(0, sheet_h - frame_h + 1, frame_h):
+        for fx in range(0, sheet_w - frame_w + 1, frame_w):
+            offset = (fy * sheet_w + fx) * bpp
+            frames.append(Sprite(mv[offset:], frame_w, frame_h, sheet_w, key, fmt))
+    return frames
+
+
+def read_sheet(source, palette=None):
+    """Obtiene los píxeles de una hoja desde un fichero o un buffer.
+
+    Sin paleta, los datos son RGB565 big-endian (orden del panel) y se usan
+    tal cual. Con paleta, cada byte es un índice a una lista de colores RGB565.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            source = f.read()
+    if palette is None:
+        return source if isinstance(source, bytearray) else bytearray(source)
+
+    data = bytearray(len(source) * 2)
+    for i, index in enumerate(source):
+        color = palette[index]
+        data[2 * i] = color >> 8
+        data[2 * i + 1] = color & 0xFF
+    return data
@@ -0,0 +1,96 @@
+# tilemap.py - Mapas de tiles (un byte por celda) con cámara y tiles modificados
+
+import lib.logging as logging
+
+logger = logging.getLogger("tilemap")
+
+def build_atlas(frames, tile_w, tile_h, bpp=2):
+    """Copia los frames (Sprite) en un atlas contiguo: tile i en i * tile_w * tile_h píxeles"""
+    row = tile_w * bpp
+    atlas = bytearray(len(frames) * row * tile_h)
+    offset = 0
+    for sprite in frames:
+        if sprite.width != tile_w or sprite.height != tile_h:
+            raise ValueError(f"Tile size {sprite.width}x{sprite.height} != {tile_w}x{tile_h}")
+        src = memoryview(sprite.buffer)
+        stride = sprite.stride * bpp
+        for y in range(tile_h):
+            atlas[offset:offset + row] = src[y * stride:y * stride + row]
+            offset += row
+    return atlas
+
+
+class TileMap:
+    """Mapa de cols x rows tiles dibujado en un viewport de pantalla con una cámara"""
+    def __init__(self, cols, rows, tile_w, tile_h, atlas, count, viewport):
+        self.cols = cols
+        self.rows = rows
+        self.tile_w = tile_w
+        self.tile_h = tile_h
+        self.atlas = atlas
+        self.count = count
+        # Índice de tile por celda y marca de celda modificada desde el último draw
+        self.map = bytearray(cols * rows)
+        self.dirty = bytearray(cols * rows)
+        self.x, self.y, self.w, self.h = viewport
+        self.cam_x = 0
+        self.cam_y = 0
+        # Cambia con cada modificación (la usan los renderers retained para comparar frames)
+        self.version = 0
+        # Cámara del último draw (None = redibujar todo el viewport)
+        self.drawn_cam_x = None
+        self.drawn_cam_y = None
+        logger.debug(f"TileMap {cols}x{rows} tiles of {tile_w}x{tile_h}, {count} in atlas")
+
+    def set(self, col, row, tile):
+        """Cambia el tile de una celda (fuera del mapa se ignora)"""
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            if not 0 <= tile < self.count:
+                raise ValueError(f"Tile {tile} not in atlas ({self.count} tiles)")
+            i = row * self.cols + col
+            if self.map[i] != tile:
+                self.map[i] = tile
+                self.dirty[i] = 1
+                self.version += 1
+
+    def get(self, col, row):
+        """Tile de una celda, o -1 fuera del mapa"""
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.map[row * self.cols + col]
+        return -1
+
+    def tile_at(self, wx, wy):
+        """Tile en unas coordenadas del mundo (píxeles), útil para colisiones"""
+        return self.get(int(wx) // self.tile_w, int(wy) // self.tile_h)
+
+    def load(self, data):
+        """Carga el mapa completo desde bytes (cols * rows índices, fila a fila)"""
+        if len(data) != len(self.map):
+            raise ValueError(f"Map data has {len(data)} cells, expected {len(self.map)}")
+        # Un mapa de 0 celdas no tiene nada que comprobar (max() fallaría)
+        top = max(data) if data else 0
+        if top >= self.count:
+            raise ValueError(f"Map uses tile {top}, atlas has {self.count}")
+        self.map[:] = data
+        self.invalidate()
+
+    def fill(self, tile):
+        self.load(bytes([tile]) * len(self.map))
+
+    def camera(self, x, y):
+        """Mueve la cámara (esquina superior izquierda del viewport en el mundo), recortada al mapa"""
+        x = max(0, min(int(x), self.cols * self.tile_w - self.w))
+        y = max(0, min(int(y), self.rows * self.tile_h - self.h))
+        if x != self.cam_x or y != self.cam_y:
+            self.cam_x = x
+            self.cam_y = y
+            self.version += 1
+
+    def to_screen(self, wx, wy):
+        """Convierte coordenadas del mundo a pantalla según la cámara"""
+        return int(wx) - self.cam_x + self.x, int(wy) - self.cam_y + self.y
+
+    def invalidate(self):
+        """Fuerza a redibujar todo el viewport en el próximo draw"""
+        self.drawn_cam_x = None
+        self.version += 1
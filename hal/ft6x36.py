@@ -33,6 +33,8 @@ class Ft6x36:
         self.swap_xy = swap_xy
         self.read_buffer1 = bytearray(1)
         self.read_buffer4 = bytearray(4)
+        # Resultado de la última lectura de poll() (filtro de glitches sin esperas)
+        self.poll_hit = False
         logger.info(f"FT6x36 initialized: addr=0x{self.SLAVE_ADDR:02X}, swap_xy={swap_xy}")
         logger.debug(f"Calibration: ax={ax}, bx={bx}, ay={ay}, by={by}")
     
@@ -45,19 +47,37 @@ class Ft6x36:
             self.i2c.readfrom_mem_into( self.SLAVE_ADDR, self.STATUS_REG, self.read_buffer1 )
             points = self.read_buffer1[0] & 0x0F
             if( points == 1 ):
-                self.i2c.readfrom_mem_into( self.SLAVE_ADDR, self.P1_XH_REG, self.read_buffer4 )
-                x = (self.read_buffer4[0] << 8 | self.read_buffer4[1]) & 0x0FFF
-                y = (self.read_buffer4[2] << 8 | self.read_buffer4[3]) & 0x0FFF
-                
-                if( self.swap_xy ):
-                    tmp = x
-                    x = y
-                    y = tmp
-                
-                x = int( self.ax*x + self.bx )
-                y = int( self.ay*y + self.by )
-                return 1, x, y
+                return self._read_point()
             else:
                 return 0, 0, 0
         else:
-            return 0, 0, 0
\ No newline at end of file
+            return 0, 0, 0
+    
+    def poll( self ):
+        """
+        Lectura sin esperas para llamar con frecuencia (p.ej. entre trozos del flush).
+        
+        En lugar de repetir la lectura tras 1 ms, un punto solo cuenta si la
+        llamada anterior también lo vio.
+        """
+        self.i2c.readfrom_mem_into( self.SLAVE_ADDR, self.STATUS_REG, self.read_buffer1 )
+        hit = ( self.read_buffer1[0] & 0x0F ) == 1
+        confirmed = hit and self.poll_hit
+        self.poll_hit = hit
+        if( confirmed ):
+            return self._read_point()
+        return 0, 0, 0
+    
+    def _read_point( self ):
+        self.i2c.readfrom_mem_into( self.SLAVE_ADDR, self.P1_XH_REG, self.read_buffer4 )
+        x = (self.read_buffer4[0] << 8 | self.read_buffer4[1]) & 0x0FFF
+        y = (self.read_buffer4[2] << 8 | self.read_buffer4[3]) & 0x0FFF
+        
+        if( self.swap_xy ):
+            tmp = x
+            x = y
+            y = tmp
+        
+        x = int( self.ax*x + self.bx )
+        y = int( self.ay*y + self.by )
+        return 1, x, y
@@ -11,22 +11,52 @@ class St7796s:
     CASET = 0x2A
     RASET = 0x2B
     RAMWR = 0x2C 
+    VSCRDEF = 0x33
+    TEOFF = 0x34
+    TEON = 0x35
+    VSCSAD = 0x37
 
     X_OFFSET = 0
     Y_OFFSET = 0
     
-    def __init__( self, spi, rst, cs, dc, bl ):
+    # Bytes del trozo de color repetido que envía fill_rect (1024 píxeles)
+    FILL_CHUNK = 2048
+    
+    def __init__( self, spi, rst, cs, dc, bl, te=None ):
         logger.debug("Initializing ST7796S display driver...")
         self.spi = spi
         self.rst = rst
         self.cs = cs
         self.dc = dc
         self.bl = bl
+        # Pin de la salida TE (None = sin sincronización): pulsos contados y periodo medio
+        self.te = te
+        self.te_count = 0
+        self.te_last = 0
+        self.te_period_us = 0
         self.buf1 = bytearray(1)
         self.buf4 = bytearray(4)
+        self.buf2 = bytearray(2)
+        self.buf6 = bytearray(6)
+        # Comandos y coordenadas preasignados para la ruta rápida (ver _begin_write)
+        self.cmd_caset = bytes([self.CASET])
+        self.cmd_raset = bytes([self.RASET])
+        self.cmd_ramwr = bytes([self.RAMWR])
+        self.caset_buf = bytearray(4)
+        self.raset_buf = bytearray(4)
+        # Trozo reutilizable de fill_rect y color que contiene (-1 = sin rellenar)
+        self.fill_buf = bytearray( self.FILL_CHUNK )
+        self.fill_color = -1
+        self.invalidate_window()
+        # Llamada cada chunk_bytes de píxeles enviados (ver set_chunk_callback)
+        self.chunk_bytes = 0
+        self.chunk_left = 0
+        self.chunk_callback = None
         self.reset()
         self.config()
         self.clear()
+        if( te is not None ):
+            self.enable_te()
         self.bl.value(1)
         logger.info(f"ST7796S initialized: {self.WIDTH}x{self.HEIGHT}")
     
@@ -54,8 +84,16 @@ class St7796s:
         self.cs(1)
         self.dc(0)
     
+    def invalidate_window( self ):
+        # La próxima escritura reenvía CASET y RASET
+        self.win_x0 = -1
+        self.win_x1 = -1
+        self.win_y0 = -1
+        self.win_y1 = -1
+    
     def config( self ):
         logger.debug("Configuring display registers...")
+        self.invalidate_window()
         self.write_reg( 0x01, b"\x01" )
         time.sleep_ms( 100 )
         self.write_reg( 0x11, b"" )
@@ -96,12 +134,166 @@ class St7796s:
         self.buf4[2] = y1>>8
         self.buf4[3] = y1&0xFF
         self.write_reg( self.RASET, self.buf4 )
+        self.win_x0 = x0
+        self.win_x1 = x1
+        self.win_y0 = y0
+        self.win_y1 = y1
+
+    def enable_te( self ):
+        # TE en modo 0: un pulso al empezar cada blanking vertical
+        self.write_reg( self.TEON, b"\x00" )
+        self.te.irq( trigger=machine.Pin.IRQ_RISING, handler=self._te_irq )
+        logger.info("Tearing effect output enabled")
+    
+    def disable_te( self ):
+        self.te.irq( handler=None )
+        self.write_reg( self.TEOFF, b"" )
+    
+    def _te_irq( self, pin ):
+        now = time.ticks_us()
+        if( self.te_count ):
+            period = time.ticks_diff( now, self.te_last )
+            # Media móvil (1/8) del periodo entre pulsos
+            if( self.te_period_us ):
+                self.te_period_us += ( period - self.te_period_us ) >> 3
+            else:
+                self.te_period_us = period
+        self.te_last = now
+        self.te_count += 1
+
+    def set_scroll_area( self, top, height, bottom ):
+        # Zona fija superior, zona de scroll y zona fija inferior (suman HEIGHT)
+        self.buf6[0] = top>>8
+        self.buf6[1] = top&0xFF
+        self.buf6[2] = height>>8
+        self.buf6[3] = height&0xFF
+        self.buf6[4] = bottom>>8
+        self.buf6[5] = bottom&0xFF
+        self.write_reg( self.VSCRDEF, self.buf6 )
+    
+    def scroll_to( self, line ):
+        # Fila de memoria que se muestra en la parte superior de la zona de scroll
+        self.buf2[0] = line>>8
+        self.buf2[1] = line&0xFF
+        self.write_reg( self.VSCSAD, self.buf2 )
+
+    def _begin_write( self, x, y, w, h ):
+        # Ventana + RAMWR en una sola transacción (CS activo hasta _end_write).
+        # RAMWR vuelve al inicio de la ventana: si no cambia, no se reenvían CASET/RASET
+        x0 = x + self.X_OFFSET
+        y0 = y + self.Y_OFFSET
+        x1 = x0 + w - 1
+        y1 = y0 + h - 1
+        spi = self.spi
+        dc = self.dc
+        self.cs(0)
+        if x0 != self.win_x0 or x1 != self.win_x1:
+            b = self.caset_buf
+            b[0] = x0>>8
+            b[1] = x0&0xFF
+            b[2] = x1>>8
+            b[3] = x1&0xFF
+            dc(0)
+            spi.write( self.cmd_caset )
+            dc(1)
+            spi.write( b )
+            self.win_x0 = x0
+            self.win_x1 = x1
+        if y0 != self.win_y0 or y1 != self.win_y1:
+            b = self.raset_buf
+            b[0] = y0>>8
+            b[1] = y0&0xFF
+            b[2] = y1>>8
+            b[3] = y1&0xFF
+            dc(0)
+            spi.write( self.cmd_raset )
+            dc(1)
+            spi.write( b )
+            self.win_y0 = y0
+            self.win_y1 = y1
+        dc(0)
+        spi.write( self.cmd_ramwr )
+        dc(1)
+    
+    def _end_write( self ):
+        self.cs(1)
+        self.dc(0)
+
+    def set_chunk_callback( self, chunk_bytes, callback ):
+        # Envía los píxeles en trozos de chunk_bytes (vistas, sin copias) y llama a
+        # callback() entre trozos, con la transacción abierta: no debe usar este bus
+        self.chunk_bytes = chunk_bytes
+        self.chunk_left = chunk_bytes
+        self.chunk_callback = callback if chunk_bytes > 0 else None
+
+    def _write_data( self, buf ):
+        callback = self.chunk_callback
+        if callback is None:
+            self.spi.write( buf )
+            return
+        mv = memoryview( buf )
+        n = len( mv )
+        pos = 0
+        while pos < n:
+            step = min( n - pos, self.chunk_left )
+            self.spi.write( mv[pos:pos + step] )
+            pos += step
+            self.chunk_left -= step
+            if self.chunk_left <= 0:
+                # El contador sigue entre llamadas: los envíos pequeños también cuentan
+                self.chunk_left = self.chunk_bytes
+                callback()
 
     def draw( self, x, y, w, h, buf ):
-        self.set_window( x, y, w, h )
-        self.write_reg( self.RAMWR, buf )
+        self._begin_write( x, y, w, h )
+        self._write_data( buf )
+        self._end_write()
+
+    def draw_region( self, x, y, w, h, buf, stride ):
+        # Envía una subregión de un buffer más ancho (stride en bytes por fila)
+        self._begin_write( x, y, w, h )
+        mv = memoryview( buf )
+        row_bytes = w * 2
+        write = self.spi.write if self.chunk_callback is None else self._write_data
+        offset = 0
+        for i in range( h ):
+            write( mv[offset:offset + row_bytes] )
+            offset += stride
+        self._end_write()
+
+    def fill_rect( self, x, y, w, h, color ):
+        # Rellena un rectángulo con un color RGB565 sin framebuffer: una ventana y
+        # el mismo trozo de color enviado las veces necesarias
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        w = min( w, self.WIDTH - x )
+        h = min( h, self.HEIGHT - y )
+        if w <= 0 or h <= 0:
+            return
+        mv = memoryview( self.fill_buf )
+        if color != self.fill_color:
+            mv[0] = color>>8
+            mv[1] = color&0xFF
+            # Duplica lo ya relleno hasta completar el trozo
+            n = 2
+            size = len( mv )
+            while n < size:
+                step = min( n, size - n )
+                mv[n:n + step] = mv[:step]
+                n += step
+            self.fill_color = color
+        chunk = len( mv )
+        left = w * h * 2
+        self._begin_write( x, y, w, h )
+        while left > 0:
+            step = chunk if left > chunk else left
+            self._write_data( mv[:step] )
+            left -= step
+        self._end_write()
 
     def clear( self ):
-        buf = bytearray( [0x00, 0x00]*self.WIDTH )
-        for i in range( self.HEIGHT ):
-            self.draw( 0, i, self.WIDTH, 1, buf )
+        self.fill_rect( 0, 0, self.WIDTH, self.HEIGHT, 0x0000 )
@@ -1,5 +1,6 @@
 # main.py - Punto de entrada de Game Maker Console
 
+import time
 import machine
 import config
 import lib.logging as logging
@@ -17,6 +18,7 @@ logger = logging.getLogger("main")
 
 def main():
     logger.info("Starting Game Maker Console...")
+    boot_start = time.ticks_ms()
     
     # Inicializa SPI para LCD
     logger.debug("Initializing SPI for LCD...")
@@ -31,14 +33,17 @@ def main():
     
     # Inicializa LCD
     logger.debug("Initializing LCD display...")
+    lcd_start = time.ticks_ms()
     display = St7796s(
         spi=spi,
         rst=machine.Pin(config.LCD_RST, machine.Pin.OUT),
         cs=machine.Pin(config.LCD_CS, machine.Pin.OUT),
         dc=machine.Pin(config.LCD_DC, machine.Pin.OUT),
-        bl=machine.Pin(config.LCD_BL, machine.Pin.OUT)
+        bl=machine.Pin(config.LCD_BL, machine.Pin.OUT),
+        te=machine.Pin(config.LCD_TE, machine.Pin.IN) if config.LCD_TE is not None else None
     )
-    logger.info(f"LCD initialized: {display.WIDTH}x{display.HEIGHT}")
+    # Incluye reset, configuración y clear() (fill_rect de pantalla completa)
+    logger.info(f"LCD initialized: {display.WIDTH}x{display.HEIGHT} in {time.ticks_diff(time.ticks_ms(), lcd_start)} ms")
     
     # Inicializa I2C para Touch
     logger.debug("Initializing I2C for Touch...")
@@ -65,6 +70,7 @@ def main():
     # Crea y ejecuta la aplicación
     logger.info("Creating App instance...")
     app = App(display, touch)
+    logger.info(f"Boot completed in {time.ticks_diff(time.ticks_ms(), boot_start)} ms")
     
     try:
         logger.info("Starting main application loop")
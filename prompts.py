@@ -26,10 +26,34 @@ r.line(x0, y0, x1, y1, color)
 r.hline(x, y, width, color)
 r.vline(x, y, height, color)
 r.pixel(x, y, color)
+r.blend_rect(x, y, w, h, color, alpha)  # Tiñe una zona con transparencia (alpha 0-255), p.ej. overlays
 r.text(x, y, "texto", color, scale=1/2/3)
 r.text_centered(y, "texto", color, scale=1/2/3)
+r.text_box(x, y, w, h, "texto largo", color, scale=1)  # Parte el texto en lineas dentro de la caja ("..." si no cabe)
 r.progress_bar(x, y, w, h, progress, bg_color, fg_color)
+r.push_clip(x, y, w, h)  # Todo lo que se dibuje hasta r.pop_clip() queda recortado a ese rectangulo
+r.native(color)  # Handle de color pre-convertido, mas rapido en bucles de dibujo
+r.palette(BG=0x1082, PLAYER=0xFE19)  # Paleta de handles: P.BG, P.PLAYER
+r.bake_sprite("nave", 40, 40, dibujar)  # Hornea UNA vez dibujar(r) en un sprite 40x40 (fondo 0xF81F = transparente)
+r.blit_sprite("nave", x, y, flip=0)  # Copia rapida del sprite (x, y = esquina sup. izq.), flip=r.FLIP_X / r.FLIP_Y
+r.load_sprites("tiles", "/games/tiles.bin", 16, 16, sheet_w=128)  # Hoja RGB565; blit_sprite(..., frame=i)
+r.rects(arr, color, fill=True)  # Muchos rects en UNA llamada: arr = array('h', [x, y, w, h, x, y, w, h, ...])
+r.pixels(arr, colores)  # arr = array('h', [x, y, x, y, ...]); colores = un color o array('H') con uno por pixel
+r.circles(arr, color, fill=True)  # arr = array('h', [cx, cy, radio, ...])
+ps = Particles(500, gravity=0.0, drag=1.0, size=2)  # Particulas integradas (NO se importa): hasta 500 sin crear objetos
+ps.emit(x, y, 20, color, speed=3, life=20, angle=0, spread=360)  # Explosion: 20 particulas (angulo en grados, 90 = abajo)
+em = ps.emitter(x, y, 2, color, speed=1, life=30, angle=270, spread=40)  # Emisor continuo: em.move(x, y) y em.update() cada frame
+ps.update()  # Cada frame en update(); ps.draw(r) en draw() las pinta todas en una llamada
+r.save_layer("fondo")  # Guarda lo dibujado (o rect=(x, y, w, h)) para no repintar el fondo estatico
+r.restore_layer("fondo")  # Lo restaura en una sola copia; restore_layer("fondo", (x, y, w, h)) restaura solo una zona
+# Para lotes (estrellas, balas, particulas) reutiliza el array y actualiza sus valores en update()
+tm = r.tilemap(cols, rows, 16, 16, ["suelo", "muro", "agua"])  # Mapa de tiles (UNA vez en __init__); tiles = sprites horneados del mismo tamano o nombre de hoja
+tm.set(col, fila, 1)  # Tile de una celda (indice en la lista de tiles); tm.load(bytes) carga el mapa entero, tm.get(col, fila)
+tm.camera(x, y)  # Esquina sup. izq. visible del mundo (se recorta al mapa); tm.to_screen(wx, wy) -> coordenadas de pantalla
+tm.tile_at(wx, wy)  # Tile en coordenadas del mundo, para colisiones con muros
+r.draw_tilemap(tm)  # Dibuja solo los tiles visibles que cambiaron o quedaron tapados; al inicio de draw() en lugar de r.fill
 r.flush()  # SIEMPRE al final de draw()
+# Los handles de r.native/r.palette solo se pasan al renderer, NO hacer aritmetica con ellos
 
 === ARQUITECTURA OBLIGATORIA CON CLASES ===
 
@@ -224,32 +248,6 @@ class Projectile(Entity):
         r.ellipse(x, y + 8 * (1 if self.vy > 0 else -1), 2, 4, 
                  self.color & 0x7BEF, fill=True)
 
-# ============================================
-# CLASE: Particle - Efectos visuales
-# ============================================
-class Particle(Entity):
-    def __init__(self, x, y, color, life=20):
-        super().__init__(x, y, 4, 4, color)
-        self.life = life
-        self.max_life = life
-        import random
-        self.vx = random.randint(-3, 3)
-        self.vy = random.randint(-3, 3)
-    
-    def update(self, frame):
-        super().update(frame)
-        self.life -= 1
-        if self.life <= 0:
-            self.active = False
-        # Friccion
-        self.vx *= 0.9
-        self.vy *= 0.9
-    
-    def draw(self, r, frame):
-        alpha = self.life / self.max_life
-        size = max(1, int(4 * alpha))
-        r.circle(int(self.x), int(self.y), size, self.color, fill=True)
-
 # ============================================
 # CLASE: Item - Coleccionables y power-ups
 # ============================================
@@ -572,7 +570,8 @@ class Game:
         self.enemies = []
         self.projectiles = []
         self.items = []
-        self.particles = []
+        # Particulas integradas (ya disponible, NO se importa): arrays fijos, sin objetos por particula
+        self.particles = Particles(500, drag=0.9, size=3)
         
         # Spawn timers
         self.enemy_spawn_timer = 0
@@ -586,7 +585,7 @@ class Game:
         self.enemies = []
         self.projectiles = []
         self.items = []
-        self.particles = []
+        self.particles.clear()
         self.enemy_spawn_timer = 0
         self.item_spawn_timer = 0
         self._spawn_initial_enemies()
@@ -627,8 +626,7 @@ class Game:
     
     def _create_explosion(self, x, y, color, count=8):
         '''Crea efecto de explosion'''
-        for _ in range(min(count, 20 - len(self.particles))):
-            self.particles.append(Particle(x, y, color, 15))
+        self.particles.emit(x, y, count, color, speed=3, life=15)
     
     def _check_collisions(self):
         '''Verifica colisiones entre entidades'''
@@ -698,7 +696,6 @@ class Game:
         self.enemies = [e for e in self.enemies if e.active]
         self.projectiles = [p for p in self.projectiles if p.active]
         self.items = [i for i in self.items if i.active]
-        self.particles = [p for p in self.particles if p.active]
     
     def update(self):
         '''Actualiza el juego segun el estado actual'''
@@ -738,8 +735,7 @@ class Game:
             for item in self.items:
                 item.update(self.frame)
             
-            for particle in self.particles:
-                particle.update(self.frame)
+            self.particles.update()
             
             # Spawn
             self.enemy_spawn_timer += 1
@@ -816,8 +812,7 @@ class Game:
             
             self.player.draw(r, self.frame)
             
-            for particle in self.particles:
-                particle.draw(r, self.frame)
+            self.particles.draw(r)
             
             # HUD
             self.hud.draw(r, self.frame)
@@ -863,13 +858,17 @@ class Game:
 - Implementar mecanica principal en update()
 
 === OPTIMIZACIONES PARA ESP32 ===
-- Maximo 15 enemigos, 20 proyectiles, 10 items, 20 particulas
+- Maximo 15 enemigos, 20 proyectiles, 10 items
+- Particulas: SIEMPRE con Particles (hasta 500), nunca clases Particle propias ni listas de objetos
 - Usar enteros para posiciones cuando sea posible
 - Evitar crear objetos en cada frame
+- Hornear con r.bake_sprite las entidades repetidas (enemigos, proyectiles) y dibujarlas con r.blit_sprite
+- Fondo estatico (estrellas, marco del HUD): dibujarlo una vez, r.save_layer y cada frame r.restore_layer en vez de r.fill
+- Mundos con laberintos, plataformas o mazmorras: r.tilemap + r.draw_tilemap en vez de cientos de r.rect, y camera() para desplazarse
 - Reutilizar listas, no crear nuevas
 
 === PROHIBIDO ===
-- NO imports externos (solo random cuando sea necesario)
+- NO imports externos (solo random y array cuando sea necesario)
 - NO threading, NO async
 - NO time.sleep()
 - NO variables globales fuera de las clases
@@ -910,7 +909,9 @@ r.vline(x, y, height, color)
 r.pixel(x, y, color)
 r.text(x, y, "texto", color, scale=1/2/3)
 r.text_centered(y, "texto", color, scale=1/2/3)
+r.text_box(x, y, w, h, "texto largo", color, scale=1)  # Parte el texto en lineas dentro de la caja ("..." si no cabe)
 r.progress_bar(x, y, w, h, progress, bg_color, fg_color)
+r.push_clip(x, y, w, h)  # Todo lo que se dibuje hasta r.pop_clip() queda recortado a ese rectangulo
 r.flush()  # SIEMPRE al final de draw()
 
 === DESCRIPCION DE LA APLICACION ===
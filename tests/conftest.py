@@ -0,0 +1,141 @@
+# conftest.py - Entorno de host para las pruebas (pytest con CPython)
+#
+# El código del proyecto usa módulos de MicroPython (micropython, framebuf,
+# machine) y extensiones de time/gc. Aquí se instalan versiones mínimas en
+# Python antes de importar nada del proyecto; en el dispositivo no se usan.
+
+import os
+import sys
+import gc
+import time
+import types
+import builtins
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _install_micropython():
+    mod = types.ModuleType("micropython")
+    mod.const = lambda x: x
+    # viper y native se ejecutan como Python normal: los punteros son memoryview
+    mod.viper = lambda f: f
+    mod.native = lambda f: f
+    sys.modules["micropython"] = mod
+
+    def pointer(fmt):
+        def ptr(obj):
+            view = memoryview(obj).cast("B")
+            return view if fmt == "B" else view.cast(fmt)
+        return ptr
+    builtins.ptr8 = pointer("B")
+    builtins.ptr16 = pointer("H")
+    builtins.ptr32 = pointer("i")
+    builtins.uint = int
+
+
+class FrameBuffer:
+    """framebuf.FrameBuffer reducido a lo que usan las pruebas (RGB565 y GS8)"""
+    def __init__(self, buf, width, height, fmt, stride=None):
+        self.buf = memoryview(buf).cast("B")
+        self.width = width
+        self.height = height
+        self.stride = stride or width
+        self.bpp = 1 if fmt == GS8 else 2
+
+    def _bytes(self, c):
+        if self.bpp == 1:
+            return bytes((c & 0xFF,))
+        return bytes((c & 0xFF, (c >> 8) & 0xFF))
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        i = (y * self.stride + x) * self.bpp
+        if c is None:
+            return int.from_bytes(self.buf[i:i + self.bpp], "little")
+        self.buf[i:i + self.bpp] = self._bytes(c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        row = self._bytes(c) * (x1 - x0)
+        for yy in range(y0, y1):
+            i = (yy * self.stride + x0) * self.bpp
+            self.buf[i:i + len(row)] = row
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, fill=False):
+        if fill:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+
+RGB565 = 1
+GS8 = 6
+
+
+def _install_framebuf():
+    mod = types.ModuleType("framebuf")
+    mod.FrameBuffer = FrameBuffer
+    mod.RGB565 = RGB565
+    mod.GS8 = GS8
+    sys.modules["framebuf"] = mod
+
+
+def _install_machine():
+    mod = types.ModuleType("machine")
+
+    class Pin:
+        IN = 0
+        OUT = 1
+        IRQ_RISING = 1
+        IRQ_FALLING = 2
+    mod.Pin = Pin
+    sys.modules["machine"] = mod
+
+
+def _install_time():
+    # Reloj por defecto; las pruebas de TE lo sustituyen por fakes.FakeClock
+    if not hasattr(time, "ticks_ms"):
+        time.ticks_ms = lambda: int(time.perf_counter() * 1000)
+        time.ticks_us = lambda: int(time.perf_counter() * 1000000)
+        time.ticks_diff = lambda a, b: a - b
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+
+
+def _install_gc():
+    if not hasattr(gc, "mem_alloc"):
+        gc.mem_alloc = lambda: 0
+        gc.mem_free = lambda: 0
+
+
+try:
+    import micropython  # noqa: F401
+except ImportError:
+    _install_micropython()
+try:
+    import framebuf  # noqa: F401
+except ImportError:
+    _install_framebuf()
+try:
+    import machine  # noqa: F401
+except ImportError:
+    _install_machine()
+_install_time()
+_install_gc()
@@ -0,0 +1,161 @@
+# fakes.py - Display, reloj, pin TE y _thread falsos para las pruebas en el host
+
+import threading
+
+
+class FakeDisplay:
+    """Display que guarda en memoria lo que recibe, en el orden de bytes del panel.
+
+    block() hace que el siguiente envío se quede esperando dentro de draw()
+    hasta release(): así una prueba puede dibujar mientras el hilo de flush
+    asíncrono está enviando. Los píxeles se copian al terminar la espera,
+    de modo que si alguien toca el buffer durante el envío, se nota.
+    """
+    WIDTH = 320
+    HEIGHT = 480
+
+    def __init__(self):
+        self.te = None
+        self.image = bytearray(self.WIDTH * self.HEIGHT * 2)
+        # Una copia de la imagen por cada envío completado
+        self.frames = []
+        self.entered = threading.Event()
+        self._gate = None
+
+    def block(self):
+        self.entered.clear()
+        self._gate = threading.Event()
+
+    def release(self):
+        gate = self._gate
+        self._gate = None
+        gate.set()
+
+    def _wait_gate(self):
+        gate = self._gate
+        if gate is not None:
+            self.entered.set()
+            assert gate.wait(2), "display blocked for too long"
+
+    def _store(self, x, y, w, h, rows):
+        stride = self.WIDTH * 2
+        for i in range(h):
+            a = (y + i) * stride + x * 2
+            self.image[a:a + w * 2] = rows[i]
+        self.frames.append(bytes(self.image))
+
+    def draw(self, x, y, w, h, buf):
+        self._wait_gate()
+        n = w * 2
+        self._store(x, y, w, h, [bytes(buf[i * n:(i + 1) * n]) for i in range(h)])
+
+    def draw_region(self, x, y, w, h, buf, stride):
+        self._wait_gate()
+        n = w * 2
+        self._store(x, y, w, h, [bytes(buf[i * stride:i * stride + n]) for i in range(h)])
+
+    def fill_rect(self, x, y, w, h, color):
+        self._store(x, y, w, h, [color.to_bytes(2, "big") * w] * h)
+
+    def set_scroll_area(self, top, height, bottom):
+        pass
+
+    def scroll_to(self, line):
+        pass
+
+    def pixel(self, x, y):
+        """Color RGB565 recibido en (x, y)"""
+        a = (y * self.WIDTH + x) * 2
+        return int.from_bytes(self.image[a:a + 2], "big")
+
+
+class ThreadShim:
+    """_thread de MicroPython sobre threading, guardando los hilos para esperarlos al final"""
+    def __init__(self):
+        self.threads = []
+
+    def allocate_lock(self):
+        # threading.Lock se puede liberar desde otro hilo, como el lock de MicroPython
+        return threading.Lock()
+
+    def start_new_thread(self, function, args):
+        thread = threading.Thread(target=function, args=args, daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def join(self, timeout=2):
+        for thread in self.threads:
+            thread.join(timeout)
+        return not any(thread.is_alive() for thread in self.threads)
+
+
+class FakePin:
+    """Pin con irq(): fire() llama al handler como lo haría un flanco de subida"""
+    def __init__(self):
+        self.handler = None
+        self.level = 0
+
+    def value(self, v=None):
+        if v is None:
+            return self.level
+        self.level = v
+
+    __call__ = value
+
+    def irq(self, trigger=None, handler=None):
+        self.handler = handler
+
+    def fire(self):
+        if self.handler is not None:
+            self.handler(self)
+
+
+class FakeClock:
+    """Reloj simulado que genera un pulso TE en el pin cada period_us.
+
+    Cada ticks_ms() avanza poll_us (una vuelta de espera activa); sleep_ms()
+    avanza lo pedido. Con running = False el panel deja de dar pulsos.
+    """
+    def __init__(self, pin, period_us=16667, poll_us=50):
+        self.pin = pin
+        self.period_us = period_us
+        self.poll_us = poll_us
+        self.running = True
+        self.now = 0
+        self.next_pulse = period_us
+        self.pulses = []
+
+    def advance(self, us):
+        end = self.now + us
+        while self.next_pulse <= end:
+            self.now = self.next_pulse
+            self.next_pulse += self.period_us
+            if self.running:
+                self.pulses.append(self.now)
+                self.pin.fire()
+        self.now = end
+
+    def ticks_us(self):
+        return self.now
+
+    def ticks_ms(self):
+        self.advance(self.poll_us)
+        return self.now // 1000
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def sleep_ms(self, ms):
+        self.advance(ms * 1000)
+
+    def install(self, monkeypatch, time_module):
+        for name in ("ticks_us", "ticks_ms", "ticks_diff", "sleep_ms"):
+            monkeypatch.setattr(time_module, name, getattr(self, name))
+
+
+class FakeSPI:
+    def __init__(self):
+        self.written = 0
+
+    def write(self, buf):
+        self.written += len(buf)
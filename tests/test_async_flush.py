@@ -0,0 +1,138 @@
+# test_async_flush.py - Flush asíncrono con doble buffer (core/async_flush.py)
+
+import threading
+import pytest
+
+import core.async_flush
+from core.renderer import Renderer
+from fakes import FakeDisplay, ThreadShim
+
+RED = 0xF800
+GREEN = 0x07E0
+BLUE = 0x001F
+BACKGROUND = 0x1082
+
+
+def draw_frame(r, f):
+    """Frame de prueba: fondo cada 4 frames, un cuadrado que se mueve y una cabecera que cambia"""
+    if f % 4 == 0:
+        r.fill(BACKGROUND)
+    r.rect((f * 37) % 280, (f * 53) % 440, 40, 40, (RED, GREEN, BLUE)[f % 3], True)
+    r.rect(0, 0, 320, 20, (BLUE, RED, GREEN)[f % 3], True)
+
+
+@pytest.fixture
+def thread_shim(monkeypatch):
+    shim = ThreadShim()
+    monkeypatch.setattr(core.async_flush, "_thread", shim)
+    return shim
+
+
+@pytest.fixture
+def renderer(thread_shim):
+    r = Renderer(FakeDisplay())
+    assert r.enable_async_flush()
+    yield r
+    r.enable_async_flush(False)
+    assert thread_shim.join(), "flush thread did not stop"
+
+
+def test_flushed_frames_match_drawn_frames(renderer):
+    ref = Renderer(FakeDisplay())
+    for f in range(12):
+        draw_frame(ref, f)
+        ref.flush()
+        draw_frame(renderer, f)
+        renderer.flush()
+        renderer._wait_flush()
+        assert renderer.display.image == ref.display.image, f"frame {f}"
+        # El buffer en el que se dibuja el siguiente frame tiene la imagen completa
+        assert bytes(renderer.buffer) == bytes(ref.buffer), f"frame {f}"
+    assert renderer._async.frames > 0
+    assert renderer._async.error is None
+
+
+def test_draw_during_flush_does_not_tear(renderer):
+    d = renderer.display
+    d.block()
+    renderer.rect(0, 0, 320, 480, GREEN, True)
+    renderer.flush()
+    assert d.entered.wait(2)
+    # El hilo está enviando el frame verde: el siguiente se dibuja en el otro buffer
+    assert renderer.buffer is not renderer._front
+    renderer.rect(0, 0, 320, 480, BLUE, True)
+    d.release()
+    renderer._wait_flush()
+    assert d.frames[-1] == GREEN.to_bytes(2, "big") * (320 * 480)
+    renderer.flush()
+    renderer._wait_flush()
+    assert d.frames[-1] == BLUE.to_bytes(2, "big") * (320 * 480)
+
+
+def test_flush_waits_for_previous_frame(renderer):
+    d = renderer.display
+    d.block()
+    renderer.rect(0, 0, 320, 240, GREEN, True)
+    renderer.flush()
+    assert d.entered.wait(2)
+    renderer.rect(0, 240, 320, 240, BLUE, True)
+    second = threading.Thread(target=renderer.flush)
+    second.start()
+    # El segundo flush no puede intercambiar buffers hasta que acabe el primer envío
+    second.join(0.05)
+    assert second.is_alive()
+    d.release()
+    second.join(2)
+    assert not second.is_alive()
+    renderer._wait_flush()
+    # Ningún frame se pierde: primero la mitad verde, después la azul encima de ella
+    assert d.pixel(10, 10) == GREEN
+    assert d.pixel(10, 300) == BLUE
+    green_index = next(i for i, img in enumerate(d.frames) if img[:2] == GREEN.to_bytes(2, "big"))
+    assert green_index < len(d.frames) - 1
+
+
+def test_scroll_region_falls_back_to_sync_flush(renderer):
+    ref = Renderer(FakeDisplay())
+    for r in (ref, renderer):
+        draw_frame(r, 0)
+        r.flush()
+        r.set_scroll_region(80, 200)
+    renderer._wait_flush()
+    frames = renderer._async.frames
+    for f in range(1, 4):
+        draw_frame(ref, f)
+        ref.flush()
+        draw_frame(renderer, f)
+        renderer.flush()
+        # Con zona de scroll el frame se envía en el momento, desde el buffer de dibujo
+        assert renderer._front is renderer.buffer
+        assert renderer._async.stale
+        assert renderer.display.image == ref.display.image, f"frame {f}"
+    assert renderer._async.frames == frames
+    for r in (ref, renderer):
+        r.clear_scroll_region()
+    # Al volver al modo asíncrono el otro buffer se rehace entero antes de dibujar en él
+    for f in range(4, 8):
+        draw_frame(ref, f)
+        ref.flush()
+        draw_frame(renderer, f)
+        renderer.flush()
+        renderer._wait_flush()
+        assert not renderer._async.stale
+        assert renderer.display.image == ref.display.image, f"frame {f}"
+        assert bytes(renderer.buffer) == bytes(ref.buffer), f"frame {f}"
+
+
+def test_sync_flush_without_thread(monkeypatch):
+    monkeypatch.setattr(core.async_flush, "_thread", None)
+    r = Renderer(FakeDisplay())
+    assert not r.enable_async_flush()
+    assert r._async is None
+    ref = Renderer(FakeDisplay())
+    for f in range(4):
+        draw_frame(ref, f)
+        ref.flush()
+        draw_frame(r, f)
+        r.flush()
+        assert r.display.image == ref.display.image, f"frame {f}"
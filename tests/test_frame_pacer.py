@@ -0,0 +1,118 @@
+# test_frame_pacer.py - Ritmo de frames con la señal TE (core/frame_pacer.py)
+
+import time
+import pytest
+
+from core.frame_pacer import FramePacer, CALIBRATION_PULSES, TE_TIMEOUT
+from core.renderer import Renderer
+from hal.st7796s import St7796s
+from fakes import FakeClock, FakePin, FakeSPI
+
+PERIOD_US = 16667
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = FakeClock(FakePin(), PERIOD_US)
+    c.install(monkeypatch, time)
+    return c
+
+
+@pytest.fixture
+def display(clock):
+    return St7796s(FakeSPI(), FakePin(), FakePin(), FakePin(), FakePin(), te=clock.pin)
+
+
+def test_calibrate_measures_te_period(clock, display):
+    assert clock.pin.handler is not None
+    pacer = FramePacer(display, 33)
+    assert pacer.calibrate()
+    assert abs(display.te_period_us - PERIOD_US) <= 1
+    # 33 ms a 60 Hz: un flush cada dos pulsos
+    assert pacer.divisor == 2
+    assert pacer.frame_time() == 33
+
+
+def test_sync_waits_for_te_edge(clock, display):
+    pacer = FramePacer(display, 33)
+    assert pacer.calibrate()
+    starts = []
+    for _ in range(5):
+        clock.sleep_ms(5)
+        pacer.sync()
+        starts.append(clock.now)
+        # Un segundo flush en el mismo frame no vuelve a esperar
+        pacer.sync()
+        assert clock.now == starts[-1]
+        pacer.frame_done()
+    for start in starts:
+        # Cada flush empieza nada más llegar su pulso
+        assert start - max(p for p in clock.pulses if p <= start) <= clock.poll_us
+    for a, b in zip(starts, starts[1:]):
+        assert abs(b - a - 2 * PERIOD_US) <= clock.poll_us
+    assert pacer.frames == 5
+    assert pacer.late == 0
+    assert not pacer.failed
+
+
+def test_late_frame_waits_for_next_pulse(clock, display):
+    pacer = FramePacer(display, 33)
+    assert pacer.calibrate()
+    # El frame tarda más que dos periodos: su pulso ya pasó
+    clock.sleep_ms(40)
+    count = display.te_count
+    pacer.sync()
+    assert pacer.late == 1
+    assert display.te_count == count + 1
+    pacer.frame_done()
+
+
+def test_flush_calls_sync(clock, display):
+    pacer = FramePacer(display, 33)
+    assert pacer.calibrate()
+    r = Renderer(display)
+    r.set_frame_sync(pacer.sync)
+    r.rect(0, 0, 10, 10, 0xF800, True)
+    r.flush()
+    assert pacer.frames == 1
+    pacer.frame_done()
+
+
+def test_calibrate_times_out_without_te(clock, display):
+    clock.running = False
+    start = clock.now
+    pacer = FramePacer(display, 33)
+    assert not pacer.calibrate()
+    assert clock.now - start >= CALIBRATION_PULSES * TE_TIMEOUT * 1000
+    assert clock.now - start <= (CALIBRATION_PULSES * TE_TIMEOUT + 2) * 1000
+
+
+def test_sync_falls_back_when_te_stops(clock, display):
+    pacer = FramePacer(display, 33)
+    assert pacer.calibrate()
+    clock.running = False
+    start = clock.now
+    pacer.sync()
+    assert pacer.failed
+    assert TE_TIMEOUT * 1000 <= clock.now - start <= (TE_TIMEOUT + 2) * 1000
+    pacer.frame_done()
+    # Tras el fallo no se vuelve a esperar: el bucle pasa al ritmo por tiempo
+    start = clock.now
+    pacer.sync()
+    pacer.frame_done()
+    assert clock.now == start
+    assert pacer.stats()["failed"]
+
+
+def test_no_sync_when_pacing_is_off(clock, display):
+    pacer = FramePacer(display, 33)
+    assert pacer.calibrate()
+    r = Renderer(display)
+    r.set_frame_sync(pacer.sync)
+    r.set_frame_sync(None)
+    r.rect(0, 0, 10, 10, 0xF800, True)
+    start = clock.now
+    r.flush()
+    assert pacer.frames == 0
+    # Sin esperas: el flush no consulta el reloj del pulso
+    assert clock.now == start
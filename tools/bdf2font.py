@@ -0,0 +1,106 @@
+# bdf2font.py - Convierte una fuente BDF al formato binario de core/font.py (se ejecuta en el PC)
+#
+# Uso: python tools/bdf2font.py fuente.bdf salida.bin [--fixed] [--first 32] [--last 126]
+
+import sys
+import struct
+
+MAGIC = b"EGF1"
+HEADER = "<4sBBHHBB"
+ENTRY = "<IBB"
+PROPORTIONAL = 1
+
+
+def parse_bdf(path):
+    """Devuelve (ascent, descent, glifos) con glifos: código -> (ancho, avance, bbx, filas)"""
+    glyphs = {}
+    ascent = descent = 0
+    with open(path) as f:
+        lines = iter(f.read().splitlines())
+    for line in lines:
+        if line.startswith("FONT_ASCENT"):
+            ascent = int(line.split()[1])
+        elif line.startswith("FONT_DESCENT"):
+            descent = int(line.split()[1])
+        elif line.startswith("STARTCHAR"):
+            code = advance = None
+            bbx = (0, 0, 0, 0)
+            for line in lines:
+                if line.startswith("ENCODING"):
+                    code = int(line.split()[1])
+                elif line.startswith("DWIDTH"):
+                    advance = int(line.split()[1])
+                elif line.startswith("BBX"):
+                    bbx = tuple(int(v) for v in line.split()[1:5])
+                elif line.startswith("BITMAP"):
+                    rows = []
+                    for line in lines:
+                        if line.startswith("ENDCHAR"):
+                            break
+                        rows.append(int(line, 16) << (32 - len(line) * 4))
+                    if code is not None and code >= 0:
+                        glyphs[code] = (bbx, advance if advance is not None else bbx[0], rows)
+                    break
+    return ascent, descent, glyphs
+
+
+def render(bbx, rows, ascent, height):
+    """Coloca el BBX del glifo en una celda de alto fijo y devuelve (ancho, bytes)"""
+    w, h, xoff, yoff = bbx
+    xoff = max(xoff, 0)
+    width = w + xoff
+    row_bytes = (width + 7) // 8
+    data = bytearray(row_bytes * height)
+    top = ascent - (h + yoff)
+    for r, bits in enumerate(rows):
+        y = top + r
+        if not 0 <= y < height:
+            continue
+        for x in range(w):
+            if bits & (1 << (31 - x)):
+                px = x + xoff
+                data[y * row_bytes + px // 8] |= 0x80 >> (px % 8)
+    return width, bytes(data)
+
+
+def convert(src, dst, fixed=False, first=32, last=126):
+    ascent, descent, glyphs = parse_bdf(src)
+    height = ascent + descent
+    count = last - first + 1
+    default = glyphs.get(ord("?")) or next(iter(glyphs.values()))
+    max_advance = max(g[1] for g in glyphs.values())
+
+    entries = []
+    blobs = []
+    offset = struct.calcsize(HEADER) + count * struct.calcsize(ENTRY)
+    for code in range(first, last + 1):
+        bbx, advance, rows = glyphs.get(code, default)
+        width, data = render(bbx, rows, ascent, height)
+        if not any(data):
+            width, data = 0, b""
+        if fixed:
+            advance = max_advance
+        entries.append(struct.pack(ENTRY, offset, width, advance))
+        blobs.append(data)
+        offset += len(data)
+
+    flags = 0 if fixed else PROPORTIONAL
+    default_advance = max_advance if fixed else default[1]
+    with open(dst, "wb") as f:
+        f.write(struct.pack(HEADER, MAGIC, height, flags, first, count, default_advance, ascent))
+        f.write(b"".join(entries))
+        f.write(b"".join(blobs))
+    print(f"{dst}: {count} glyphs, height {height}, {offset} bytes")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print(__doc__ or "python tools/bdf2font.py fuente.bdf salida.bin [--fixed] [--first 32] [--last 126]")
+        sys.exit(1)
+    opts = {"fixed": "--fixed" in args, "first": 32, "last": 126}
+    for name in ("first", "last"):
+        flag = "--" + name
+        if flag in args:
+            opts[name] = int(args[args.index(flag) + 1])
+    convert(args[0], args[1], **opts)
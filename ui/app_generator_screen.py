@@ -127,9 +127,7 @@ class AppGeneratorScreen(Screen):
         
         # Texto de la descripción (múltiples líneas)
         full_text = self._get_current_description()
-        lines = self._wrap_text(full_text, 32)
-        for i, line in enumerate(lines[:4]):  # Máximo 4 líneas
-            r.text(25, 80 + i * 15, line, config.COLOR_PRIMARY, scale=1)
+        r.text_box(25, 80, 256, 53, full_text, config.COLOR_PRIMARY, scale=1, line_height=15)
         
         # Título de sugerencias
         if self.step == 0:
@@ -152,10 +150,7 @@ class AppGeneratorScreen(Screen):
                     r.rounded_rect(btn.x, btn.y, btn.w, btn.h, 6, btn.color, fill=False)
                     
                     # Texto en dos líneas si es necesario
-                    text_lines = self._wrap_text(btn.text, 34)
-                    for j, line in enumerate(text_lines[:2]):
-                        text_y = btn.y + 10 + j * 15
-                        r.text(btn.x + 10, text_y, line, btn.color, scale=1)
+                    r.text_box(btn.x + 10, btn.y + 10, 272, 23, btn.text, btn.color, scale=1, line_height=15)
         
         # Botones de navegación
         self.back_btn.draw(r)
@@ -167,25 +162,6 @@ class AppGeneratorScreen(Screen):
         
         r.flush()
     
-    def _wrap_text(self, text, max_chars):
-        """Divide texto en líneas"""
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 <= max_chars:
-                current_line += (" " if current_line else "") + word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
-    
     def handle_touch(self, x, y):
         if not self.check_touch_debounce() or self.loading_suggestions:
             return
@@ -2,7 +2,7 @@
 
 import config
 import lib.logging as logging
-from ui.screen import Screen, Button
+from ui.screen import Screen, Button, ScrollIndicator
 # from ui.menu_screen import MenuScreen # Made local to prevent recursive imports
 from core.game_runner import GameRunner
 
@@ -16,33 +16,145 @@ class GamesScreen(Screen):
         self.selected_index = 0
         self.scroll_offset = 0
         self.max_visible = 5  # Más items visibles en pantalla vertical
+        # Header y botones se dibujan al entrar; después solo se repinta la lista
+        self.background_drawn = False
+        # Solo se redibuja al cambiar algo; el scroll desplaza la lista por hardware
+        self.needs_redraw = True
+        self.pending_scroll = 0
         
         # Botones de acción (ajustados para pantalla vertical 320x480)
         self.play_btn = Button(20, 420, 80, 35, "JUGAR", config.COLOR_WHITE, config.COLOR_SUCCESS)
         self.delete_btn = Button(120, 420, 80, 35, "Borrar", config.COLOR_ACCENT, config.COLOR_BUTTON_BG)
         self.back_btn = Button(220, 420, 80, 35, "Atras", config.COLOR_WHITE, config.COLOR_BUTTON_BG)
+        # Flechas de scroll entre el header y la lista, y entre la lista y los botones
+        self.scroll_up = ScrollIndicator(140, 51, 40, 8, "^")
+        self.scroll_down = ScrollIndicator(140, 368, 40, 22, "v")
         logger.debug("GamesScreen initialized")
     
     def enter(self):
         logger.info("Entering GamesScreen")
         self._load_games()
+        # Zona de la lista (5 items de 60 filas) con scroll por hardware si está disponible
+        self.renderer.set_scroll_region(60, self.max_visible * 60)
     
     def _load_games(self):
         """Carga la lista de juegos"""
         logger.debug("Loading games list...")
         self.games = self.app.storage.list_games()
         logger.info(f"Loaded {len(self.games)} games")
+        # El contador del header cambia: se vuelve a dibujar el fondo
+        self.background_drawn = False
+        self.needs_redraw = True
+        # Tras borrar la lista puede acabar antes: el scroll y la selección quedan dentro
+        self.pending_scroll = 0
+        self.scroll_offset = max(0, min(self.scroll_offset, len(self.games) - self.max_visible))
         if not self.games:
             self.selected_index = -1
             logger.debug("No games found, selected_index set to -1")
         else:
-            self.selected_index = 0
+            last = min(len(self.games), self.scroll_offset + self.max_visible) - 1
+            self.selected_index = max(self.scroll_offset, min(self.selected_index, last))
             for i, game in enumerate(self.games):
                 logger.debug(f"  Game {i}: {game['name']} (played: {game['played']}x)")
     
+    def exit(self):
+        super().exit()
+        self.renderer.clear_scroll_region()
+    
     def draw(self):
         r = self.renderer
         
+        if self.pending_scroll and not self.needs_redraw:
+            dy = self.pending_scroll
+            self.pending_scroll = 0
+            if r.scroll(dy, self._draw_list):
+                # Solo se envían las filas expuestas y los indicadores
+                self._draw_scroll_indicators(r)
+                r.flush()
+                return
+            self.needs_redraw = True
+        if not self.needs_redraw:
+            # Nada ha cambiado desde el último frame
+            return
+        self.needs_redraw = False
+        self.pending_scroll = 0
+        
+        # Header y botones no cambian al seleccionar: solo se dibujan con el fondo.
+        # En modo bandas la lista de dibujo solo se reinicia con un fill: se repinta todo
+        if not self.background_drawn or r.buffer_rows != r.height:
+            self._draw_background(r)
+            self.background_drawn = True
+        
+        if self.games:
+            self._draw_list(r, 0)
+            self._draw_scroll_indicators(r)
+        
+        r.flush()
+    
+    def _draw_list(self, r, oy):
+        """Dibuja la lista visible desplazada oy filas (solo los items dentro del destino)"""
+        y_start = 60 + oy
+        item_height = 60
+        
+        # Fondo de la zona de lista (ajustada para pantalla vertical)
+        r.rect(0, y_start, 320, self.max_visible * item_height, config.COLOR_BACKGROUND, fill=True)
+        
+        for i in range(self.max_visible):
+            game_index = i + self.scroll_offset
+            if game_index >= len(self.games):
+                break
+            
+            game = self.games[game_index]
+            y = y_start + i * item_height
+            if y + item_height <= 0 or y >= r.height:
+                # Fuera del destino (p.ej. la franja expuesta al desplazar)
+                continue
+            
+            # Fondo del item (ajustado para 320 de ancho)
+            if game_index == self.selected_index:
+                r.rounded_rect(15, y, 290, 52, 6, config.COLOR_BUTTON_BG, fill=True)
+                r.rounded_rect(15, y, 290, 52, 6, config.COLOR_PRIMARY, fill=False)
+                text_color = config.COLOR_WHITE
+            else:
+                r.rounded_rect(15, y, 290, 52, 6, config.COLOR_BLACK, fill=True)
+                r.rounded_rect(15, y, 290, 52, 6, 0x4A69, fill=False)
+                text_color = config.COLOR_TEXT_SECONDARY
+            
+            # Icono play
+            cx, cy = 35, y + 26
+            if game_index == self.selected_index:
+                r.circle(cx, cy, 12, config.COLOR_PRIMARY, fill=True)
+                icon_color = config.COLOR_WHITE
+            else:
+                r.circle(cx, cy, 12, config.COLOR_BUTTON_BG, fill=True)
+                icon_color = config.COLOR_TEXT_SECONDARY
+            
+            # Triángulo play
+            r.line(cx - 3, cy - 6, cx - 3, cy + 6, icon_color)
+            r.line(cx - 3, cy - 6, cx + 5, cy, icon_color)
+            r.line(cx - 3, cy + 6, cx + 5, cy, icon_color)
+            
+            # Nombre del juego (ajustado para ancho menor)
+            name = game["name"][:25]  # Trunca si es muy largo
+            r.text(55, y + 10, name, text_color, scale=1)
+            
+            # Fecha
+            date_text = self._format_date(game["created"])
+            r.text(55, y + 30, date_text, 0x8410, scale=1)
+            
+            # Botón play pequeño
+            if game_index == self.selected_index:
+                r.circle(285, y + 26, 10, config.COLOR_SECONDARY, fill=True)
+                r.text(282, y + 22, ">", config.COLOR_WHITE)
+    
+    def _draw_scroll_indicators(self, r):
+        """Indicadores de scroll (fuera de la zona que se desplaza)"""
+        self.scroll_up.draw(r, self.scroll_offset > 0, config.COLOR_PRIMARY, config.COLOR_BACKGROUND)
+        self.scroll_down.draw(r, self.scroll_offset + self.max_visible < len(self.games),
+                              config.COLOR_PRIMARY, config.COLOR_BACKGROUND)
+    
+    def _draw_background(self, r):
+        """Dibuja la parte estática de la pantalla"""
         # Fondo
         r.fill(config.COLOR_BACKGROUND)
         
@@ -67,67 +179,10 @@ class GamesScreen(Screen):
             # Solo botón atrás
             self.back_btn.draw(r)
         else:
-            # Lista de juegos (ajustada para pantalla vertical)
-            y_start = 60
-            item_height = 60
-            
-            for i in range(self.max_visible):
-                game_index = i + self.scroll_offset
-                if game_index >= len(self.games):
-                    break
-                
-                game = self.games[game_index]
-                y = y_start + i * item_height
-                
-                # Fondo del item (ajustado para 320 de ancho)
-                if game_index == self.selected_index:
-                    r.rounded_rect(15, y, 290, 52, 6, config.COLOR_BUTTON_BG, fill=True)
-                    r.rounded_rect(15, y, 290, 52, 6, config.COLOR_PRIMARY, fill=False)
-                    text_color = config.COLOR_WHITE
-                else:
-                    r.rounded_rect(15, y, 290, 52, 6, config.COLOR_BLACK, fill=True)
-                    r.rounded_rect(15, y, 290, 52, 6, 0x4A69, fill=False)
-                    text_color = config.COLOR_TEXT_SECONDARY
-                
-                # Icono play
-                cx, cy = 35, y + 26
-                if game_index == self.selected_index:
-                    r.circle(cx, cy, 12, config.COLOR_PRIMARY, fill=True)
-                    icon_color = config.COLOR_WHITE
-                else:
-                    r.circle(cx, cy, 12, config.COLOR_BUTTON_BG, fill=True)
-                    icon_color = config.COLOR_TEXT_SECONDARY
-                
-                # Triángulo play
-                r.line(cx - 3, cy - 6, cx - 3, cy + 6, icon_color)
-                r.line(cx - 3, cy - 6, cx + 5, cy, icon_color)
-                r.line(cx - 3, cy + 6, cx + 5, cy, icon_color)
-                
-                # Nombre del juego (ajustado para ancho menor)
-                name = game["name"][:25]  # Trunca si es muy largo
-                r.text(55, y + 10, name, text_color, scale=1)
-                
-                # Fecha
-                date_text = self._format_date(game["created"])
-                r.text(55, y + 30, date_text, 0x8410, scale=1)
-                
-                # Botón play pequeño
-                if game_index == self.selected_index:
-                    r.circle(285, y + 26, 10, config.COLOR_SECONDARY, fill=True)
-                    r.text(282, y + 22, ">", config.COLOR_WHITE)
-            
-            # Indicadores de scroll
-            if self.scroll_offset > 0:
-                r.text_centered(55, "^", config.COLOR_PRIMARY)
-            if self.scroll_offset + self.max_visible < len(self.games):
-                r.text_centered(375, "v", config.COLOR_PRIMARY)
-            
             # Botones de acción
             self.play_btn.draw(r)
             self.delete_btn.draw(r)
             self.back_btn.draw(r)
-        
-        r.flush()
     
     def handle_touch(self, x, y):
         if not self.check_touch_debounce():
@@ -143,12 +198,21 @@ class GamesScreen(Screen):
                 self.app.change_screen(MenuScreen(self.app))
             return
         
+        # Flechas de scroll "^" y "v"
+        if self.scroll_up.is_touched(x, y) and self.scroll_offset > 0:
+            self._scroll_list(-1)
+            return
+        if self.scroll_down.is_touched(x, y) and self.scroll_offset + self.max_visible < len(self.games):
+            self._scroll_list(1)
+            return
+        
         # Selección de juegos (ajustado para pantalla vertical)
         if 15 <= x <= 305 and 60 <= y <= 360:
             item_index = (y - 60) // 60
             game_index = item_index + self.scroll_offset
             if game_index < len(self.games):
                 self.selected_index = int(game_index)
+                self.needs_redraw = True
                 logger.debug(f"Game selected: index={self.selected_index}, name='{self.games[self.selected_index]['name']}'")
             return
         
@@ -176,6 +240,12 @@ class GamesScreen(Screen):
             self.app.change_screen(MenuScreen(self.app))
             return
     
+    def _scroll_list(self, step):
+        """Desplaza la lista step items; draw() mueve el panel y dibuja solo el item nuevo"""
+        self.scroll_offset += step
+        self.pending_scroll += step * 60
+        logger.debug(f"Scroll offset: {self.scroll_offset}")
+    
     def _format_date(self, timestamp):
         """Formatea timestamp a string legible"""
         import time
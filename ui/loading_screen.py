@@ -112,20 +112,8 @@ class LoadingScreen(Screen):
         
         r.text(30, 70, "Tu juego:", config.COLOR_SECONDARY, scale=1)
         
-        # Divide descripción en líneas (ajustado para ancho menor)
-        words = self.description.split()
-        line1 = " ".join(words[:6])
-        line2 = " ".join(words[6:12]) if len(words) > 6 else ""
-        line3 = " ".join(words[12:18]) if len(words) > 12 else ""
-        line4 = " ".join(words[18:24]) if len(words) > 18 else ""
-        
-        r.text(30, 90, line1, config.COLOR_WHITE, scale=1)
-        if line2:
-            r.text(30, 105, line2, config.COLOR_WHITE, scale=1)
-        if line3:
-            r.text(30, 120, line3, config.COLOR_WHITE, scale=1)
-        if line4:
-            r.text(30, 135, line4, config.COLOR_WHITE, scale=1)
+        # Descripción en hasta 4 líneas (la maquetación se calcula una vez)
+        r.text_box(30, 90, 260, 53, self.description, config.COLOR_WHITE, scale=1, line_height=15)
         
         if self.generating:
             # Spinner animado (centrado para pantalla vertical)
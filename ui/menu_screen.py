@@ -29,6 +29,8 @@ class MenuScreen(Screen):
         
         self.game_count = 0
         self.app_count = 0
+        # Todo el menú es estático: se dibuja una vez al entrar (sin capa de pantalla completa)
+        self.needs_redraw = True
         logger.debug("MenuScreen initialized with 6 buttons")
     
     def enter(self):
@@ -39,8 +41,33 @@ class MenuScreen(Screen):
         logger.debug(f"Found {self.game_count} saved games and {self.app_count} saved apps")
     
     def draw(self):
+        if not self.needs_redraw:
+            # Nada ha cambiado: el panel ya muestra el menú
+            return
+        self.needs_redraw = False
         r = self.renderer
+        self._draw_background(r)
+        
+        # Badge con contador de juegos
+        if self.game_count > 0:
+            badge_x, badge_y = 238, 155
+            r.circle(badge_x, badge_y, 10, config.COLOR_ACCENT, fill=True)
+            count_str = str(self.game_count)
+            text_x = badge_x - len(count_str) * 4
+            r.text(text_x, badge_y - 4, count_str, config.COLOR_WHITE)
         
+        # Badge con contador de apps
+        if self.app_count > 0:
+            badge_x, badge_y = 238, 260
+            r.circle(badge_x, badge_y, 10, config.COLOR_ACCENT, fill=True)
+            count_str = str(self.app_count)
+            text_x = badge_x - len(count_str) * 4
+            r.text(text_x, badge_y - 4, count_str, config.COLOR_WHITE)
+        
+        r.flush()
+    
+    def _draw_background(self, r):
+        """Dibuja la parte estática del menú"""
         # Fondo
         r.fill(config.COLOR_BACKGROUND)
         
@@ -60,22 +87,6 @@ class MenuScreen(Screen):
         for btn in self.buttons:
             btn.draw(r)
         
-        # Badge con contador de juegos
-        if self.game_count > 0:
-            badge_x, badge_y = 238, 155
-            r.circle(badge_x, badge_y, 10, config.COLOR_ACCENT, fill=True)
-            count_str = str(self.game_count)
-            text_x = badge_x - len(count_str) * 4
-            r.text(text_x, badge_y - 4, count_str, config.COLOR_WHITE)
-        
-        # Badge con contador de apps
-        if self.app_count > 0:
-            badge_x, badge_y = 238, 260
-            r.circle(badge_x, badge_y, 10, config.COLOR_ACCENT, fill=True)
-            count_str = str(self.app_count)
-            text_x = badge_x - len(count_str) * 4
-            r.text(text_x, badge_y - 4, count_str, config.COLOR_WHITE)
-        
         # Iconos en los botones
         # Icono + en CREAR JUEGO
         r.circle(88, 102, 10, config.COLOR_WHITE, fill=True)
@@ -99,8 +110,6 @@ class MenuScreen(Screen):
         # Icono info en ACERCA DE
         r.circle(95, 362, 8, config.COLOR_TEXT_SECONDARY, fill=False)
         r.text(92, 358, "i", config.COLOR_TEXT_SECONDARY)
-        
-        r.flush()
     
     def handle_touch(self, x, y):
         if not self.check_touch_debounce():
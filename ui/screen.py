@@ -77,3 +77,23 @@ class Button:
         return (self.enabled and 
                 self.x <= x <= self.x + self.w and 
                 self.y <= y <= self.y + self.h)
+
+class ScrollIndicator:
+    """Flecha de scroll de una lista: se dibuja y se toca en la misma caja"""
+    def __init__(self, x, y, w, h, text):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.text = text
+    
+    def draw(self, renderer, visible, color, bg_color):
+        """Borra la caja y dibuja la flecha si la lista puede desplazarse en su sentido"""
+        renderer.rect(self.x, self.y, self.w, self.h, bg_color, fill=True)
+        if visible:
+            renderer.text(self.x + (self.w - 8) // 2, self.y + (self.h - 8) // 2, self.text, color)
+    
+    def is_touched(self, x, y):
+        """Verifica si el toque está dentro de la caja de la flecha"""
+        return (self.x <= x <= self.x + self.w and 
+                self.y <= y <= self.y + self.h)
@@ -24,6 +24,13 @@ class SettingsScreen(Screen):
         self.scanning = False
         self.scroll_offset = 0
         self.max_visible_networks = 5
+        # La lista de redes solo se redibuja al cambiar; el scroll la desplaza por hardware
+        self.needs_redraw = True
+        self.pending_scroll = 0
+        # needs_redraw antes del toque en curso (el scroll no debe descartar un redibujado pendiente)
+        self.redraw_queued = False
+        # Zona de scroll por hardware activa (solo con la lista de redes en pantalla)
+        self.list_scroll = False
         
         # Botones del menú principal
         self.wifi_toggle_btn = Button(20, 70, 280, 40, "", config.COLOR_WHITE, config.COLOR_BUTTON_BG)
@@ -73,6 +80,21 @@ class SettingsScreen(Screen):
         self.mode = "menu"
         self._update_wifi_status()
     
+    def exit(self):
+        super().exit()
+        self._set_list_scroll(False)
+    
+    def _set_list_scroll(self, enabled):
+        """Activa la zona de scroll de la lista de redes (5 items de 50 filas) o la quita"""
+        if enabled == self.list_scroll:
+            return
+        self.list_scroll = enabled
+        if enabled:
+            self.renderer.set_scroll_region(80, self.max_visible_networks * 50)
+        else:
+            # Fuera de la lista el panel queda fijo (y el flush asíncrono vuelve a estar disponible)
+            self.renderer.clear_scroll_region()
+    
     def _update_wifi_status(self):
         """Actualiza el estado del botón WiFi"""
         if self.settings.wifi_enabled:
@@ -117,6 +139,24 @@ class SettingsScreen(Screen):
     
     def draw(self):
         r = self.renderer
+        
+        if self.mode == "wifi_list" and not self.needs_redraw:
+            if self.pending_scroll:
+                dy = self.pending_scroll
+                self.pending_scroll = 0
+                if r.scroll(dy, self._draw_wifi_items):
+                    # Solo se envían las filas expuestas y los indicadores
+                    self._draw_wifi_indicators(r)
+                    r.flush()
+                    return
+                self.needs_redraw = True
+            else:
+                # Nada ha cambiado desde el último frame
+                return
+        self.needs_redraw = False
+        self.pending_scroll = 0
+        self._set_list_scroll(self.mode == "wifi_list")
+        
         r.fill(config.COLOR_BACKGROUND)
         
         # Header
@@ -175,59 +215,73 @@ class SettingsScreen(Screen):
         elif not self.networks:
             r.text_centered(200, "No se encontraron redes", config.COLOR_TEXT_SECONDARY, scale=1)
         else:
-            # Lista de redes
-            y_start = 80
-            item_height = 50
+            self._draw_wifi_items(r, 0)
             
-            for i in range(self.max_visible_networks):
-                net_idx = i + self.scroll_offset
-                if net_idx >= len(self.networks):
-                    break
-                
-                net = self.networks[net_idx]
-                y = y_start + i * item_height
-                
-                # Fondo del item
-                if net_idx == self.selected_network:
-                    r.rounded_rect(20, y, 280, 45, 6, config.COLOR_BUTTON_BG, fill=True)
-                    r.rounded_rect(20, y, 280, 45, 6, config.COLOR_PRIMARY, fill=False)
-                    text_color = config.COLOR_WHITE
-                else:
-                    r.rounded_rect(20, y, 280, 45, 6, config.COLOR_BLACK, fill=True)
-                    text_color = config.COLOR_TEXT_SECONDARY
-                
-                # SSID
-                ssid = net["ssid"][:25]
-                r.text(30, y + 10, ssid, text_color, scale=1)
-                
-                # Señal
-                rssi = net["rssi"]
-                if rssi > -50:
-                    signal = "Excelente"
-                    sig_color = config.COLOR_SUCCESS
-                elif rssi > -70:
-                    signal = "Buena"
-                    sig_color = config.COLOR_PRIMARY
-                else:
-                    signal = "Debil"
-                    sig_color = config.COLOR_ACCENT
-                r.text(30, y + 28, signal, sig_color, scale=1)
-                
-                # Icono de señal
-                bars = 3 if rssi > -50 else (2 if rssi > -70 else 1)
-                for b in range(bars):
-                    r.rect(270 + b * 8, y + 30 - b * 5, 5, 5 + b * 5, sig_color, fill=True)
-            
-            # Indicadores de scroll
-            if self.scroll_offset > 0:
-                r.text_centered(70, "^", config.COLOR_PRIMARY)
-            if self.scroll_offset + self.max_visible_networks < len(self.networks):
-                r.text_centered(340, "v", config.COLOR_PRIMARY)
+            self._draw_wifi_indicators(r)
         
         self.cancel_btn.draw(r)
         if self.selected_network >= 0:
             self.ok_btn.draw(r)
     
+    def _draw_wifi_items(self, r, oy):
+        """Dibuja las redes visibles desplazadas oy filas (solo los items dentro del destino)"""
+        y_start = 80 + oy
+        item_height = 50
+        
+        # Fondo de la zona de lista
+        r.rect(0, y_start, 320, self.max_visible_networks * item_height, config.COLOR_BACKGROUND, fill=True)
+        
+        for i in range(self.max_visible_networks):
+            net_idx = i + self.scroll_offset
+            if net_idx >= len(self.networks):
+                break
+            
+            net = self.networks[net_idx]
+            y = y_start + i * item_height
+            if y + item_height <= 0 or y >= r.height:
+                # Fuera del destino (p.ej. la franja expuesta al desplazar)
+                continue
+            
+            # Fondo del item
+            if net_idx == self.selected_network:
+                r.rounded_rect(20, y, 280, 45, 6, config.COLOR_BUTTON_BG, fill=True)
+                r.rounded_rect(20, y, 280, 45, 6, config.COLOR_PRIMARY, fill=False)
+                text_color = config.COLOR_WHITE
+            else:
+                r.rounded_rect(20, y, 280, 45, 6, config.COLOR_BLACK, fill=True)
+                text_color = config.COLOR_TEXT_SECONDARY
+            
+            # SSID
+            ssid = net["ssid"][:25]
+            r.text(30, y + 10, ssid, text_color, scale=1)
+            
+            # Señal
+            rssi = net["rssi"]
+            if rssi > -50:
+                signal = "Excelente"
+                sig_color = config.COLOR_SUCCESS
+            elif rssi > -70:
+                signal = "Buena"
+                sig_color = config.COLOR_PRIMARY
+            else:
+                signal = "Debil"
+                sig_color = config.COLOR_ACCENT
+            r.text(30, y + 28, signal, sig_color, scale=1)
+            
+            # Icono de señal
+            bars = 3 if rssi > -50 else (2 if rssi > -70 else 1)
+            for b in range(bars):
+                r.rect(270 + b * 8, y + 30 - b * 5, 5, 5 + b * 5, sig_color, fill=True)
+    
+    def _draw_wifi_indicators(self, r):
+        """Indicadores de scroll (fuera de la zona que se desplaza)"""
+        r.rect(150, 70, 20, 8, config.COLOR_BACKGROUND, fill=True)
+        r.rect(150, 340, 20, 8, config.COLOR_BACKGROUND, fill=True)
+        if self.scroll_offset > 0:
+            r.text_centered(70, "^", config.COLOR_PRIMARY)
+        if self.scroll_offset + self.max_visible_networks < len(self.networks):
+            r.text_centered(340, "v", config.COLOR_PRIMARY)
+    
     def _draw_keyboard(self, r):
         """Dibuja el teclado virtual"""
         # Campo de texto
@@ -284,6 +338,9 @@ class SettingsScreen(Screen):
             return
         
         logger.debug(f"SettingsScreen touch at ({x}, {y}), mode={self.mode}")
+        # Cualquier toque puede cambiar la pantalla (salvo el scroll, ver _scroll_networks)
+        self.redraw_queued = self.needs_redraw
+        self.needs_redraw = True
         
         if self.mode == "menu":
             self._handle_menu_touch(x, y)
@@ -379,14 +436,21 @@ class SettingsScreen(Screen):
         
         # Scroll arriba
         if y < 80 and self.scroll_offset > 0:
-            self.scroll_offset -= 1
+            self._scroll_networks(-1)
             return
         
         # Scroll abajo
         if y > 340 and self.scroll_offset + self.max_visible_networks < len(self.networks):
-            self.scroll_offset += 1
+            self._scroll_networks(1)
             return
     
+    def _scroll_networks(self, step):
+        """Desplaza la lista step redes; draw() mueve el panel y dibuja solo la red nueva"""
+        self.scroll_offset += step
+        self.pending_scroll += step * 50
+        # Un redibujado ya pendiente (p.ej. otro toque del mismo frame) se mantiene
+        self.needs_redraw = self.redraw_queued
+    
     def _handle_keyboard_touch(self, x, y):
         """Maneja toques en el teclado"""
         # Cancelar